@@ -1,35 +1,31 @@
 
-import requests
-from bs4 import BeautifulSoup
-import time
 import json
 import os
+from scripts.HttpClient import abrufen
+from scripts.HtmlTabellen import extrahiere_zeilen
 
 def extrahiere_kader(vorname_der_mannschaft, vereins_id):
     url = f"https://www.transfermarkt.de/{vorname_der_mannschaft}/kader/verein/{vereins_id}/saison_id/2023"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    res = requests.get(url, headers=headers)
+    res = abrufen(url)
 
     if res.status_code != 200:
         print(f"❌ Fehler beim Abrufen von {url}")
         return {}
 
-    soup = BeautifulSoup(res.text, "html.parser")
-    spieler_tabelle = soup.find("table", class_="items")
-    if not spieler_tabelle:
+    rows = extrahiere_zeilen(res.text, zeilen_klassen=("odd", "even"), mit_details=True)
+    if rows is None:
         print("⚠️ Keine Tabelle gefunden")
         return {}
 
     spieler_dict = {}
-    rows = spieler_tabelle.find_all("tr", class_=["odd", "even"])
 
-    for row in rows:
+    for cols in rows:
         try:
-            name_tag = row.find("td", class_="hauptlink").find("a")
-            name = name_tag.text.strip()
-            link = name_tag["href"]
+            name_td = next(col for col in cols if "hauptlink" in col.klasse.split())
+            name = name_td.link_text
+            link = name_td.href
             transfermarkt_id = int(link.split("/")[4])
-            position = row.find_all("td")[4].text.strip()
+            position = cols[4].text
             spieler_dict[name] = {
                 "transfermarkt_id": transfermarkt_id,
                 "position": position
@@ -68,12 +64,13 @@ def crawl_alle_teams():
         daten = extrahiere_kader(url_name, tm_id)
         if daten:
             all_teams_data[teamname] = daten
-        time.sleep(1)  # freundlich sein ;)
     return all_teams_data
 
 if __name__ == "__main__":
     ergebnis = crawl_alle_teams()
-    output_path = "teams_full.py"
+    # Nur Kaderdaten (Name, ID, Position) – Rohseiten liegen im SnapshotArchiv
+    output_path = os.path.join("daten", "teams_full.py")
+    os.makedirs("daten", exist_ok=True)
     with open(output_path, "w", encoding="utf-8") as f:
         f.write("Teams = ")
         json.dump(ergebnis, f, indent=4, ensure_ascii=False)
@@ -1,78 +1,192 @@
-import time
-import json
+import queue
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
 from scrape_bundesliga_team_urls_robust import lade_team_urls
-from speichere_transfermarkt_html import speichere_html
+from scripts.SnapshotArchiv import SnapshotArchiv, saison_aus_url
+from scripts.RateLimiter import standard_limiter
+from scripts.HttpClient import BACKOFF_MAX
 
 MAX_RETRIES = 5
-RETRY_DELAY_RANGE = (5, 15)  # Sekunden
+RETRY_BASIS = 5.0  # Sekunden, verdoppelt sich pro Versuch (volle Streuung wie im HttpClient)
+ANZAHL_DRIVER = 3
+MAX_NEUSTARTS = 2  # wie oft ein Team nach einem Driver-Absturz neu eingereiht wird
+
+# Bilder, Fonts, Werbung und Tracking werden gar nicht erst geladen
+BLOCKIERTE_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*doubleclick.net*", "*googlesyndication.com*", "*googletagmanager.com*", "*google-analytics.com*",
+    "*adservice.google.*", "*amazon-adsystem.com*", "*criteo.*", "*taboola.com*", "*outbrain.com*",
+]
+
+
+class DriverAbsturz(Exception):
+    pass
+
+
+class Drosselung(Exception):
+    """Transfermarkt hat eine 503- bzw. Rate-Limit-Seite ausgeliefert."""
+
+    def __init__(self, status):
+        super().__init__(f"{status}-Fehlerseite erkannt")
+        self.status = status
+
+
+def drosselungs_status(seite):
+    if "503 Service Unavailable" in seite:
+        return 503
+    if "429 Too Many Requests" in seite:
+        return 429
+    return None
+
+
+def driver_lebt(driver):
+    try:
+        driver.current_url
+        return True
+    except WebDriverException:
+        return False
+
+
+def erstelle_driver(driver_pfad):
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    options.page_load_strategy = "eager"  # nicht auf Werbe-iframes & Co. warten
+
+    driver = webdriver.Chrome(service=Service(driver_pfad), options=options)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKIERTE_URLS})
+    return driver
+
+
+def beende_driver(driver):
+    if driver is None:
+        return
+    try:
+        driver.quit()
+    except WebDriverException:
+        pass
+
 
 def extrahiere_kader(driver, url):
+    # Gemeinsamer Token-Bucket mit den requests-Crawlern; nur eine echte Drosselungsseite bremst alle Driver
+    limiter = standard_limiter()
     for attempt in range(MAX_RETRIES):
         try:
             print(f"Versuch {attempt+1}: Lade {url}")
+            limiter.warte(url)
             driver.get(url)
+            status = drosselungs_status(driver.page_source)
+            if status is not None:
+                raise Drosselung(status)
+
             WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".responsive-table"))
             )
-
-            if "503 Service Unavailable" in driver.page_source:
-                raise Exception("503-Fehlerseite erkannt")
-
+            limiter.rueckmeldung(url, 200)
             return driver.page_source  # Erfolg
+        except Drosselung as e:
+            print(f"🚦 {e}")
+            limiter.rueckmeldung(url, e.status)
+        except TimeoutException:
+            # Tabelle nicht rechtzeitig da – langsame Seite, keine Drosselung
+            print("⏱️ Kadertabelle nicht rechtzeitig geladen")
         except Exception as e:
             print(f"⚠️ Fehler: {e}")
-            if attempt < MAX_RETRIES - 1:
-                sleep_time = random.randint(*RETRY_DELAY_RANGE)
-                print(f"🔁 Warte {sleep_time} Sekunden und versuche es erneut...")
-                time.sleep(sleep_time)
-            else:
-                print("❌ Maximale Wiederholungen erreicht. Überspringe.")
-                return None
+            if not driver_lebt(driver):
+                raise DriverAbsturz(str(e)) from e
+        if attempt == MAX_RETRIES - 1:
+            print("❌ Maximale Wiederholungen erreicht. Überspringe.")
+            return None
+        warte = random.uniform(0, min(BACKOFF_MAX, RETRY_BASIS * 2 ** attempt))
+        print(f"🔁 Warte {warte:.1f} Sekunden und versuche es erneut...")
+        time.sleep(warte)
 
-def crawl_alle_teams():
-    teams = lade_team_urls()
-    all_teams_data = {}
 
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--window-size=1920,1080")
+def arbeite_warteschlange(nummer, driver_pfad, warteschlange, archiv):
+    """Ein Worker mit eigenem Driver; abgestürzte Driver werden ersetzt, das Team neu eingereiht."""
+    try:
+        driver = erstelle_driver(driver_pfad)
+    except Exception as e:
+        print(f"❌ [Driver {nummer}] Start fehlgeschlagen ({e}) – Worker beendet")
+        return
+    try:
+        while True:
+            try:
+                teamname, url, neustarts = warteschlange.get_nowait()
+            except queue.Empty:
+                return
+
+            print(f"🟦 [Driver {nummer}] Crawle {teamname} – {url}")
+            try:
+                html = extrahiere_kader(driver, url)
+            except DriverAbsturz as e:
+                print(f"💥 [Driver {nummer}] abgestürzt ({e}) – starte neu")
+                beende_driver(driver)
+                driver = None
+                if neustarts < MAX_NEUSTARTS:
+                    warteschlange.put((teamname, url, neustarts + 1))
+                else:
+                    print(f"❌ Konnte {teamname} nicht laden.")
+                try:
+                    driver = erstelle_driver(driver_pfad)
+                except Exception as neu_fehler:
+                    # Worker endet, die übrigen arbeiten die Warteschlange weiter ab
+                    print(f"❌ [Driver {nummer}] Neustart fehlgeschlagen ({neu_fehler}) – Worker beendet")
+                    return
+                continue
+
+            if html:
+                archiv.speichere(teamname, html, saison=saison_aus_url(url))
+            else:
+                print(f"❌ Konnte {teamname} nicht laden.")
+    finally:
+        beende_driver(driver)
 
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
 
+def crawl_alle_teams(nur_tabelle=False, anzahl_driver=ANZAHL_DRIVER):
+    teams = lade_team_urls()
+    archiv = SnapshotArchiv(nur_tabelle=nur_tabelle)
+
+    warteschlange = queue.Queue()
     for teamname, url in teams.items():
         if "kader" not in url:
             print(f"⚠️ Überspringe {teamname} wegen ungültiger URL: {url}")
             continue
+        warteschlange.put((teamname, url, 0))
 
-        print(f"🟦 Crawle {teamname} – {url}")
-        html = extrahiere_kader(driver, url)
-        if html:
-            all_teams_data[teamname] = html
-            speichere_html(teamname, html)
-        else:
-            print(f"❌ Konnte {teamname} nicht laden.")
-
-    driver.quit()
+    driver_pfad = ChromeDriverManager().install()
+    anzahl_driver = max(1, min(anzahl_driver, warteschlange.qsize()))
 
-    with open("teams_full.py", "w", encoding="utf-8") as f:
-        f.write("Teams = ")
-        json.dump(all_teams_data, f, indent=4, ensure_ascii=False)
+    with ThreadPoolExecutor(max_workers=anzahl_driver) as pool:
+        worker = [
+            pool.submit(arbeite_warteschlange, nummer + 1, driver_pfad, warteschlange, archiv)
+            for nummer in range(anzahl_driver)
+        ]
+        for w in worker:
+            w.result()
 
-    print("✅ Alle Teams gespeichert in teams_full.py")
+    offen = []
+    while not warteschlange.empty():
+        offen.append(warteschlange.get_nowait()[0])
+    if offen:
+        print(f"❌ Keine Driver mehr verfügbar – nicht geladen: {', '.join(offen)}")
+    print(f"✅ Alle Teams gespeichert im Snapshot-Archiv {archiv.verzeichnis}/")
 
 if __name__ == "__main__":
     crawl_alle_teams()
@@ -1,38 +1,44 @@
-import requests
-from bs4 import BeautifulSoup
 import json
+import re
+from scripts.HttpClient import abrufen
+from scripts.HtmlTabellen import extrahiere_zeilen
+from scripts.SpielerRegister import standard_register
+
+
+def transfermarkt_id(zelle, spieler: str, team_name: str = None):
+    """ID aus dem Profil-Link der Zeile, sonst aus dem Spielerregister (bei Namensgleichheit entscheidet der Verein)."""
+    treffer = re.search(r"/spieler/(\d+)", zelle.href or "")
+    if treffer:
+        return treffer.group(1)
+    eintrag = standard_register().finde(spieler, team_name)
+    return eintrag.id if eintrag else None
 
 def crawl_verletzungen_fuer_team(team_url, team_name):
-    headers = {
-        "User-Agent": "Mozilla/5.0"
-    }
-    response = requests.get(team_url, headers=headers)
+    response = abrufen(team_url)
     if response.status_code != 200:
         print(f"❌ Fehler bei {team_name}: {response.status_code}")
         return {team_name: []}
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    table = soup.find("table", class_="items")
-    if not table:
+    rows = extrahiere_zeilen(response.text, mit_details=True)
+    if rows is None:
         print(f"❌ Tabelle nicht gefunden für {team_name}")
         return {team_name: []}
 
     verletzungen = []
-    for row in table.find_all("tr")[1:]:
-        cols = row.find_all("td")
+    for cols in rows[1:]:
         if len(cols) < 9:
             continue
 
-        img_tag = cols[0].find("img")
-        spieler = img_tag["alt"] if img_tag else cols[0].get_text(strip=True)
+        spieler = cols[0].img_alt if cols[0].img_alt is not None else cols[0].text
 
         verletzungen.append({
             "spieler": spieler,
-            "alter": cols[4].get_text(strip=True),
-            "grund": cols[5].get_text(strip=True),
-            "seit": cols[6].get_text(strip=True),
-            "bis_voraussichtlich": cols[7].get_text(strip=True),
-            "verpasste_spiele": cols[8].get_text(strip=True)
+            "transfermarkt_id": transfermarkt_id(cols[0], spieler, team_name),
+            "alter": cols[4].text,
+            "grund": cols[5].text,
+            "seit": cols[6].text,
+            "bis_voraussichtlich": cols[7].text,
+            "verpasste_spiele": cols[8].text
         })
 
     return {team_name: verletzungen}
@@ -5,34 +5,26 @@ import matplotlib.pyplot as plt
 from scripts.TeamManager import TeamManager
 from scripts.SpielDatenLoader import SpielDatenLoader
 from scripts.Analyse import Analyse
-from scripts.Daten import speichere_csv, SPIELE_CSV
 from scripts.Teams import Teams
 from scripts.AnalyseErweiterung import erweitere_mit_understat
 from scripts.BundesligaVerletzungsCrawler import BundesligaVerletzungsCrawler
+from scripts.VerletzungsStore import standard_store, STORE_VERZEICHNIS
+from scripts.Normalisierung import normalisiere, ist_normalisiert
+from scripts.Verfuegbarkeit import lade_oder_baue
 
 # Konfiguration: wie viele Jahre rückwirkend
 ANALYSE_JAHRE = 5
 
 def filter_letzte_saisons(df: pd.DataFrame, jahre=5) -> pd.DataFrame:
     aktuelle_saison = pd.Timestamp.now().year
-
-    def extrahiere_jahr(s):
-        if "/" in s:
-            teil = s.split("/")[0]
-            return int("20" + teil) if len(teil) == 2 else int(teil)
-        try:
-            return int(s[:4])
-        except:
-            return None
-
-    df["Jahr_start"] = df["Saison"].apply(extrahiere_jahr)
-    df = df[df["Jahr_start"].notna()]
-    df = df[df["Jahr_start"] >= aktuelle_saison - jahre]
-    return df.drop(columns="Jahr_start")
+    return df[(df["Saison_start"] >= aktuelle_saison - jahre).fillna(False)]
 
 def vorbereiten(df):
+    if df.empty:
+        return df
     df = df[df["Saison"].notna()]
-    df["Saison"] = df["Saison"].astype(str).str.strip()
+    if not ist_normalisiert(df):
+        df = normalisiere(df)
     return filter_letzte_saisons(df, jahre=ANALYSE_JAHRE)
 
 def main():
@@ -42,14 +34,27 @@ def main():
     print("📊 Was möchtest du tun?")
     print("1. Einzelnes Team analysieren")
     print("2. Alle Bundesliga-Teams automatisch crawlen")
-    wahl = input("➡️ Auswahl (1/2): ").strip()
+    print("3. Alle Bundesliga-Teams inkrementell aktualisieren")
+    wahl = input("➡️ Auswahl (1/2/3): ").strip()
+
+    # Der Store hält den vollständigen Verlauf; das Fenster von ANALYSE_JAHRE gilt erst beim Lesen für die Analyse
+    store = standard_store()
 
     if wahl == "2":
         crawler = BundesligaVerletzungsCrawler()
-        df = crawler.crawl_alle_verletzungen()
-        df = vorbereiten(df)
-        crawler.speichere_als_csv(df, os.path.join("daten", "alle_verletzungen.csv"))
-        print("✅ Fertig. Du findest alle Verletzungsdaten unter: daten/alle_verletzungen.csv")
+        df = crawler.crawl_alle_verletzungen(parallel=True)
+        store.schreibe(df)
+        print(f"✅ Fertig. Du findest alle Verletzungsdaten im Verletzungs-Store: {STORE_VERZEICHNIS}")
+        return
+
+    if wahl == "3":
+        crawler = BundesligaVerletzungsCrawler()
+        df = crawler.crawl_inkrementell(store.lese())
+        if df.empty:
+            print("⚠️ Keine Verletzungsdaten vorhanden.")
+            return
+        store.schreibe(df, ersetzen=True)  # df ist der vollständige, aktualisierte Bestand
+        print("✅ Inkrementelle Aktualisierung abgeschlossen.")
         return
 
     # Einzelteam-Analyse wie bisher
@@ -68,17 +73,19 @@ def main():
     spieler_info_1 = Teams[teamname_1]
     manager1 = TeamManager(teamname_1, spieler_info_1)
     df1 = manager1.crawl_team_verletzungen()
+    verfuegbarkeit = lade_oder_baue(store)  # Stand vor dem Schreiben, danach nur betroffene Vereine neu
+    if not df1.empty:
+        df1["Team"] = teamname_1
+        store.schreibe(df1)
+        verfuegbarkeit.aktualisiere(df1, store=store)
+        verfuegbarkeit.speichere()
+        print(f"📎 Im Verletzungs-Store gespeichert: {teamname_1}")
     df1 = vorbereiten(df1)
 
     if df1.empty:
         print(f"⚠️ Keine Verletzungsdaten für {teamname_1} in den letzten {ANALYSE_JAHRE} Jahren.")
         return
 
-    df1["Team"] = teamname_1
-    dateiname = f"verletzungen_{teamname_1.lower().replace(' ', '_')}.csv"
-    speichere_csv(df1, os.path.join("daten", dateiname))
-    print(f"📎 Gespeichert: daten/{dateiname}")
-
     vergleich = input("🔁 Möchtest du dieses Team mit einem weiteren vergleichen? (j/n): ").strip().lower()
     if vergleich == "j":
         print("\n🔎 Wähle Vergleichsteam:")
@@ -97,16 +104,20 @@ def main():
         spieler_info_2 = Teams[teamname_2]
         manager2 = TeamManager(teamname_2, spieler_info_2)
         df2 = manager2.crawl_team_verletzungen()
+        if not df2.empty:
+            df2["Team"] = teamname_2
+            store.schreibe(df2)
+            verfuegbarkeit.aktualisiere(df2, store=store)
+            verfuegbarkeit.speichere()
         df2 = vorbereiten(df2)
 
         if df2.empty:
             print(f"⚠️ Keine Verletzungsdaten für {teamname_2} in den letzten {ANALYSE_JAHRE} Jahren.")
             return
 
-        df2["Team"] = teamname_2
-        combined_df = pd.concat([df1, df2], ignore_index=True)
-
-        grouped = combined_df.groupby(["Saison", "Team"]).size().unstack(fill_value=0)
+        # Vorberechnete Team/Saison-Kennzahlen aus dem Store statt groupby über die Rohzeilen
+        grouped = store.aggregate().tabelle(teams=[teamname_1, teamname_2],
+                                            ab_jahr=pd.Timestamp.now().year - ANALYSE_JAHRE)
         cleaned = grouped[(grouped != 0).any(axis=1)]
 
         if not cleaned.empty:
@@ -133,9 +144,10 @@ def main():
     else:
         print("⚠️ Keine Understat-Daten gefunden.")
 
-    loader = SpielDatenLoader(SPIELE_CSV)
-    spiele_df = loader.lade_spiele()
-    analyse = Analyse(spiele_df, df1)
+    loader = SpielDatenLoader()  # alle Spieldateien (D1, D2, ...) in daten/
+    # Spiele im selben Fenster wie df1, damit die Ausfallmatrix des ganzen Stores nur dort abgefragt wird
+    spiele_df = filter_letzte_saisons(loader.lade_spiele(), jahre=ANALYSE_JAHRE).reset_index(drop=True)
+    analyse = Analyse(spiele_df, df1, verfuegbarkeit, store.aggregate())
     analyse.einfache_analyse()
 
 if __name__ == "__main__":
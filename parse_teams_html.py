@@ -1,28 +1,35 @@
 import os
 import json
-from bs4 import BeautifulSoup
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from scripts.HtmlTabellen import extrahiere_zeilen
+from scripts.SnapshotArchiv import SnapshotArchiv, dateiname_fuer
 
-def parse_html_file(filepath):
+JSON_AUSGABE = "daten/parsed_players_detailed.json"
+JSONL_AUSGABE = "daten/parsed_players_detailed.jsonl"
+
+def parse_html_file(filepath, backend=None):
     with open(filepath, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f, "html.parser")
+        return parse_html(f.read(), quelle=filepath, backend=backend)
 
+def parse_html(html, quelle="", backend=None):
     players = []
-    table = soup.find("table", class_="items")
-    if not table:
-        print(f"⚠️ Tabelle nicht gefunden in {filepath}")
+    rows = extrahiere_zeilen(html, zeilen_klassen=("odd", "even"), mit_details=True, backend=backend)
+    if rows is None:
+        print(f"⚠️ Tabelle nicht gefunden in {quelle}")
         return []
 
-    rows = table.find_all("tr", class_=["odd", "even"])
-    for row in rows:
+    for cols in rows:
         try:
-            name_tag = row.find("td", class_="hauptlink").find("a")
-            name = name_tag.text.strip()
-            player_link = name_tag["href"]
+            name_td = next(col for col in cols if "hauptlink" in col.klasse.split())
+            name = name_td.link_text
+            player_link = name_td.href
             transfermarkt_id = player_link.split("/")[4] if "/spieler/" in player_link else None
-            position = row.find_all("td")[4].get_text(strip=True)
-            age = row.find_all("td")[5].get_text(strip=True)
-            market_value_tag = row.find("td", class_="rechts hauptlink")
-            market_value = market_value_tag.get_text(strip=True) if market_value_tag else None
+            position = cols[4].text
+            age = cols[5].text
+            market_value_td = next((col for col in cols if col.klasse == "rechts hauptlink"), None)
+            market_value = market_value_td.text if market_value_td else None
 
             players.append({
                 "name": name,
@@ -32,7 +39,7 @@ def parse_html_file(filepath):
                 "transfermarkt_id": transfermarkt_id
             })
         except Exception as e:
-            print(f"❌ Fehler beim Parsen in {filepath}: {e}")
+            print(f"❌ Fehler beim Parsen in {quelle}: {e}")
             continue
 
     return players
@@ -47,11 +54,88 @@ def parse_all_html(directory="html"):
             players = parse_html_file(filepath)
             all_data[club_name] = players
 
-    os.makedirs("daten", exist_ok=True)
-    with open("daten/parsed_players_detailed.json", "w", encoding="utf-8") as f:
+    speichere_json(all_data)
+
+def _neueste_eintraege(archiv, saison=None):
+    """Je Verein der neueste Schnappschuss (optional einer Saison), sortiert nach Verein."""
+    neueste = {}
+    for eintrag in archiv.eintraege(saison=saison):
+        alt = neueste.get(eintrag["team"])
+        if alt is None or (eintrag["saison"] or 0, eintrag["datum"]) > (alt["saison"] or 0, alt["datum"]):
+            neueste[eintrag["team"]] = eintrag
+    return [neueste[team] for team in sorted(neueste)]
+
+def _parse_eintrag(verzeichnis, eintrag):
+    html = SnapshotArchiv(verzeichnis).lade_eintrag(eintrag)
+    return dateiname_fuer(eintrag["team"]), parse_html(html, quelle=eintrag["datei"])
+
+def parse_archiv(archiv=None, saison=None, parallel=False, prozesse=None, ausgabe=JSONL_AUSGABE, kombiniert=True):
+    """Neuester Schnappschuss je Verein aus dem Snapshot-Archiv (Schlüssel wie früher die html/-Dateinamen)."""
+    archiv = archiv or SnapshotArchiv()
+    eintraege = _neueste_eintraege(archiv, saison)
+    if parallel:
+        _parse_parallel([partial(_parse_eintrag, archiv.verzeichnis, e) for e in eintraege], ausgabe, prozesse, kombiniert)
+        return
+
+    all_data = {}
+    for eintrag in eintraege:
+        print(f"🔍 Verarbeite {eintrag['team']} ...")
+        club_name, players = _parse_eintrag(archiv.verzeichnis, eintrag)
+        all_data[club_name] = players
+
+    speichere_json(all_data)
+
+def speichere_json(all_data, pfad=JSON_AUSGABE):
+    os.makedirs(os.path.dirname(pfad), exist_ok=True)
+    with open(pfad, "w", encoding="utf-8") as f:
         json.dump(all_data, f, ensure_ascii=False, indent=2)
 
-    print("✅ Spielerinfos gespeichert in daten/parsed_players_detailed.json")
+    print(f"✅ Spielerinfos gespeichert in {pfad}")
+
+def _parse_club(filepath):
+    club_name = os.path.basename(filepath).replace(".html", "")
+    return club_name, parse_html_file(filepath)
+
+def _parse_parallel(auftraege, ausgabe=JSONL_AUSGABE, prozesse=None, kombiniert=True):
+    """Verteilt die Aufträge (je Verein einer) auf einen Prozess-Pool und schreibt jeden Verein sofort als JSONL-Zeilen weg."""
+    ergebnisse = {}
+
+    os.makedirs(os.path.dirname(ausgabe), exist_ok=True)
+    with open(ausgabe, "w", encoding="utf-8") as out, ProcessPoolExecutor(max_workers=prozesse) as pool:
+        futures = {pool.submit(auftrag): i for i, auftrag in enumerate(auftraege)}
+        for future in as_completed(futures):
+            club_name, players = future.result()
+            for player in players:
+                out.write(json.dumps({"club": club_name, **player}, ensure_ascii=False) + "\n")
+            out.flush()
+            print(f"🔍 {club_name}: {len(players)} Spieler")
+            if kombiniert:
+                ergebnisse[futures[future]] = (club_name, players)
+
+    print(f"✅ Spielerinfos gestreamt nach {ausgabe}")
+
+    if kombiniert:
+        # Reihenfolge der Aufträge statt Fertigstellungsreihenfolge, damit die JSON-Datei stabil bleibt
+        speichere_json(dict(ergebnisse[i] for i in sorted(ergebnisse)))
+
+def parse_all_html_parallel(directory="html", ausgabe=JSONL_AUSGABE, prozesse=None, kombiniert=True):
+    dateien = sorted(os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".html"))
+    _parse_parallel([partial(_parse_club, filepath) for filepath in dateien], ausgabe, prozesse, kombiniert)
 
 if __name__ == "__main__":
-    parse_all_html()
+    parser = argparse.ArgumentParser(description="Parst die gespeicherten Kaderseiten aus dem Snapshot-Archiv")
+    parser.add_argument("--html", action="store_true", help="Alte Einzeldateien aus html/ statt des Archivs parsen")
+    parser.add_argument("--saison", type=int, default=None, help="Nur Schnappschüsse dieser Saison (Startjahr) aus dem Archiv")
+    parser.add_argument("--parallel", action="store_true", help="Vereine auf mehrere Prozesse verteilen")
+    parser.add_argument("--prozesse", type=int, default=None, help="Anzahl Prozesse (Standard: alle Kerne)")
+    parser.add_argument("--ohne-json", action="store_true", help="Nur JSONL schreiben, keine kombinierte JSON-Datei (mit --parallel)")
+    args = parser.parse_args()
+    if args.html and args.saison is not None:
+        parser.error("--saison gilt nur für das Snapshot-Archiv, nicht zusammen mit --html")
+
+    if not args.html:
+        parse_archiv(saison=args.saison, parallel=args.parallel, prozesse=args.prozesse, kombiniert=not args.ohne_json)
+    elif args.parallel:
+        parse_all_html_parallel(prozesse=args.prozesse, kombiniert=not args.ohne_json)
+    else:
+        parse_all_html()
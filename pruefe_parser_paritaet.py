@@ -0,0 +1,71 @@
+import os
+import time
+from bs4 import BeautifulSoup
+
+from parse_teams_html import parse_html_file
+from scripts.HtmlTabellen import verfuegbare_backends
+
+HTML_VERZEICHNIS = "html"
+
+
+def parse_html_file_referenz(filepath):
+    """Ursprüngliche Implementierung (kompletter BeautifulSoup-Baum) als Referenz für den Abgleich."""
+    with open(filepath, "r", encoding="utf-8") as f:
+        soup = BeautifulSoup(f, "html.parser")
+
+    players = []
+    table = soup.find("table", class_="items")
+    if not table:
+        return []
+
+    rows = table.find_all("tr", class_=["odd", "even"])
+    for row in rows:
+        try:
+            name_tag = row.find("td", class_="hauptlink").find("a")
+            name = name_tag.text.strip()
+            player_link = name_tag["href"]
+            transfermarkt_id = player_link.split("/")[4] if "/spieler/" in player_link else None
+            position = row.find_all("td")[4].get_text(strip=True)
+            age = row.find_all("td")[5].get_text(strip=True)
+            market_value_tag = row.find("td", class_="rechts hauptlink")
+            market_value = market_value_tag.get_text(strip=True) if market_value_tag else None
+
+            players.append({
+                "name": name,
+                "position": position,
+                "age": age,
+                "market_value": market_value,
+                "transfermarkt_id": transfermarkt_id
+            })
+        except Exception:
+            continue
+
+    return players
+
+
+def pruefe_paritaet(directory=HTML_VERZEICHNIS) -> bool:
+    dateien = sorted(os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".html"))
+
+    start = time.perf_counter()
+    referenz = {pfad: parse_html_file_referenz(pfad) for pfad in dateien}
+    referenz_zeit = time.perf_counter() - start
+    print(f"⏱️ Referenz (BeautifulSoup, ganzes Dokument): {referenz_zeit:.2f}s für {len(dateien)} Dateien")
+
+    alles_gleich = True
+    for backend in verfuegbare_backends():
+        start = time.perf_counter()
+        ergebnis = {pfad: parse_html_file(pfad, backend=backend) for pfad in dateien}
+        dauer = time.perf_counter() - start
+
+        abweichend = [pfad for pfad in dateien if ergebnis[pfad] != referenz[pfad]]
+        status = "✅ identisch" if not abweichend else f"❌ {len(abweichend)} Dateien abweichend"
+        print(f"⏱️ {backend}: {dauer:.2f}s ({referenz_zeit / dauer:.1f}x schneller) – {status}")
+        for pfad in abweichend:
+            print(f"   ↳ {pfad}")
+        alles_gleich = alles_gleich and not abweichend
+
+    return alles_gleich
+
+
+if __name__ == "__main__":
+    pruefe_paritaet()
@@ -1,12 +1,11 @@
-import requests
 from bs4 import BeautifulSoup
 import re
 import json
+from scripts.HttpClient import abrufen
 
 def finde_bundesliga_teams_robust():
     url = "https://www.transfermarkt.de/1-bundesliga/startseite/wettbewerb/L1"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    res = requests.get(url, headers=headers)
+    res = abrufen(url)
     if res.status_code != 200:
         raise Exception(f"Fehler beim Laden: {res.status_code}")
 
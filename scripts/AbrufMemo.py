@@ -0,0 +1,36 @@
+import threading
+from concurrent.futures import Future
+
+
+class AbrufMemo:
+    """Memo pro Lauf: jeder Schlüssel (z. B. URL) wird nur einmal geladen, gleichzeitige Anfragen warten mit."""
+
+    def __init__(self):
+        self._ergebnisse = {}
+        self._lock = threading.Lock()
+
+    def hole(self, schluessel, laden):
+        with self._lock:
+            future = self._ergebnisse.get(schluessel)
+            besitzer = future is None
+            if besitzer:
+                future = Future()
+                self._ergebnisse[schluessel] = future
+
+        if besitzer:
+            try:
+                future.set_result(laden())
+            except Exception as e:
+                future.set_exception(e)
+
+        return future.result()
+
+    def __contains__(self, schluessel) -> bool:
+        return schluessel in self._ergebnisse
+
+    def __len__(self) -> int:
+        return len(self._ergebnisse)
+
+    def leere(self):
+        with self._lock:
+            self._ergebnisse.clear()
@@ -0,0 +1,96 @@
+import os
+
+import pandas as pd
+
+from scripts.Normalisierung import saison_startjahr
+
+# Materialisierte Ebenen: Schlüsselspalten je Ebene. Jede Ebene enthält Team und Saison, daher lässt sie
+# sich partitionsweise (Team, Saison) exakt nachführen – auch die Zahl verschiedener Spieler.
+EBENEN = {
+    "team_saison": ["Team", "Saison"],
+    "wuerfel": ["Team", "Saison", "Verletzung"],
+}
+KENNZAHLEN = ["Anzahl", "Tage", "Spieler"]
+
+
+def aggregiere(df: pd.DataFrame, ebene: str = "team_saison") -> pd.DataFrame:
+    """Anzahl Verletzungen, Summe verpasster Tage und Zahl verschiedener Spieler je Schlüssel der Ebene."""
+    schluessel = EBENEN[ebene]
+    if df.empty:
+        return pd.DataFrame(columns=schluessel + KENNZAHLEN)
+
+    df = df.assign(**{s: df[s].astype(object) for s in schluessel})
+    tage = df["Tage_verpasst"] if "Tage_verpasst" in df.columns else pd.Series(pd.NA, index=df.index, dtype="Int64")
+    ergebnis = df.assign(_tage=tage).groupby(schluessel, dropna=False, sort=True).agg(
+        Anzahl=("Spieler", "size"),
+        Tage=("_tage", "sum"),
+        Spieler=("Spieler", "nunique"),
+    )
+    return ergebnis.reset_index().astype({"Anzahl": "int64", "Tage": "int64", "Spieler": "int64"})
+
+
+class Aggregate:
+    """
+    Vorberechnete Kennzahlen (Anzahl, Tage, verschiedene Spieler) je Team/Saison und je
+    Team/Saison/Verletzungsart, gespeichert als Parquet neben dem Verletzungs-Store. Beim Schreiben in
+    den Store werden nur die Zeilen der geänderten (Team, Saison)-Partitionen ersetzt.
+    """
+
+    def __init__(self, verzeichnis: str):
+        self.verzeichnis = verzeichnis
+        self._tabellen = {}
+
+    def _pfad(self, ebene: str) -> str:
+        return os.path.join(self.verzeichnis, f"aggregat_{ebene}.parquet")
+
+    def vorhanden(self) -> bool:
+        return all(os.path.exists(self._pfad(ebene)) for ebene in EBENEN)
+
+    def lade(self, ebene: str = "team_saison") -> pd.DataFrame:
+        if ebene not in self._tabellen:
+            pfad = self._pfad(ebene)
+            self._tabellen[ebene] = pd.read_parquet(pfad) if os.path.exists(pfad) \
+                else pd.DataFrame(columns=EBENEN[ebene] + KENNZAHLEN)
+        return self._tabellen[ebene]
+
+    def _speichere(self, ebene: str, df: pd.DataFrame):
+        os.makedirs(self.verzeichnis, exist_ok=True)
+        pfad = self._pfad(ebene)
+        df.to_parquet(f"{pfad}.tmp", index=False)
+        os.replace(f"{pfad}.tmp", pfad)
+        self._tabellen[ebene] = df
+
+    def aktualisiere(self, partitionen: pd.DataFrame):
+        """
+        `partitionen` enthält den vollständigen neuen Inhalt der geänderten (Team, Saison)-Partitionen.
+        Deren alte Aggregatzeilen fallen weg, die neu berechneten kommen hinzu.
+        """
+        if partitionen.empty:
+            return
+        geaendert = pd.MultiIndex.from_frame(partitionen[["Team", "Saison"]].astype(object).drop_duplicates())
+        for ebene in EBENEN:
+            alt = self.lade(ebene)
+            behalten = ~pd.MultiIndex.from_frame(alt[["Team", "Saison"]].astype(object)).isin(geaendert)
+            neu = pd.concat([df for df in (alt[behalten], aggregiere(partitionen, ebene)) if not df.empty],
+                            ignore_index=True)
+            neu = neu.sort_values(EBENEN[ebene], ignore_index=True) if not neu.empty \
+                else pd.DataFrame(columns=EBENEN[ebene] + KENNZAHLEN)
+            self._speichere(ebene, neu)
+
+    def neu_aufbauen(self, df: pd.DataFrame):
+        for ebene in EBENEN:
+            self._speichere(ebene, aggregiere(df, ebene))
+
+    def abfrage(self, ebene: str = "team_saison", teams=None, ab_jahr: int = None) -> pd.DataFrame:
+        df = self.lade(ebene)
+        if teams is not None:
+            df = df[df["Team"].isin(list(teams))]
+        if ab_jahr is not None:
+            df = df[(saison_startjahr(df["Saison"]) >= ab_jahr).fillna(False)]
+        return df.reset_index(drop=True)
+
+    def tabelle(self, teams=None, wert: str = "Anzahl", ab_jahr: int = None) -> pd.DataFrame:
+        """Saison × Team-Tabelle einer Kennzahl, direkt plotbar (wie früher groupby(...).size().unstack())."""
+        df = self.abfrage("team_saison", teams=teams, ab_jahr=ab_jahr)
+        df = df[df["Saison"].notna()]
+        return df.pivot_table(index="Saison", columns="Team", values=wert, aggfunc="sum", fill_value=0)
@@ -1,11 +1,20 @@
+import numpy as np
 import pandas as pd
 from matplotlib import pyplot as plt
-from datetime import datetime
+
+from scripts.Aggregate import Aggregate, aggregiere
+from scripts.EinflussAnalyse import EinflussAnalyse
+from scripts.IntervallIndex import IntervallIndex
+from scripts.TeamAlias import standard_alias_index
+from scripts.Verfuegbarkeit import Verfuegbarkeit
 
 class Analyse:
-    def __init__(self, spiele_df: pd.DataFrame, verletzungen_df: pd.DataFrame):
+    def __init__(self, spiele_df: pd.DataFrame, verletzungen_df: pd.DataFrame,
+                 verfuegbarkeit: Verfuegbarkeit = None, aggregate: Aggregate = None):
         self.spiele_df = spiele_df
         self.verletzungen_df = verletzungen_df
+        self.verfuegbarkeit = verfuegbarkeit
+        self.aggregate = aggregate
 
     def einfache_analyse(self):
 
@@ -28,6 +37,7 @@ class Analyse:
         self.zeige_verletzungen_pro_saison()
         self.zeige_verletzungen_pro_team()
         self.verletzte_spieler_pro_spiel()
+        self.einfluss_aller_spieler()
 
         print("\n🆕 Neue Spalte 'Verletzte_Spieler' (Vorschau):")
         print(self.spiele_df[["Datum", "Heim", "Auswaerts", "Verletzte_Spieler"]].head())
@@ -37,7 +47,8 @@ class Analyse:
             print("⚠️ Keine gültigen Verletzungsdaten zur Visualisierung.")
             return
 
-        saisonen = self.verletzungen_df["Saison"].value_counts().sort_index()
+        saisonen = self.verletzungen_df.groupby("Saison", observed=True).size()
+        saisonen = saisonen.sort_index(key=lambda index: index.astype(str))  # Kategorien stehen in Fundreihenfolge
 
         plt.figure(figsize=(10, 5))
         saisonen.plot(kind="bar", color="skyblue", edgecolor="black")
@@ -56,10 +67,16 @@ class Analyse:
             print("⚠️ Keine Team-Verletzungsdaten zur Visualisierung.")
             return
 
-        df = self.verletzungen_df.copy()
-        gruppiert = df.groupby(["Team", "Saison"]).size().unstack(fill_value=0)
+        # Vorberechnete Kennzahlen aus dem Store, beschränkt auf Teams und Saisons der Analyse
+        df = self.verletzungen_df
+        saisons = df["Saison"].dropna().astype(str).unique()
+        if self.aggregate is not None:
+            gruppiert = self.aggregate.tabelle(teams=df["Team"].dropna().astype(str).unique())
+        else:
+            gruppiert = aggregiere(df).pivot_table(index="Saison", columns="Team", values="Anzahl", fill_value=0)
+        gruppiert = gruppiert[gruppiert.index.isin(saisons)]
 
-        gruppiert.T.plot(kind="bar", figsize=(10, 6), edgecolor="black")
+        gruppiert.plot(kind="bar", figsize=(10, 6), edgecolor="black")
         plt.title("Verletzungen pro Team und Saison")
         plt.xlabel("Saison")
         plt.ylabel("Anzahl Verletzungen")
@@ -71,61 +88,69 @@ class Analyse:
         print("📸 Diagramm gespeichert: output/verletzungen_teams_saisons.png")
         plt.show()
 
+    def _spieltage(self):
+        # Datum ist seit dem SpielDatenLoader bereits datetime64
+        return self.spiele_df["Datum"].to_numpy("datetime64[ns]")
+
     def verletzte_spieler_pro_spiel(self):
         if self.spiele_df.empty or self.verletzungen_df.empty:
             print("⚠️ Nicht genug Daten für Spiel-Verletzungs-Abgleich.")
             return
 
-        verletzungs_map = {}
-        for _, row in self.verletzungen_df.iterrows():
-            spieler = row["Spieler"]
-            try:
-                start = datetime.strptime(row["von"], "%d.%m.%Y")
-                ende = datetime.strptime(row["bis"], "%d.%m.%Y")
-            except:
-                continue
-
-            if spieler not in verletzungs_map:
-                verletzungs_map[spieler] = []
-            verletzungs_map[spieler].append((start, ende))
-
-        def zaehle_verletzte(datum_str):
-            try:
-                spiel_datum = datetime.strptime(datum_str, "%d/%m/%Y")
-            except:
-                return 0
-
-            count = 0
-            for spieler, zeiten in verletzungs_map.items():
-                for start, ende in zeiten:
-                    if start <= spiel_datum <= ende:
-                        count += 1
-                        break
-            return count
-
-        self.spiele_df["Verletzte_Spieler"] = self.spiele_df["Datum"].apply(zaehle_verletzte)
-        print("\n📊 Neue Spalte 'Verletzte_Spieler' hinzugefügt.")
-        print(self.spiele_df[["Datum", "Heim", "Auswaerts", "Verletzte_Spieler"]].head())
+        if "Team" not in self.verletzungen_df.columns:
+            print("⚠️ Verletzungsdaten ohne Team-Spalte – zähle alle Verletzten unabhängig vom Verein.")
+            index = IntervallIndex.aus_verletzungen(self.verletzungen_df)
+            spieltage = self._spieltage()
+            self.spiele_df["Verletzte_Spieler"] = index.anzahl_aktiv(spieltage)
+            self.spiele_df["Verletzte_Namen"] = index.schluessel_aktiv(spieltage)
+            return
+
+        alias = standard_alias_index()
+        unbekannt = alias.unbekannt(self.verletzungen_df["Team"])
+        if unbekannt:
+            print(f"⚠️ Unbekannte Vereinsnamen in den Verletzungsdaten: {', '.join(unbekannt)}")
+
+        # Heim- und Auswärtsseite als eine Anfrage (Verein, Datum) an die Ausfallmatrix;
+        # die Matrix löst Vereinsnamen selbst auf die kanonische ID auf
+        verfuegbarkeit = self.verfuegbarkeit or Verfuegbarkeit.baue(self.verletzungen_df)
+        spieltage = self._spieltage()
+        n = len(spieltage)
+        zeitpunkte = np.concatenate([spieltage, spieltage])
+        vereine = pd.concat([self.spiele_df["Heim"], self.spiele_df["Auswaerts"]]).astype(object).to_numpy()
+
+        anzahl = verfuegbarkeit.anzahl_fehlend(vereine, zeitpunkte)
+        namen = verfuegbarkeit.fehlende(vereine, zeitpunkte)
+
+        self.spiele_df["Verletzte_Heim"] = anzahl[:n]
+        self.spiele_df["Verletzte_Auswaerts"] = anzahl[n:]
+        self.spiele_df["Verletzte_Spieler"] = anzahl[:n] + anzahl[n:]
+        self.spiele_df["Verletzte_Namen_Heim"] = namen[:n]
+        self.spiele_df["Verletzte_Namen_Auswaerts"] = namen[n:]
+        print("\n📊 Neue Spalten 'Verletzte_Heim' / 'Verletzte_Auswaerts' hinzugefügt.")
+        print(self.spiele_df[["Datum", "Heim", "Auswaerts", "Verletzte_Heim", "Verletzte_Auswaerts"]].head())
+
+    def einfluss_aller_spieler(self, teams=None) -> pd.DataFrame:
+        """S/U/N, Tore und Punkte pro Spiel mit/ohne jeden Spieler – alle Vereine in einem Durchlauf."""
+        if self.spiele_df.empty or self.verletzungen_df.empty or "Team" not in self.verletzungen_df.columns:
+            print("⚠️ Nicht genug Daten für die Einflussanalyse.")
+            return pd.DataFrame()
+
+        verfuegbarkeit = self.verfuegbarkeit or Verfuegbarkeit.baue(self.verletzungen_df)
+        einfluss = EinflussAnalyse(self.spiele_df, verfuegbarkeit).berechne(teams)
+        if einfluss.empty:
+            print("⚠️ Keine Spiele mit Verletzungsdaten gefunden.")
+            return einfluss
+
+        spalten = ["Team", "Spieler", "Spiele_verfuegbar", "Spiele_abwesend",
+                   "Punkte_pro_Spiel_verfuegbar", "Punkte_pro_Spiel_abwesend", "Punkte_Differenz"]
+        print("\n📈 Größter Punkteverlust pro Spiel bei Ausfall:")
+        print(einfluss[einfluss["Spiele_abwesend"] > 0].nlargest(10, "Punkte_Differenz")[spalten])
+        return einfluss
 
     # Optional: alte Auswertung nur für Thomas Müller
     def auswertung_mueller_ausfall_vs_ergebnis(self):
-        zeitraeume = []
-        for _, row in self.verletzungen_df.iterrows():
-            try:
-                start = datetime.strptime(row["von"], "%d.%m.%Y")
-                ende = datetime.strptime(row["bis"], "%d.%m.%Y")
-                zeitraeume.append((start, ende))
-            except:
-                continue
-
-        def war_verletzt(datum_str):
-            try:
-                datum = datetime.strptime(datum_str, "%d/%m/%Y")
-            except:
-                return False
-            return any(start <= datum <= ende for start, ende in zeitraeume)
-
-        self.spiele_df["Mueller_verletzt"] = self.spiele_df["Datum"].apply(war_verletzt)
+        index = IntervallIndex.aus_verletzungen(self.verletzungen_df)
+        self.spiele_df["Mueller_verletzt"] = index.aktiv(self._spieltage())
         ergebnisse = self.spiele_df.groupby("Mueller_verletzt")["Ergebnis"].value_counts()
         print("\n📈 Ergebnisverteilung mit/ohne Müller-Verletzung:")
         print(ergebnisse)
@@ -1,18 +1,14 @@
 # scripts/AnalyseErweiterung.py
-from scripts.understat_loader import UnderstatLoader
+from scripts.understat_loader import UnderstatBulkLoader, STANDARD_SAISON
 import pandas as pd
 
-def erweitere_mit_understat(verletzungs_df: pd.DataFrame) -> pd.DataFrame:
-    spieler_namen = verletzungs_df["Spieler"].unique()
-    all_data = []
-
-    for name in spieler_namen:
-        loader = UnderstatLoader(player_name=name.replace(" ", "_"))
-        df = loader.load()
-        if not df.empty:
-            df["Spieler"] = name
-            all_data.append(df)
+def erweitere_mit_understat(verletzungs_df: pd.DataFrame, backend=None, saison: int = STANDARD_SAISON) -> pd.DataFrame:
+    if verletzungs_df.empty or "Spieler" not in verletzungs_df.columns:
+        return pd.DataFrame()
 
-    if all_data:
-        return pd.concat(all_data, ignore_index=True)
-    return pd.DataFrame()
+    spieler_namen = verletzungs_df["Spieler"].unique()
+    vereine = None
+    if "Team" in verletzungs_df.columns:
+        paare = verletzungs_df[["Spieler", "Team"]].dropna().drop_duplicates("Spieler")
+        vereine = dict(zip(paare["Spieler"].astype(str), paare["Team"].astype(str)))
+    return UnderstatBulkLoader(backend=backend, saison=saison).lade_alle(spieler_namen, vereine)
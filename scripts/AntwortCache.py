@@ -0,0 +1,209 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from scripts.Daten import DATEN_VERZEICHNIS
+
+CACHE_VERZEICHNIS = os.path.join(DATEN_VERZEICHNIS, "http_cache")
+
+STUNDE = 60 * 60
+TAG = 24 * STUNDE
+
+# Erste passende Regel gewinnt: Verletzungshistorien ändern sich selten, Ausfalllisten täglich
+TTL_REGELN = [
+    (r"/verletzungen/spieler/", 7 * TAG),
+    (r"/sperrenundverletzungen/", 3 * STUNDE),
+    (r"/ausfallzeiten/", TAG),
+    (r"/kader/", TAG),
+    (r"fbref\.com", 12 * STUNDE),
+]
+STANDARD_TTL = TAG
+MAX_GROESSE = 500 * 1024 * 1024  # Bytes
+
+
+class CacheEintrag:
+    def __init__(self, url, hash_wert, etag, last_modified, abgerufen, encoding, content_type, ttl):
+        self.url = url
+        self.hash = hash_wert
+        self.etag = etag
+        self.last_modified = last_modified
+        self.abgerufen = abgerufen
+        self.encoding = encoding
+        self.content_type = content_type
+        self.ttl = ttl
+
+    @property
+    def frisch(self) -> bool:
+        return time.time() - self.abgerufen < self.ttl
+
+    def bedingte_header(self) -> dict:
+        """Header für einen konditionalen GET (Revalidierung)."""
+        header = {}
+        if self.etag:
+            header["If-None-Match"] = self.etag
+        if self.last_modified:
+            header["If-Modified-Since"] = self.last_modified
+        return header
+
+
+class AntwortCache:
+    """Persistenter, inhaltsadressierter HTTP-Cache mit TTL pro URL-Muster und LRU-Verdrängung."""
+
+    def __init__(self, verzeichnis: str = CACHE_VERZEICHNIS, ttl_regeln: list = None,
+                 standard_ttl: float = STANDARD_TTL, max_groesse: int = MAX_GROESSE):
+        self.verzeichnis = verzeichnis
+        self.objekt_verzeichnis = os.path.join(verzeichnis, "objekte")
+        self.ttl_regeln = [(re.compile(muster), ttl) for muster, ttl in (ttl_regeln or TTL_REGELN)]
+        self.standard_ttl = standard_ttl
+        self.max_groesse = max_groesse
+
+        os.makedirs(self.objekt_verzeichnis, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(verzeichnis, "index.sqlite"), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS eintraege (
+                url TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                groesse INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                encoding TEXT,
+                content_type TEXT,
+                abgerufen REAL NOT NULL,
+                zugriff REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_eintraege_zugriff ON eintraege (zugriff)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_eintraege_hash ON eintraege (hash)")
+        self._db.commit()
+
+    def ttl_fuer(self, url: str) -> float:
+        for muster, ttl in self.ttl_regeln:
+            if muster.search(url):
+                return ttl
+        return self.standard_ttl
+
+    def _objekt_pfad(self, hash_wert: str) -> str:
+        return os.path.join(self.objekt_verzeichnis, hash_wert[:2], hash_wert)
+
+    @staticmethod
+    def schluessel(url: str, params=None) -> str:
+        """Die tatsächlich abgerufene URL, Query-Parameter eingeschlossen und so normalisiert wie von requests."""
+        return requests.Request("GET", url, params=params).prepare().url
+
+    def suche(self, url: str, params=None):
+        url = self.schluessel(url, params)
+        with self._lock:
+            zeile = self._db.execute(
+                "SELECT hash, etag, last_modified, abgerufen, encoding, content_type FROM eintraege WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if zeile is None:
+                return None
+            if not os.path.exists(self._objekt_pfad(zeile[0])):
+                self._db.execute("DELETE FROM eintraege WHERE url = ?", (url,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE eintraege SET zugriff = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+        return CacheEintrag(url, *zeile, ttl=self.ttl_fuer(url))
+
+    def lade_inhalt(self, eintrag: CacheEintrag) -> bytes:
+        with open(self._objekt_pfad(eintrag.hash), "rb") as f:
+            return f.read()
+
+    def als_response(self, eintrag: CacheEintrag) -> requests.Response:
+        res = requests.Response()
+        res.status_code = 200
+        res.url = eintrag.url
+        res._content = self.lade_inhalt(eintrag)
+        res.encoding = eintrag.encoding
+        res.headers = CaseInsensitiveDict({
+            k: v for k, v in (
+                ("Content-Type", eintrag.content_type),
+                ("ETag", eintrag.etag),
+                ("Last-Modified", eintrag.last_modified),
+            ) if v
+        })
+        res.from_cache = True
+        return res
+
+    def speichere(self, url: str, res: requests.Response, params=None):
+        url = self.schluessel(url, params)
+        inhalt = res.content
+        hash_wert = hashlib.sha256(inhalt).hexdigest()
+        pfad = self._objekt_pfad(hash_wert)
+
+        if not os.path.exists(pfad):
+            os.makedirs(os.path.dirname(pfad), exist_ok=True)
+            tmp = f"{pfad}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(inhalt)
+            os.replace(tmp, pfad)
+
+        jetzt = time.time()
+        with self._lock:
+            alter_hash = self._db.execute("SELECT hash FROM eintraege WHERE url = ?", (url,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO eintraege VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, hash_wert, len(inhalt), res.headers.get("ETag"), res.headers.get("Last-Modified"),
+                 res.encoding, res.headers.get("Content-Type"), jetzt, jetzt)
+            )
+            if alter_hash and alter_hash[0] != hash_wert:
+                self._entferne_objekt_falls_verwaist(alter_hash[0])
+            self._verdraenge()
+            self._db.commit()
+
+    def bestaetige(self, eintrag: CacheEintrag, res: requests.Response = None):
+        """Nach einer 304-Antwort: Eintrag gilt wieder als frisch."""
+        etag = res.headers.get("ETag", eintrag.etag) if res is not None else eintrag.etag
+        last_modified = res.headers.get("Last-Modified", eintrag.last_modified) if res is not None \
+            else eintrag.last_modified
+        jetzt = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE eintraege SET abgerufen = ?, zugriff = ?, etag = ?, last_modified = ? WHERE url = ?",
+                (jetzt, jetzt, etag, last_modified, eintrag.url)
+            )
+            self._db.commit()
+        eintrag.abgerufen = jetzt
+
+    def groesse(self) -> int:
+        with self._lock:
+            return self._groesse()
+
+    def _groesse(self) -> int:
+        zeile = self._db.execute(
+            "SELECT COALESCE(SUM(groesse), 0) FROM (SELECT MAX(groesse) AS groesse FROM eintraege GROUP BY hash)"
+        ).fetchone()
+        return zeile[0]
+
+    def _entferne_objekt_falls_verwaist(self, hash_wert: str) -> bool:
+        noch_genutzt = self._db.execute("SELECT 1 FROM eintraege WHERE hash = ? LIMIT 1", (hash_wert,)).fetchone()
+        if noch_genutzt:
+            return False
+        try:
+            os.remove(self._objekt_pfad(hash_wert))
+        except FileNotFoundError:
+            pass
+        return True
+
+    def _verdraenge(self):
+        gesamt = self._groesse()  # läuft bereits unter self._lock
+        if gesamt <= self.max_groesse:
+            return
+
+        # Am längsten nicht genutzte Einträge zuerst (LRU)
+        kandidaten = self._db.execute("SELECT url, hash, groesse FROM eintraege ORDER BY zugriff").fetchall()
+        for url, hash_wert, groesse in kandidaten:
+            if gesamt <= self.max_groesse:
+                break
+            self._db.execute("DELETE FROM eintraege WHERE url = ?", (url,))
+            if self._entferne_objekt_falls_verwaist(hash_wert):
+                gesamt -= groesse
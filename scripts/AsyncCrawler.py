@@ -0,0 +1,109 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlparse
+
+import pandas as pd
+from scripts.MultiSourceCrawler import MultiSourceCrawler
+from scripts.fbref_crawler import FBrefCrawler
+from scripts.AbrufMemo import AbrufMemo
+from scripts.DatensatzSammler import DatensatzSammler
+from scripts.Deduplizierung import dedupliziere
+
+# Wie viele Seiten gleichzeitig pro Host abgerufen werden dürfen
+MAX_PRO_HOST = 4
+
+
+class AsyncCrawler:
+    """Crawlt viele Spieler gleichzeitig, begrenzt pro Host durch eine Semaphore."""
+
+    def __init__(self, max_pro_host: int = MAX_PRO_HOST, host_limits: dict = None):
+        self.max_pro_host = max_pro_host
+        self.host_limits = host_limits or {}
+        self._semaphoren = {}
+        self._teamseiten = {}
+
+    def _limit(self, host: str) -> int:
+        return self.host_limits.get(host, self.max_pro_host)
+
+    async def _abruf(self, loop, pool, url, funktion) -> pd.DataFrame:
+        if not url:
+            return pd.DataFrame()
+
+        async with self._semaphoren[urlparse(url).netloc]:
+            return await loop.run_in_executor(pool, funktion)
+
+    async def _fbref(self, loop, pool, crawler: MultiSourceCrawler) -> pd.DataFrame:
+        """
+        Die FBref-Teamseite wird pro Lauf genau einmal unter dem Host-Limit geladen. Spieler derselben
+        Mannschaft warten auf diese Aufgabe, ohne Host-Slot oder Pool-Thread zu belegen, und filtern
+        danach nur noch das Ergebnis aus dem Memo.
+        """
+        url = crawler.fbref_url
+        if not url:
+            return pd.DataFrame()
+        if url not in self._teamseiten:
+            laden = partial(crawler.memo.hole, url, FBrefCrawler(url).scrape)
+            self._teamseiten[url] = asyncio.ensure_future(self._abruf(loop, pool, url, laden))
+        try:
+            await self._teamseiten[url]
+        except Exception:
+            pass  # scrape_fbref meldet den Fehler aus dem Memo selbst
+        return await loop.run_in_executor(pool, crawler.scrape_fbref)
+
+    async def _crawl_spieler(self, loop, pool, teamname: str, crawler: MultiSourceCrawler) -> pd.DataFrame:
+        print(f"🔍 Crawle {crawler.name}...")
+
+        # Transfermarkt und FBref laufen parallel statt nacheinander
+        df_tm, df_fbref = await asyncio.gather(
+            self._abruf(loop, pool, crawler.transfermarkt_url(), crawler.scrape_transfermarkt),
+            self._fbref(loop, pool, crawler)
+        )
+        df = pd.concat([df_tm, df_fbref], ignore_index=True)
+
+        if df.empty:
+            print(f"⚠️ Keine Daten für {crawler.name}")
+            return df
+
+        df["Spieler"] = crawler.name
+        df["Team"] = teamname
+        return dedupliziere(df)  # dieselbe Verletzung von TM und FBref nur einmal
+
+    async def crawl_teams_async(self, teams: dict, stream_pfad: str = None):
+        jobs = []
+        memo = AbrufMemo()  # Teamseiten (FBref) nur einmal pro Lauf abrufen
+        for teamname, spieler_info in teams.items():
+            for name, info in spieler_info.items():
+                crawler = MultiSourceCrawler(
+                    name=name,
+                    transfermarkt_id=info.get("transfermarkt_id"),
+                    fbref_url=info.get("fbref_url"),
+                    memo=memo
+                )
+                jobs.append((teamname, crawler))
+
+        hosts = {
+            urlparse(url).netloc
+            for _, crawler in jobs
+            for url in (crawler.transfermarkt_url(), crawler.fbref_url)
+            if url
+        }
+        self._semaphoren = {host: asyncio.Semaphore(self._limit(host)) for host in hosts}
+        self._teamseiten = {}
+        worker = max(1, sum(self._limit(host) for host in hosts))
+
+        # Jeder fertige Spieler geht sofort in den Sammler, mit stream_pfad also batchweise auf die Platte
+        sammler = DatensatzSammler(stream_pfad=stream_pfad, kategorisch=True)
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=worker) as pool:
+            aufgaben = [self._crawl_spieler(loop, pool, teamname, crawler) for teamname, crawler in jobs]
+            for fertig in asyncio.as_completed(aufgaben):
+                sammler.hinzufuegen(await fertig)
+
+        if stream_pfad:
+            return sammler.abschliessen()
+        return sammler.als_dataframe()
+
+    def crawl_teams(self, teams: dict, stream_pfad: str = None):
+        """Crawlt alle Spieler aller übergebenen Teams ({Team: {Spieler: Info}}); mit stream_pfad Pfad der CSV."""
+        return asyncio.run(self.crawl_teams_async(teams, stream_pfad))
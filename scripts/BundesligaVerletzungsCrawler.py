@@ -2,22 +2,53 @@
 import pandas as pd
 from scripts.Teams import Teams
 from scripts.TeamManager import TeamManager
+from scripts.AsyncCrawler import AsyncCrawler, MAX_PRO_HOST
+from scripts.CrawlManifest import CrawlManifest
+from scripts.DatensatzSammler import DatensatzSammler
 
 class BundesligaVerletzungsCrawler:
     def __init__(self):
         self.teams = Teams
 
-    def crawl_alle_verletzungen(self) -> pd.DataFrame:
-        gesamt_df = pd.DataFrame()
+    def crawl_alle_verletzungen(self, parallel: bool = False, max_pro_host: int = MAX_PRO_HOST,
+                                teams: dict = None, stream_pfad: str = None):
+        """Gesamt-DataFrame; mit stream_pfad stattdessen der Pfad der geschriebenen CSV."""
+        teams = self.teams if teams is None else teams
 
-        for teamname, spieler_info in self.teams.items():
+        if parallel:
+            print(f"⚡️ Crawle {len(teams)} Teams parallel (max. {max_pro_host} Anfragen pro Host)")
+            return AsyncCrawler(max_pro_host=max_pro_host).crawl_teams(teams, stream_pfad=stream_pfad)
+
+        # Batches landen bei stream_pfad direkt auf der Platte statt im Speicher
+        sammler = DatensatzSammler(stream_pfad=stream_pfad, kategorisch=True)
+
+        for teamname, spieler_info in teams.items():
             print(f"⚽️ Team: {teamname}")
             manager = TeamManager(teamname=teamname, spieler_info=spieler_info)
             team_df = manager.crawl_team_verletzungen()
             team_df["Team"] = teamname  # Team-Spalte hinzufügen
-            gesamt_df = pd.concat([gesamt_df, team_df], ignore_index=True)
+            sammler.hinzufuegen(team_df)
+
+        if stream_pfad:
+            return sammler.abschliessen()
+        return sammler.als_dataframe()
+
+    def crawl_inkrementell(self, bestand: pd.DataFrame, manifest: CrawlManifest = None, parallel: bool = True,
+                           max_pro_host: int = MAX_PRO_HOST) -> pd.DataFrame:
+        """Holt nur Spieler mit offener Verletzung oder veraltetem Stand und führt sie in den Bestand ein."""
+        manifest = manifest or CrawlManifest()
+        veraltet = manifest.veraltete_spieler(self.teams)
+        anzahl = sum(len(spieler) for spieler in veraltet.values())
+        gesamt = sum(len(spieler) for spieler in self.teams.values())
+        print(f"🔄 Inkrementell: {anzahl} von {gesamt} Spielern werden aktualisiert")
+
+        if not veraltet:
+            return bestand
 
-        return gesamt_df
+        neu = self.crawl_alle_verletzungen(parallel=parallel, max_pro_host=max_pro_host, teams=veraltet)
+        df = manifest.uebernehme(bestand, neu, veraltet)
+        manifest.speichere()
+        return df
 
     def speichere_als_csv(self, df: pd.DataFrame, pfad: str = "alle_verletzungen.csv"):
         df.to_csv(pfad, index=False)
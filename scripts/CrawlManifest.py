@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+from scripts.Daten import DATEN_VERZEICHNIS
+from scripts.Kategorien import verbinde
+from scripts.Normalisierung import parse_datum
+
+MANIFEST_PFAD = os.path.join(DATEN_VERZEICHNIS, "crawl_manifest.json")
+
+# Abgeschlossene Historien werden spätestens nach dieser Zeit erneut geprüft (per bedingtem GET meist ein 304)
+MAX_ALTER = 7 * 24 * 60 * 60  # Sekunden
+
+FINGERPRINT_SPALTEN = ["Saison", "Verletzung", "von", "bis", "Spiele_verpasst", "Quelle"]
+SCHLUESSEL_SPALTEN = ["Team", "Spieler"]
+# So kennzeichnet Transfermarkt eine noch laufende Verletzung
+OFFEN_MARKIERUNGEN = {"", "-", "?", "nan", "None"}
+
+
+def fingerprint(df: pd.DataFrame) -> str:
+    """Reihenfolgeunabhängiger Hash über die Verletzungshistorie eines Spielers."""
+    spalten = [s for s in FINGERPRINT_SPALTEN if s in df.columns]
+    zeilen = sorted("\x1f".join(map(str, zeile)) for zeile in df[spalten].astype(object).fillna("").itertuples(index=False))
+    return hashlib.sha1("\x1e".join(zeilen).encode("utf-8")).hexdigest()
+
+
+def hat_offene_verletzung(df: pd.DataFrame) -> bool:
+    """
+    Offen = ausdrücklich kein Enddatum ('-', '?', leer) oder Enddatum in der Zukunft. Sonstige nicht
+    lesbare Angaben gelten als abgeschlossen, sonst würde der Spieler bei jedem Lauf neu geholt.
+    """
+    if df.empty or "bis" not in df.columns:
+        return False
+    text = df["bis"].astype("string").str.strip().fillna("")
+    bis = parse_datum(text)
+    return bool((text.isin(OFFEN_MARKIERUNGEN) | (bis >= pd.Timestamp.now().normalize())).any())
+
+
+class CrawlManifest:
+    """Merkt sich pro Spieler letzten Crawl, Fingerprint und ob eine Verletzung noch offen ist."""
+
+    def __init__(self, pfad: str = MANIFEST_PFAD, max_alter: float = MAX_ALTER):
+        self.pfad = pfad
+        self.max_alter = max_alter
+        self.eintraege = {}
+        if os.path.exists(pfad):
+            with open(pfad, "r", encoding="utf-8") as f:
+                self.eintraege = json.load(f)
+
+    @staticmethod
+    def schluessel(name: str, info: dict) -> str:
+        return str(info.get("transfermarkt_id") or name)
+
+    def braucht_update(self, name: str, info: dict) -> bool:
+        eintrag = self.eintraege.get(self.schluessel(name, info))
+        if eintrag is None or eintrag.get("offen"):
+            return True
+        return time.time() - eintrag.get("zuletzt_gecrawlt", 0) > self.max_alter
+
+    def veraltete_spieler(self, teams: dict) -> dict:
+        """Reduziert {Team: {Spieler: Info}} auf die Spieler, die neu geholt werden müssen."""
+        auswahl = {}
+        for teamname, spieler_info in teams.items():
+            veraltet = {name: info for name, info in spieler_info.items() if self.braucht_update(name, info)}
+            if veraltet:
+                auswahl[teamname] = veraltet
+        return auswahl
+
+    def uebernehme(self, bestand: pd.DataFrame, neu: pd.DataFrame, teams: dict) -> pd.DataFrame:
+        """Ersetzt im Bestand nur die Zeilen von Spielern, deren Historie sich geändert hat."""
+        if neu.empty:
+            return bestand
+
+        jetzt = time.time()
+        geaendert = []
+        gruppen = dict(tuple(neu.groupby(SCHLUESSEL_SPALTEN, sort=False, observed=True)))
+        im_bestand = set() if bestand.empty else \
+            set(bestand[SCHLUESSEL_SPALTEN].astype(object).drop_duplicates().itertuples(index=False, name=None))
+
+        for teamname, spieler_info in teams.items():
+            for name, info in spieler_info.items():
+                zeilen = gruppen.get((teamname, name))
+                if zeilen is None:
+                    continue  # nichts geliefert (z. B. Abruffehler) → Bestand behalten
+
+                schluessel = self.schluessel(name, info)
+                fp = fingerprint(zeilen)
+                # Unverändert, aber im Bestand fehlend (CSV verloren/gefiltert) → neue Zeilen trotzdem übernehmen
+                if self.eintraege.get(schluessel, {}).get("fingerprint") != fp or (teamname, name) not in im_bestand:
+                    geaendert.append((teamname, name))
+
+                self.eintraege[schluessel] = {
+                    "spieler": name,
+                    "team": teamname,
+                    "zuletzt_gecrawlt": jetzt,
+                    "fingerprint": fp,
+                    "offen": hat_offene_verletzung(zeilen),
+                }
+
+        print(f"🔁 {len(geaendert)} Spieler mit geänderter Historie")
+        if not geaendert:
+            return bestand
+
+        ersetzen = pd.MultiIndex.from_tuples(geaendert, names=SCHLUESSEL_SPALTEN)
+        neue_zeilen = neu[pd.MultiIndex.from_frame(neu[SCHLUESSEL_SPALTEN]).isin(ersetzen)]
+        if bestand.empty:
+            return neue_zeilen.reset_index(drop=True)
+
+        behalten = bestand[~pd.MultiIndex.from_frame(bestand[SCHLUESSEL_SPALTEN]).isin(ersetzen)]
+        return verbinde([behalten, neue_zeilen])
+
+    def speichere(self):
+        os.makedirs(os.path.dirname(self.pfad) or ".", exist_ok=True)
+        tmp = f"{self.pfad}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.eintraege, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.pfad)
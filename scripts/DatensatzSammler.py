@@ -0,0 +1,107 @@
+import os
+from typing import Iterator
+
+import pandas as pd
+
+from scripts.Kategorien import kategorisiere, verbinde
+
+BATCH_GROESSE = 50_000  # Zeilen, ab denen beim Streaming auf die Platte geschrieben wird
+LESE_BLOCK = 100_000  # Zeilen je Block beim Zurücklesen bzw. Umschreiben der Stream-Datei
+
+
+class DatensatzSammler:
+    """
+    Sammelt DataFrames oder Datensätze (Liste von Dicts) und baut den Gesamt-DataFrame genau einmal am Ende.
+    Mit stream_pfad werden volle Batches als CSV angehängt, damit der Speicherverbrauch flach bleibt;
+    tauchen später neue Spalten auf, wird der Kopf der Datei blockweise verbreitert (nichts geht verloren).
+    Im Streaming-Modus liefern abschliessen() den Pfad und als_batches() die Daten blockweise.
+    Mit kategorisch=True werden Spieler/Team/Verletzung/Quelle/Saison schon beim Sammeln als
+    Kategorien mit gemeinsamem Vokabular gehalten (siehe scripts/Kategorien.py).
+    """
+
+    def __init__(self, stream_pfad: str = None, batch_groesse: int = BATCH_GROESSE, kategorisch: bool = False):
+        self.stream_pfad = stream_pfad
+        self.batch_groesse = batch_groesse
+        self.kategorisch = kategorisch
+        self._frames = []
+        self._zeilen_im_puffer = 0
+        self._zeilen_gesamt = 0
+        self._spalten = None
+
+        if stream_pfad and os.path.exists(stream_pfad):
+            os.remove(stream_pfad)
+
+    def __len__(self) -> int:
+        return self._zeilen_gesamt
+
+    def hinzufuegen(self, daten):
+        df = daten if isinstance(daten, pd.DataFrame) else pd.DataFrame.from_records(daten)
+        if df.empty:
+            return
+        if self.kategorisch:
+            df = kategorisiere(df)
+
+        self._frames.append(df)
+        self._zeilen_im_puffer += len(df)
+        self._zeilen_gesamt += len(df)
+
+        if self.stream_pfad and self._zeilen_im_puffer >= self.batch_groesse:
+            self._schreibe_batch()
+
+    def _schreibe_batch(self):
+        if not self._frames:
+            return
+
+        batch = pd.concat(self._frames, ignore_index=True)
+        erster_batch = self._spalten is None
+        if erster_batch:
+            self._spalten = list(batch.columns)
+        else:
+            neue = [s for s in batch.columns if s not in self._spalten]
+            if neue:
+                self._erweitere_kopf(neue)
+            batch = batch.reindex(columns=self._spalten)
+
+        os.makedirs(os.path.dirname(self.stream_pfad) or ".", exist_ok=True)
+        batch.to_csv(self.stream_pfad, mode="w" if erster_batch else "a", header=erster_batch, index=False)
+        self._frames = []
+        self._zeilen_im_puffer = 0
+
+    def _erweitere_kopf(self, neue: list):
+        """Schema-Drift: bisher geschriebene Zeilen blockweise mit den neuen (leeren) Spalten umschreiben."""
+        print(f"⚠️ Neue Spalten im Stream {self.stream_pfad}: {', '.join(map(str, neue))} – Kopf wird erweitert")
+        spalten = self._spalten + neue
+        tmp = f"{self.stream_pfad}.tmp"
+        for i, block in enumerate(pd.read_csv(self.stream_pfad, chunksize=LESE_BLOCK)):
+            block.reindex(columns=spalten).to_csv(tmp, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        os.replace(tmp, self.stream_pfad)
+        self._spalten = spalten
+
+    def abschliessen(self) -> str:
+        """Schreibt den Rest des Puffers und gibt den Pfad der Stream-Datei zurück (None ohne Daten)."""
+        self._schreibe_batch()
+        return self.stream_pfad if self._spalten is not None else None
+
+    def als_batches(self, block_groesse: int = LESE_BLOCK) -> Iterator[pd.DataFrame]:
+        """Gesammelte Daten blockweise; im Streaming-Modus direkt aus der Datei gelesen."""
+        if not self.stream_pfad:
+            yield from self._frames
+            return
+        if self.abschliessen() is None:
+            return
+        for block in pd.read_csv(self.stream_pfad, chunksize=block_groesse):
+            yield kategorisiere(block) if self.kategorisch else block
+
+    def als_dataframe(self) -> pd.DataFrame:
+        """Alles in einem DataFrame – im Streaming-Modus nur, wenn das Ergebnis in den Speicher passen soll."""
+        if self.stream_pfad:
+            teile = list(self.als_batches())
+            if not teile:
+                return pd.DataFrame()
+            return verbinde(teile) if self.kategorisch else pd.concat(teile, ignore_index=True)
+
+        if not self._frames:
+            return pd.DataFrame()
+        if self.kategorisch:
+            return verbinde(self._frames)
+        return pd.concat(self._frames, ignore_index=True)
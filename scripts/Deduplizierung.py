@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from scripts.Normalisierung import NORMALISIERTE_SPALTEN, normalisiere, ist_normalisiert
+from scripts.SpielerRegister import standard_register
+from scripts.TeamAlias import alias_schluessel
+
+TOLERANZ_TAGE = 3  # Lücke in Tagen, bis zu der zwei Meldungen noch als dieselbe Verletzung gelten
+EXAKTE_SPALTEN = ["Spieler", "von", "bis", "Verletzung"]
+# Bei zusammengeführten Meldungen liefert die Quelle mit dem kleinsten Rang den Text
+QUELLEN_RANG = {"Transfermarkt": 0, "TeamManager": 1, "VerletzungCrawler": 1, "FBref": 2, "FBrefCrawler": 2}
+# Texte ohne eigene Aussage passen zu jeder Verletzung
+ALLGEMEINE_TEXTE = {"", "verletzung", "injury", "injured", "unbekannt", "unknown", "notinsquad", "angeschlagen"}
+OHNE_DATUM = np.iinfo("int64").max
+
+
+def spieler_schluessel(df: pd.DataFrame) -> pd.Series:
+    """Blockschlüssel je Zeile: Transfermarkt-ID (Spalte oder Spielerregister), sonst der normalisierte Name."""
+    register = standard_register()
+    vereine = df["Team"] if "Team" in df.columns else None
+    ergebnis = register.schluessel_serie(df["Spieler"], vereine)
+    if "transfermarkt_id" in df.columns:
+        tm = df["transfermarkt_id"].astype("string").str.strip()
+        # Abweichende IDs (z. B. aus Teams.py) auf die Register-ID abbilden
+        kanonisch = {t: (register.nach_id(t).id if register.nach_id(t) else t) for t in tm.dropna().unique()}
+        ergebnis = ergebnis.where(tm.isna() | (tm == ""), "tm:" + tm.astype(object).map(kanonisch))
+    return ergebnis
+
+
+def _text_schluessel(serie: pd.Series) -> np.ndarray:
+    codes, eindeutig = pd.factorize(serie.astype(object))
+    texte = np.array([alias_schluessel(t) for t in eindeutig] + [""], dtype=object)
+    return texte[codes]
+
+
+def texte_vertraeglich(a: str, b: str) -> bool:
+    """'Zerrung' ~ 'Oberschenkelzerrung', 'injury' ~ alles; verschiedene konkrete Befunde passen nicht."""
+    if a in ALLGEMEINE_TEXTE or b in ALLGEMEINE_TEXTE:
+        return True
+    return a in b or b in a
+
+
+def cluster_zuordnen(schluessel: np.ndarray, von: np.ndarray, bis: np.ndarray, texte: np.ndarray,
+                     toleranz_tage: int = TOLERANZ_TAGE) -> np.ndarray:
+    """
+    Sortierter Sweep je Spieler-Block: eine Meldung schließt sich einem noch aktiven Cluster an, wenn sie
+    höchstens `toleranz_tage` nach dessen Ende beginnt und der Text verträglich ist. Aktiv sind nur
+    Cluster, deren Ende nicht weiter zurückliegt – bei Verletzungen eine Handvoll, daher O(n log n) insgesamt.
+    """
+    anzahl = len(von)
+    cluster = np.arange(anzahl)
+    reihenfolge = np.lexsort((von, pd.factorize(schluessel)[0]))
+
+    aktiv = []  # [cluster_id, ende, text]
+    letzter_schluessel = None
+    for i in reihenfolge:
+        if von[i] == OHNE_DATUM or schluessel[i] is None:
+            continue  # ohne Beginn kein Abgleich möglich, bleibt eigene Meldung
+        if schluessel[i] != letzter_schluessel:
+            aktiv, letzter_schluessel = [], schluessel[i]
+        aktiv = [c for c in aktiv if c[1] + toleranz_tage >= von[i]]
+        for eintrag in aktiv:
+            if texte_vertraeglich(eintrag[2], texte[i]):
+                cluster[i] = eintrag[0]
+                eintrag[1] = max(eintrag[1], bis[i])
+                if eintrag[2] in ALLGEMEINE_TEXTE:
+                    eintrag[2] = texte[i]
+                break
+        else:
+            aktiv.append([i, bis[i], texte[i]])
+    return cluster
+
+
+def undatierte_zuordnen(cluster: np.ndarray, schluessel: np.ndarray, von: np.ndarray, texte: np.ndarray) -> np.ndarray:
+    """
+    Meldungen ohne Beginn (FBref kennt nur den aktuellen Status) über Spieler und Text zuordnen: zur
+    jüngsten datierten Meldung desselben Spielers mit verträglichem Text, sonst zu einer undatierten
+    Meldung mit gleichem Spieler und Text.
+    """
+    undatiert = np.flatnonzero((von == OHNE_DATUM) & pd.notna(schluessel))
+    if not len(undatiert):
+        return cluster
+    gesucht = set(schluessel[undatiert])
+    datiert = {}  # Spieler → [(von, cluster, text)], nur für Spieler mit undatierten Meldungen
+    for i in np.flatnonzero(von != OHNE_DATUM):
+        if schluessel[i] in gesucht:
+            datiert.setdefault(schluessel[i], []).append((von[i], cluster[i], texte[i]))
+
+    ohne_datum = {}
+    for i in undatiert:
+        passend = [(v, c) for v, c, text in datiert.get(schluessel[i], []) if texte_vertraeglich(text, texte[i])]
+        if passend:
+            cluster[i] = max(passend)[1]
+        else:
+            cluster[i] = ohne_datum.setdefault((schluessel[i], texte[i]), cluster[i])
+    return cluster
+
+
+def dedupliziere(df: pd.DataFrame, toleranz_tage: int = TOLERANZ_TAGE) -> pd.DataFrame:
+    """
+    Führt dieselbe Verletzung aus verschiedenen Quellen zusammen (Transfermarkt, FBref, Vereinsseite).
+    Zusammengeführt werden Meldungen desselben Spielers mit überlappenden oder fast aneinander
+    grenzenden Zeiträumen und verträglichem Text; Meldungen ohne Datum über Spieler und Text.
+    Regel für das Ergebnis: die Zeile der bevorzugten Quelle (datierte Meldungen vor undatierten, dann
+    Quellenrang, dann ausführlicherer Text) bleibt unverändert – auch ihr Zeitraum. Hinzu kommen nur
+    'Quellen' und 'Meldungen' für die Herkunft.
+    """
+    if df.empty or "Spieler" not in df.columns:
+        return df
+
+    df = df.drop_duplicates(subset=[s for s in EXAKTE_SPALTEN if s in df.columns]).reset_index(drop=True)
+    normalisiert = df if ist_normalisiert(df) else normalisiere(df)
+    if "Verletzung" not in normalisiert.columns:
+        # FBref liefert nur einen Status ('injury', 'not in squad')
+        text = normalisiert["Status"] if "Status" in normalisiert.columns else pd.NA
+        normalisiert = normalisiert.assign(Verletzung=text)
+    if "Quelle" not in normalisiert.columns:
+        normalisiert = normalisiert.assign(Quelle=pd.NA)
+
+    von = normalisiert["von_datum"].to_numpy("datetime64[D]")
+    bis = normalisiert["bis_datum"].to_numpy("datetime64[D]")
+    # Offene Meldungen zählen für den Abgleich nur mit ihrem Beginn, sonst schluckten sie alles Spätere
+    von_tage = np.where(np.isnat(von), OHNE_DATUM, von.view("int64"))
+    bis_tage = np.where(np.isnat(bis), von_tage, bis.view("int64"))
+    schluessel = spieler_schluessel(normalisiert).to_numpy(object)
+    texte = _text_schluessel(normalisiert["Verletzung"])
+    cluster = cluster_zuordnen(schluessel, von_tage, bis_tage, texte, toleranz_tage)
+    cluster = undatierte_zuordnen(cluster, schluessel, von_tage, texte)
+
+    # Repräsentant je Cluster: datierte Meldung, bevorzugte Quelle, dann der ausführlichere Text
+    quelle = normalisiert["Quelle"].astype(object)
+    rang = quelle.map(QUELLEN_RANG).fillna(len(QUELLEN_RANG)).to_numpy()
+    textlaenge = normalisiert["Verletzung"].astype("string").str.len().fillna(0).to_numpy()
+    reihenfolge = np.lexsort((-textlaenge, rang, von_tage == OHNE_DATUM, cluster))
+    erste = reihenfolge[np.r_[True, cluster[reihenfolge][1:] != cluster[reihenfolge][:-1]]]
+
+    herkunft = pd.DataFrame({"cluster": cluster, "Quelle": quelle.astype("string")})
+    meldungen = herkunft.groupby("cluster", sort=False).size()
+    quellen = herkunft["Quelle"].groupby(herkunft["cluster"], sort=False).first()
+    # Herkunftsliste nur für tatsächlich zusammengeführte Cluster bilden (Einzelmeldungen: eigene Quelle)
+    mehrfach = meldungen.index[meldungen > 1]
+    if len(mehrfach):
+        liste = herkunft[herkunft["cluster"].isin(mehrfach)].dropna().drop_duplicates()
+        liste = liste.sort_values(["cluster", "Quelle"]).groupby("cluster")["Quelle"].agg(", ".join)
+        quellen.loc[liste.index] = liste
+
+    ergebnis = df.iloc[erste].drop(columns=[s for s in NORMALISIERTE_SPALTEN if s in df.columns])
+    ergebnis = ergebnis.reset_index(drop=True)
+    ergebnis["Quellen"] = quellen.loc[cluster[erste]].to_numpy()
+    ergebnis["Meldungen"] = meldungen.loc[cluster[erste]].to_numpy()
+
+    return normalisiere(ergebnis) if ist_normalisiert(df) else ergebnis
@@ -0,0 +1,120 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from scripts.Normalisierung import saison_startjahr_aus_datum
+from scripts.TeamAlias import standard_alias_index
+from scripts.Verfuegbarkeit import Verfuegbarkeit, saison_beginn
+
+MAX_PROZESSE = 4
+ERGEBNISSE = ["S", "U", "N"]
+# Spalten der Wertematrix: S/U/N als One-Hot, danach Tore und Punkte
+WERTE = [*ERGEBNISSE, "Tore_fuer", "Tore_gegen", "Punkte"]
+
+
+def spiele_pro_team(spiele_df: pd.DataFrame) -> dict:
+    """Spiele aus Sicht jedes Vereins (Heim- und Auswärtsseite), geordnet nach kanonischer Vereins-ID."""
+    alias = standard_alias_index()
+    seiten = [
+        pd.DataFrame({"Team": alias.ids(spiele_df["Heim"]), "Datum": spiele_df["Datum"],
+                      "Tore_fuer": spiele_df["Tore_Heim"], "Tore_gegen": spiele_df["Tore_Auswaerts"]}),
+        pd.DataFrame({"Team": alias.ids(spiele_df["Auswaerts"]), "Datum": spiele_df["Datum"],
+                      "Tore_fuer": spiele_df["Tore_Auswaerts"], "Tore_gegen": spiele_df["Tore_Heim"]}),
+    ]
+    spiele = pd.concat(seiten, ignore_index=True).dropna(subset=["Team", "Datum", "Tore_fuer", "Tore_gegen"])
+    return {str(team): teil.drop(columns="Team").sort_values("Datum", ignore_index=True)
+            for team, teil in spiele.groupby("Team", sort=True)}
+
+
+def _wertematrix(spiele: pd.DataFrame) -> np.ndarray:
+    """Spiele × WERTE: Ergebnis als One-Hot (S/U/N), Tore für/gegen und Punkte."""
+    tore_fuer = spiele["Tore_fuer"].to_numpy("float64")
+    tore_gegen = spiele["Tore_gegen"].to_numpy("float64")
+    ergebnis = 1 - np.sign(tore_fuer - tore_gegen).astype("int64")  # 0 = S, 1 = U, 2 = N
+    one_hot = np.eye(len(ERGEBNISSE))[ergebnis]
+    punkte = np.array([3.0, 1.0, 0.0])[ergebnis]
+    return np.column_stack([one_hot, tore_fuer, tore_gegen, punkte])
+
+
+def team_einfluss(team: str, spiele: pd.DataFrame, matrizen: dict) -> pd.DataFrame:
+    """
+    Einfluss aller Spieler eines Vereins in einem Durchgang. Aus den Ausfall-Bitmaps der Saisons entsteht
+    eine Spiele × Spieler-Matrix 'abwesend'; 'verfuegbar' sind die Spiele der Saisons, in denen der Spieler
+    in den Verletzungsdaten des Vereins auftaucht, ohne Ausfall. Die Summen je Spieler sind dann ein
+    einziges Matrixprodukt mit der Wertematrix.
+    """
+    spieler = sorted(set().union(*(m.spieler for m in matrizen.values()))) if matrizen else []
+    if spiele.empty or not spieler:
+        return pd.DataFrame()
+    spalte = {name: i for i, name in enumerate(spieler)}
+
+    saison = saison_startjahr_aus_datum(spiele["Datum"]).to_numpy("int64")
+    tage = (spiele["Datum"].to_numpy("datetime64[D]") - saison_beginn(saison)).astype("int64")
+
+    abwesend = np.zeros((len(spiele), len(spieler)), dtype=bool)
+    im_kader = np.zeros_like(abwesend)
+    for s in np.unique(saison):
+        matrix = matrizen.get(int(s))
+        if matrix is None:
+            continue
+        zeilen = np.flatnonzero(saison == s)
+        spalten = np.fromiter((spalte[n] for n in matrix.spieler), dtype="int64", count=len(matrix.spieler))
+        abwesend[np.ix_(zeilen, spalten)] = matrix.ausfall[:, tage[zeilen]].T
+        im_kader[np.ix_(zeilen, spalten)] = True
+
+    werte = _wertematrix(spiele)
+    ergebnis = {"Team": standard_alias_index().name(team), "Spieler": spieler}
+    for seite, maske in (("verfuegbar", im_kader & ~abwesend), ("abwesend", abwesend)):
+        summen = maske.T.astype("float64") @ werte
+        anzahl = maske.sum(axis=0)
+        ergebnis[f"Spiele_{seite}"] = anzahl
+        for i, name in enumerate(WERTE):
+            ergebnis[f"{name}_{seite}"] = summen[:, i].astype("int64")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ergebnis[f"Punkte_pro_Spiel_{seite}"] = np.where(anzahl > 0, summen[:, -1] / anzahl, np.nan)
+
+    df = pd.DataFrame(ergebnis)
+    df["Punkte_Differenz"] = df["Punkte_pro_Spiel_verfuegbar"] - df["Punkte_pro_Spiel_abwesend"]
+    return df
+
+
+def _team_einfluss_auftrag(auftrag: tuple) -> pd.DataFrame:
+    return team_einfluss(*auftrag)
+
+
+class EinflussAnalyse:
+    """
+    'Mit vs. ohne Spieler' für jeden Spieler und jeden Verein: Ergebnisverteilung S/U/N, Tore für/gegen
+    und Punkte pro Spiel, getrennt nach verfügbar und abwesend. Vereine sind unabhängig voneinander und
+    werden auf einen Prozess-Pool verteilt.
+    """
+
+    def __init__(self, spiele_df: pd.DataFrame, verfuegbarkeit: Verfuegbarkeit, max_prozesse: int = MAX_PROZESSE):
+        self.spiele_df = spiele_df
+        self.verfuegbarkeit = verfuegbarkeit
+        self.max_prozesse = max_prozesse
+
+    def _auftraege(self, teams=None) -> list:
+        spiele = spiele_pro_team(self.spiele_df)
+        alias = standard_alias_index()
+        gewuenscht = None if teams is None else {alias.id(t) or t for t in teams}
+
+        matrizen = {}
+        for (team, saison), matrix in self.verfuegbarkeit.matrizen.items():
+            matrizen.setdefault(team, {})[saison] = matrix
+        return [(team, spiele[team], matrizen[team]) for team in sorted(spiele)
+                if team in matrizen and (gewuenscht is None or team in gewuenscht)]
+
+    def berechne(self, teams=None) -> pd.DataFrame:
+        auftraege = self._auftraege(teams)
+        if self.max_prozesse <= 1 or len(auftraege) <= 1:
+            teile = [_team_einfluss_auftrag(a) for a in auftraege]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_prozesse) as pool:
+                teile = list(pool.map(_team_einfluss_auftrag, auftraege))
+
+        teile = [t for t in teile if not t.empty]
+        if not teile:
+            return pd.DataFrame()
+        return pd.concat(teile, ignore_index=True)
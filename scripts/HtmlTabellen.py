@@ -0,0 +1,151 @@
+import re
+from collections import namedtuple
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+from bs4 import BeautifulSoup
+
+# Eine Tabellenzelle mit den Attributen, die die Crawler tatsächlich brauchen
+Zelle = namedtuple("Zelle", ["text", "klasse", "href", "link_text", "img_alt"])
+
+BACKENDS = ("selectolax", "lxml", "bs4")
+
+_TABLE_TAG = re.compile(r"<table\b[^>]*>", re.IGNORECASE)
+_TABLE_GRENZE = re.compile(r"<(/?)table\b", re.IGNORECASE)
+_ATTRIBUT = r"""\b{}\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))"""
+
+
+def verfuegbare_backends() -> list:
+    verfuegbar = {"selectolax": HTMLParser is not None, "lxml": lxml is not None, "bs4": True}
+    return [name for name in BACKENDS if verfuegbar[name]]
+
+
+def _attribut(tag: str, name: str):
+    treffer = re.search(_ATTRIBUT.format(name), tag, re.IGNORECASE)
+    if not treffer:
+        return None
+    return next(g for g in treffer.groups() if g is not None)
+
+
+def schneide_tabelle(html: str, klasse: str = None, tabellen_id: str = None):
+    """Schneidet die erste passende <table> (inkl. verschachtelter Tabellen) als Fragment aus dem Dokument."""
+    for tag in _TABLE_TAG.finditer(html):
+        if klasse is not None and klasse not in (_attribut(tag.group(0), "class") or "").split():
+            continue
+        if tabellen_id is not None and _attribut(tag.group(0), "id") != tabellen_id:
+            continue
+
+        tiefe = 1
+        for grenze in _TABLE_GRENZE.finditer(html, tag.end()):
+            tiefe += -1 if grenze.group(1) else 1
+            if tiefe == 0:
+                ende = html.find(">", grenze.end())
+                return html[tag.start():ende + 1 if ende != -1 else len(html)]
+        return html[tag.start():]
+    return None
+
+
+def _zeilen_selectolax(fragment: str, mit_details: bool):
+    tabelle = HTMLParser(fragment).css_first("table")
+    for tr in tabelle.css("tr"):
+        zellen = []
+        for td in tr.css("td"):
+            text = td.text(deep=True, separator="", strip=True)
+            if not mit_details:
+                zellen.append(text)
+                continue
+            a = td.css_first("a")
+            img = td.css_first("img")
+            zellen.append(Zelle(
+                text,
+                td.attributes.get("class") or "",
+                a.attributes.get("href") if a is not None else None,
+                a.text(deep=True, separator="", strip=True) if a is not None else None,
+                (img.attributes.get("alt") or "") if img is not None else None,
+            ))
+        yield tr.attributes.get("class") or "", zellen
+
+
+def _text_lxml(element) -> str:
+    return "".join(teil.strip() for teil in element.itertext())
+
+
+def _zeilen_lxml(fragment: str, mit_details: bool):
+    tabelle = lxml.html.fragment_fromstring(fragment, create_parent=False)
+    for tr in tabelle.iter("tr"):
+        zellen = []
+        for td in tr.iter("td"):
+            text = _text_lxml(td)
+            if not mit_details:
+                zellen.append(text)
+                continue
+            a = next(td.iter("a"), None)
+            img = next(td.iter("img"), None)
+            zellen.append(Zelle(
+                text,
+                td.get("class") or "",
+                a.get("href") if a is not None else None,
+                _text_lxml(a) if a is not None else None,
+                (img.get("alt") or "") if img is not None else None,
+            ))
+        yield tr.get("class") or "", zellen
+
+
+def _zeilen_bs4(fragment: str, mit_details: bool):
+    tabelle = BeautifulSoup(fragment, "html.parser").find("table")
+    for tr in tabelle.find_all("tr"):
+        zellen = []
+        for td in tr.find_all("td"):
+            text = td.get_text(strip=True)
+            if not mit_details:
+                zellen.append(text)
+                continue
+            a = td.find("a")
+            img = td.find("img")
+            zellen.append(Zelle(
+                text,
+                " ".join(td.get("class") or []),
+                a.get("href") if a is not None else None,
+                a.get_text(strip=True) if a is not None else None,
+                (img.get("alt") or "") if img is not None else None,
+            ))
+        yield " ".join(tr.get("class") or []), zellen
+
+
+_PARSER = {"selectolax": _zeilen_selectolax, "lxml": _zeilen_lxml, "bs4": _zeilen_bs4}
+
+
+def extrahiere_zeilen(html: str, klasse: str = "items", tabellen_id: str = None, zeilen_klassen=None,
+                      ohne_zeilen_klassen=None, mit_details: bool = False, backend: str = None):
+    """
+    Liefert die Zeilen der ersten passenden Tabelle als Tupel von Zelltexten (bzw. Zelle-Tupeln mit mit_details).
+    Wie bei BeautifulSoup.find_all werden Zeilen und Zellen verschachtelter Tabellen mitgezählt.
+    Gibt None zurück, wenn die Tabelle nicht existiert.
+    """
+    if tabellen_id is not None:
+        klasse = None
+    fragment = schneide_tabelle(html, klasse=klasse, tabellen_id=tabellen_id)
+    if fragment is None:
+        return None
+
+    backend = backend or verfuegbare_backends()[0]
+    zeilen = []
+    for zeilen_klasse, zellen in _PARSER[backend](fragment, mit_details):
+        tokens = zeilen_klasse.split()
+        if zeilen_klassen is not None and not any(k in tokens for k in zeilen_klassen):
+            continue
+        if ohne_zeilen_klassen is not None and any(k in tokens for k in ohne_zeilen_klassen):
+            continue
+        zeilen.append(tuple(zellen))
+    return zeilen
@@ -0,0 +1,137 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scripts.AntwortCache import AntwortCache
+from scripts.RateLimiter import RateLimiter, standard_limiter
+
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+TIMEOUT = 20  # Sekunden
+MAX_VERSUCHE = 5
+BACKOFF_BASIS = 1.0  # Sekunden, verdoppelt sich pro Versuch
+BACKOFF_MAX = 60.0
+RETRY_STATUS = {429, 503}
+POOL_GROESSE = 16  # offene Keep-Alive-Verbindungen pro Host
+
+
+def retry_after_sekunden(res: requests.Response):
+    """Liest den Retry-After-Header (Sekunden oder HTTP-Datum), sonst None."""
+    wert = res.headers.get("Retry-After")
+    if not wert:
+        return None
+    try:
+        return max(0.0, float(wert))
+    except ValueError:
+        pass
+    try:
+        zeitpunkt = parsedate_to_datetime(wert)
+    except (TypeError, ValueError):
+        return None
+    if zeitpunkt.tzinfo is None:
+        zeitpunkt = zeitpunkt.replace(tzinfo=timezone.utc)
+    return max(0.0, (zeitpunkt - datetime.now(timezone.utc)).total_seconds())
+
+
+class HttpClient:
+    """Gemeinsame Session mit Connection-Pooling, Timeout, Backoff, Rate-Limit und optionalem Festplatten-Cache."""
+
+    def __init__(self, headers: dict = None, timeout: float = TIMEOUT, max_versuche: int = MAX_VERSUCHE,
+                 backoff_basis: float = BACKOFF_BASIS, backoff_max: float = BACKOFF_MAX,
+                 pool_groesse: int = POOL_GROESSE, cache: AntwortCache = None, limiter: RateLimiter = None):
+        self.cache = cache
+        self.limiter = limiter
+        self.timeout = timeout
+        self.max_versuche = max_versuche
+        self.backoff_basis = backoff_basis
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_groesse, pool_maxsize=pool_groesse)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _wartezeit(self, versuch: int, res: requests.Response = None) -> float:
+        if res is not None:
+            retry_after = retry_after_sekunden(res)
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        # Exponentieller Backoff mit "Full Jitter", damit parallele Crawler nicht im Gleichtakt wiederholen
+        return random.uniform(0, min(self.backoff_max, self.backoff_basis * 2 ** versuch))
+
+    def get(self, url: str, cache: bool = True, **kwargs) -> requests.Response:
+        if self.cache is None or not cache:
+            return self._get_mit_retry(url, **kwargs)
+
+        eintrag = self.cache.suche(url, kwargs.get("params"))
+        if eintrag is not None and eintrag.frisch:
+            try:
+                return self.cache.als_response(eintrag)
+            except FileNotFoundError:
+                eintrag = None  # zwischenzeitlich verdrängt
+
+        if eintrag is not None:
+            kwargs["headers"] = {**kwargs.get("headers", {}), **eintrag.bedingte_header()}
+
+        res = self._get_mit_retry(url, **kwargs)
+
+        if res.status_code == 304 and eintrag is not None:
+            self.cache.bestaetige(eintrag, res)
+            try:
+                return self.cache.als_response(eintrag)
+            except FileNotFoundError:
+                kwargs["headers"] = {k: v for k, v in kwargs["headers"].items()
+                                     if k not in ("If-None-Match", "If-Modified-Since")}
+                res = self._get_mit_retry(url, **kwargs)
+
+        if res.status_code == 200:
+            self.cache.speichere(url, res, kwargs.get("params"))
+        return res
+
+    def _get_mit_retry(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        letzter_versuch = self.max_versuche - 1
+
+        for versuch in range(self.max_versuche):
+            if self.limiter is not None:
+                self.limiter.warte(url)
+            try:
+                res = self.session.get(url, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if versuch == letzter_versuch:
+                    raise
+                warte = self._wartezeit(versuch)
+                print(f"⏳ {e.__class__.__name__} bei {url} – neuer Versuch in {warte:.1f}s")
+                time.sleep(warte)
+                continue
+
+            if self.limiter is not None:
+                self.limiter.rueckmeldung(url, res.status_code)
+            if res.status_code not in RETRY_STATUS or versuch == letzter_versuch:
+                return res
+
+            warte = self._wartezeit(versuch, res)
+            print(f"🚦 Status {res.status_code} bei {url} – neuer Versuch in {warte:.1f}s")
+            time.sleep(warte)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def standard_client() -> HttpClient:
+    """Liefert den prozessweit geteilten HttpClient."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(cache=AntwortCache(), limiter=standard_limiter())
+        return _client
+
+
+def abrufen(url: str, **kwargs) -> requests.Response:
+    return standard_client().get(url, **kwargs)
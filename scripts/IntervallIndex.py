@@ -0,0 +1,93 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from scripts.Normalisierung import normalisiere, ist_normalisiert
+
+def _als_tage(werte) -> tuple:
+    """datetime-ähnliche Werte → (Tagesnummer int64, Maske ungültiger Werte)."""
+    tage = np.asarray(pd.to_datetime(pd.Series(werte, dtype="datetime64[ns]" if len(werte) == 0 else None)),
+                      dtype="datetime64[D]")
+    ungueltig = np.isnat(tage)
+    return tage.view("int64"), ungueltig
+
+
+def verschmelze_pro_schluessel(von: np.ndarray, bis: np.ndarray, schluessel: np.ndarray):
+    """
+    Fasst überlappende Zeiträume desselben Schlüssels (z. B. Spieler) zusammen, vektorisiert.
+    Danach sind die Zeiträume je Schlüssel disjunkt – jeder aktive Zeitraum steht für genau einen Schlüssel.
+    """
+    if len(von) == 0:
+        return von, bis, schluessel
+
+    reihenfolge = np.lexsort((von, schluessel))
+    von, bis, schluessel = von[reihenfolge], bis[reihenfolge], schluessel[reihenfolge]
+
+    df = pd.DataFrame({"s": schluessel, "bis": bis})
+    bisher_max = df.groupby("s", sort=False)["bis"].cummax().groupby(df["s"], sort=False).shift()
+    neuer_block = (bisher_max.isna() | (von > bisher_max.to_numpy())).to_numpy()
+    erste = np.flatnonzero(neuer_block)
+    return von[erste], np.maximum.reduceat(bis, erste), schluessel[erste]
+
+
+class IntervallIndex:
+    """
+    Geschlossene Zeiträume [von, bis] (tagesgenau) mit Schlüssel; beantwortet für viele Zeitpunkte auf
+    einmal, wie viele bzw. welche Schlüssel aktiv sind. Vereinsbezogene Abfragen laufen über
+    scripts/Verfuegbarkeit.py.
+    Zählen läuft über zwei sortierte Arrays und searchsorted (O((n + m) log n)), das Auflisten über
+    einen einzigen Sweep mit Heap.
+    """
+
+    def __init__(self, von, bis, schluessel=None):
+        von, von_ungueltig = _als_tage(von)
+        bis, bis_ungueltig = _als_tage(bis)
+        gueltig = ~(von_ungueltig | bis_ungueltig) & (von <= bis)
+
+        schluessel = np.arange(len(gueltig)) if schluessel is None else np.asarray(schluessel, dtype=object)
+        schluessel_codes, self.schluessel_werte = pd.factorize(schluessel[gueltig])
+        self.von, self.bis, self.codes = verschmelze_pro_schluessel(von[gueltig], bis[gueltig], schluessel_codes)
+        self._starts = np.sort(self.von)
+        self._enden = np.sort(self.bis)
+
+    @classmethod
+    def aus_verletzungen(cls, df: pd.DataFrame, schluessel_spalte: str = "Spieler") -> "IntervallIndex":
+        """Aus einem (ggf. noch zu normalisierenden) Verletzungs-DataFrame; offene Zeiträume bleiben außen vor."""
+        if df.empty:
+            return cls([], [], [])
+        df = df if ist_normalisiert(df) else normalisiere(df)
+        return cls(df["von_datum"], df["bis_datum"], df[schluessel_spalte].astype(object))
+
+    def __len__(self) -> int:
+        return len(self.von)
+
+    def anzahl_aktiv(self, zeitpunkte) -> np.ndarray:
+        """Anzahl aktiver Schlüssel je Anfrage: begonnen (von <= t) minus beendet (bis < t)."""
+        t, ungueltig = _als_tage(zeitpunkte)
+        anzahl = np.searchsorted(self._starts, t, side="right") - np.searchsorted(self._enden, t, side="left")
+        anzahl[ungueltig] = 0
+        return anzahl
+
+    def aktiv(self, zeitpunkte) -> np.ndarray:
+        return self.anzahl_aktiv(zeitpunkte) > 0
+
+    def schluessel_aktiv(self, zeitpunkte) -> list:
+        """Liste der aktiven Schlüssel je Anfrage (sortiert), in einem Sweep über die sortierten Anfragen."""
+        t, ungueltig = _als_tage(zeitpunkte)
+        reihenfolge_iv = np.argsort(self.von, kind="stable")
+        von, bis, codes = self.von[reihenfolge_iv], self.bis[reihenfolge_iv], self.codes[reihenfolge_iv]
+
+        ergebnis = [[] for _ in range(len(t))]
+        heap = []
+        i = 0
+        for q in np.argsort(t, kind="stable"):
+            if ungueltig[q]:
+                continue
+            while i < len(von) and von[i] <= t[q]:
+                heapq.heappush(heap, (bis[i], codes[i]))
+                i += 1
+            while heap and heap[0][0] < t[q]:
+                heapq.heappop(heap)
+            ergebnis[q] = sorted(self.schluessel_werte[c] for _, c in heap)
+        return ergebnis
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+MAX_PARALLEL = 4
+
+
+class JobScheduler:
+    """
+    Arbeitet Jobs ({Job-ID: Funktion ohne Argumente}) mit begrenzter Parallelität ab.
+    Jedes Ergebnis wird sofort als JSON-Checkpoint geschrieben; nach einem Absturz
+    werden beim nächsten Start nur die noch offenen Jobs ausgeführt.
+    """
+
+    def __init__(self, checkpoint_verzeichnis: str, max_parallel: int = MAX_PARALLEL):
+        self.checkpoint_verzeichnis = checkpoint_verzeichnis
+        self.max_parallel = max_parallel
+
+    def _pfad(self, job_id: str) -> str:
+        lesbar = re.sub(r"[^a-z0-9]+", "_", job_id.lower()).strip("_")[:60]
+        kurz_hash = hashlib.sha1(job_id.encode("utf-8")).hexdigest()[:10]
+        return os.path.join(self.checkpoint_verzeichnis, f"{lesbar}_{kurz_hash}.json")
+
+    def erledigt(self, job_id: str) -> bool:
+        return os.path.exists(self._pfad(job_id))
+
+    def lade(self, job_id: str):
+        with open(self._pfad(job_id), "r", encoding="utf-8") as f:
+            return json.load(f)["ergebnis"]
+
+    def _speichere(self, job_id: str, ergebnis):
+        os.makedirs(self.checkpoint_verzeichnis, exist_ok=True)
+        pfad = self._pfad(job_id)
+        with open(f"{pfad}.tmp", "w", encoding="utf-8") as f:
+            json.dump({"job": job_id, "ergebnis": ergebnis}, f, ensure_ascii=False)
+        os.replace(f"{pfad}.tmp", pfad)
+
+    def ausfuehren(self, jobs: dict) -> dict:
+        offen = {job_id: funktion for job_id, funktion in jobs.items() if not self.erledigt(job_id)}
+        print(f"🗂️ {len(jobs) - len(offen)} von {len(jobs)} Jobs aus Checkpoint, {len(offen)} offen")
+
+        fehlgeschlagen = []
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            futures = {pool.submit(funktion): job_id for job_id, funktion in offen.items()}
+            for nummer, future in enumerate(as_completed(futures), start=1):
+                job_id = futures[future]
+                try:
+                    self._speichere(job_id, future.result())
+                    print(f"✅ [{nummer}/{len(offen)}] {job_id}")
+                except Exception as e:
+                    fehlgeschlagen.append(job_id)
+                    print(f"❌ [{nummer}/{len(offen)}] {job_id}: {e}")
+
+        if fehlgeschlagen:
+            print(f"⚠️ {len(fehlgeschlagen)} Jobs fehlgeschlagen – sie werden beim nächsten Start wiederholt.")
+
+        return {job_id: self.lade(job_id) for job_id in jobs if self.erledigt(job_id)}
+
+    def leere(self):
+        """Entfernt alle Checkpoints (z. B. nachdem das Gesamtergebnis gespeichert wurde)."""
+        shutil.rmtree(self.checkpoint_verzeichnis, ignore_errors=True)
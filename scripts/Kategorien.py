@@ -0,0 +1,72 @@
+import threading
+
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+# Spalten mit kleinem, sich ständig wiederholendem Wertevorrat
+KATEGORISCHE_SPALTEN = ["Spieler", "Team", "Verletzung", "Quelle", "Saison"]
+
+
+class Vokabular:
+    """
+    Prozessweit geteilte Kategorien pro Spalte. Alle Frames verwenden für dieselbe Spalte denselben
+    CategoricalDtype, damit concat und groupby kategorisch bleiben. Neue Werte werden nur angehängt,
+    damit die Codes bereits kategorisierter Frames gültig bleiben; die Reihenfolge der Kategorien ist
+    daher die des ersten Auftretens. Wo alphabetische Reihenfolge gebraucht wird, nach Text sortieren.
+    """
+
+    def __init__(self):
+        self._kategorien = {}
+        self._lock = threading.Lock()
+
+    def dtype(self, spalte: str, werte=None) -> CategoricalDtype:
+        with self._lock:
+            bekannt = self._kategorien.get(spalte, pd.Index([], dtype=object))
+            if werte is not None:
+                eindeutig = pd.Index(pd.Series(werte, dtype=object).dropna().unique())
+                neu = eindeutig[~eindeutig.isin(bekannt)]  # difference() würde sortieren
+                if len(neu):
+                    bekannt = bekannt.append(neu)
+                    self._kategorien[spalte] = bekannt
+            return CategoricalDtype(bekannt)
+
+
+_vokabular = Vokabular()
+
+
+def standard_vokabular() -> Vokabular:
+    return _vokabular
+
+
+def _werte(serie: pd.Series):
+    return serie.cat.categories if isinstance(serie.dtype, CategoricalDtype) else serie.unique()
+
+
+def kategorisiere(df: pd.DataFrame, spalten=KATEGORISCHE_SPALTEN, vokabular: Vokabular = None) -> pd.DataFrame:
+    """Wandelt die vorhandenen Spalten aus `spalten` in Kategorien mit gemeinsamem Vokabular um."""
+    vokabular = vokabular or _vokabular
+    vorhanden = [s for s in spalten if s in df.columns]
+    if not vorhanden:
+        return df
+    return df.assign(**{s: df[s].astype(vokabular.dtype(s, _werte(df[s]))) for s in vorhanden})
+
+
+def verbinde(frames, vokabular: Vokabular = None) -> pd.DataFrame:
+    """
+    pd.concat, das kategorische Spalten erhält: Frames mit unterschiedlichen Kategorien werden vorher
+    auf die gemeinsame Kategorienliste des Vokabulars gebracht (sonst fiele concat auf object zurück).
+    """
+    vokabular = vokabular or _vokabular
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not frames:
+        return pd.DataFrame()
+
+    for spalte in KATEGORISCHE_SPALTEN:
+        teile = [f[spalte] for f in frames if spalte in f.columns]
+        if not any(isinstance(t.dtype, CategoricalDtype) for t in teile):
+            continue
+        for t in teile:
+            dtype = vokabular.dtype(spalte, _werte(t))
+        frames = [f.assign(**{spalte: f[spalte].astype(dtype)}) if spalte in f.columns else f for f in frames]
+
+    return pd.concat(frames, ignore_index=True)
@@ -1,22 +1,31 @@
 import pandas as pd
 from scripts.VerletzungCrawler import VerletzungCrawler
 from scripts.fbref_crawler import FBrefCrawler
+from scripts.AbrufMemo import AbrufMemo
+from scripts.SpielerRegister import standard_register
 
 class MultiSourceCrawler:
-    def __init__(self, name: str, transfermarkt_id: int = None, fbref_url: str = None):
+    def __init__(self, name: str, transfermarkt_id: int = None, fbref_url: str = None, memo: AbrufMemo = None):
         self.name = name
         self.transfermarkt_id = transfermarkt_id
         self.fbref_url = fbref_url
+        self.memo = memo if memo is not None else AbrufMemo()
+
+    def transfermarkt_url(self) -> str:
+        if not self.transfermarkt_id:
+            return None
+
+        register = standard_register()
+        spieler = register.nach_id(self.transfermarkt_id)
+        url_name = spieler.slug if spieler else register.slug(self.name)
+        return f"https://www.transfermarkt.de/{url_name}/verletzungen/spieler/{self.transfermarkt_id}"
 
     def scrape_transfermarkt(self) -> pd.DataFrame:
         if not self.transfermarkt_id:
             return pd.DataFrame()
 
         try:
-            url_name = self.name.lower().replace(" ", "-").replace("ä", "ae").replace("ö", "oe")\
-                .replace("ü", "ue").replace("ß", "ss")
-            tm_url = f"https://www.transfermarkt.de/{url_name}/verletzungen/spieler/{self.transfermarkt_id}"
-            tm_crawler = VerletzungCrawler(tm_url)
+            tm_crawler = VerletzungCrawler(self.transfermarkt_url())
             df_tm = tm_crawler.scrape()
 
             if not df_tm.empty:
@@ -32,8 +41,14 @@ class MultiSourceCrawler:
             return pd.DataFrame()
 
         try:
-            fbref_crawler = FBrefCrawler(self.fbref_url)
-            df_fbref = fbref_crawler.scrape()
+            # Die FBref-URL ist eine Teamseite: einmal pro Lauf laden, dann auf den Spieler filtern
+            team_df = self.memo.hole(self.fbref_url, FBrefCrawler(self.fbref_url).scrape)
+            if team_df.empty:
+                return pd.DataFrame()
+
+            # FBref schreibt Namen ohne Umlaute/Akzente – Abgleich über den Register-Schlüssel
+            register = standard_register()
+            df_fbref = team_df[register.schluessel_serie(team_df["Spieler"]) == register.schluessel(self.name)].copy()
             if not df_fbref.empty:
                 df_fbref["Quelle"] = "FBref"
             return df_fbref
@@ -0,0 +1,70 @@
+import pandas as pd
+
+DATUMS_FORMAT = "%d.%m.%Y"
+SAISON_STICHTAG = 7  # Monat, ab dem ein Datum zur neuen Saison zählt
+
+NORMALISIERTE_SPALTEN = ["von_datum", "bis_datum", "Tage_verpasst", "Saison_start", "offen"]
+
+
+def parse_datum(serie: pd.Series) -> pd.Series:
+    """TT.MM.JJJJ (Transfermarkt) bzw. JJJJ-MM-TT → datetime64; '-', '?', leer usw. werden NaT."""
+    text = serie.astype("string").str.strip()
+    datum = pd.to_datetime(text, format=DATUMS_FORMAT, errors="coerce")
+    return datum.fillna(pd.to_datetime(text, format="%Y-%m-%d", errors="coerce"))
+
+
+def tage_verpasst(serie: pd.Series) -> pd.Series:
+    """'6 Tage' / '1 Tag' / '6' → 6 (Int64); Angaben in Spielen o. ä. werden <NA>."""
+    zahl = serie.astype("string").str.strip().str.extract(r"^(\d+)(?:\s*Tage?)?$", expand=False)
+    return pd.to_numeric(zahl, errors="coerce").astype("Int64")
+
+
+def saison_startjahr(serie: pd.Series) -> pd.Series:
+    """'24/25' → 2024, '2023/2024' → 2023, '2022' → 2022 (Int64, sonst <NA>)."""
+    teil = serie.astype("string").str.strip().str.extract(r"^(\d{2}|\d{4})(?:/|$)", expand=False)
+    jahr = pd.to_numeric(teil, errors="coerce").astype("Int64")
+    return jahr.where(teil.str.len() != 2, jahr + 2000)
+
+
+def saison_startjahr_aus_datum(datum: pd.Series) -> pd.Series:
+    return (datum.dt.year - (datum.dt.month < SAISON_STICHTAG).astype(int)).astype("Int64")
+
+
+def normalisiere(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ergänzt die Rohspalten (von, bis, Spiele_verpasst, Saison) einmalig um typisierte Spalten:
+    von_datum/bis_datum (datetime64), Tage_verpasst (Int64), Saison_start (Int64) und offen (bool,
+    kein lesbares Enddatum). Danach genügen reine Spaltenvergleiche statt erneutem Parsen.
+    """
+    df = df.copy()
+    if df.empty:
+        return df.assign(von_datum=pd.Series(dtype="datetime64[ns]"), bis_datum=pd.Series(dtype="datetime64[ns]"),
+                         Tage_verpasst=pd.Series(dtype="Int64"), Saison_start=pd.Series(dtype="Int64"),
+                         offen=pd.Series(dtype="bool"))
+
+    leer = pd.Series(pd.NA, index=df.index, dtype="string")
+    von = parse_datum(df["von"] if "von" in df.columns else leer)
+    bis = parse_datum(df["bis"] if "bis" in df.columns else leer)
+
+    tage = tage_verpasst(df["Spiele_verpasst"] if "Spiele_verpasst" in df.columns else leer)
+    # Fehlt die Angabe, aus dem Zeitraum ableiten (beide Tage eingeschlossen, wie bei Transfermarkt)
+    tage = tage.fillna(((bis - von).dt.days + 1).astype("Int64"))
+
+    if "Saison" in df.columns:
+        if not isinstance(df["Saison"].dtype, pd.CategoricalDtype):
+            df["Saison"] = df["Saison"].astype("string").str.strip()
+        saison_start = saison_startjahr(df["Saison"])
+    else:
+        saison_start = pd.Series(pd.NA, index=df.index, dtype="Int64")
+    saison_start = saison_start.fillna(saison_startjahr_aus_datum(von))
+
+    df["von_datum"] = von
+    df["bis_datum"] = bis
+    df["Tage_verpasst"] = tage
+    df["Saison_start"] = saison_start
+    df["offen"] = von.notna() & bis.isna()
+    return df
+
+
+def ist_normalisiert(df: pd.DataFrame) -> bool:
+    return all(spalte in df.columns for spalte in NORMALISIERTE_SPALTEN)
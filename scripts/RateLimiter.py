@@ -0,0 +1,98 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+# Nachhaltige Startraten in Anfragen pro Sekunde; unbekannte Hosts bekommen STANDARD_RATE
+HOST_RATEN = {
+    "www.transfermarkt.de": 2.0,
+    "fbref.com": 0.3,
+    "understat.com": 1.0,
+}
+STANDARD_RATE = 1.0
+MIN_RATE = 0.05
+MAX_FAKTOR = 2.0  # wie weit über die Startrate hinaus beschleunigt werden darf
+BURST = 2  # Tokens, die sich bei Leerlauf ansammeln dürfen
+DROSSEL_FAKTOR = 0.5  # multiplikativ bremsen bei 429/503 ...
+ERHOLUNG = 0.05  # ... und additiv (pro gesunder Antwort) wieder beschleunigen
+DROSSEL_STATUS = {429, 503}
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float = BURST, min_rate: float = MIN_RATE, max_rate: float = None):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate * MAX_FAKTOR
+        self.tokens = burst
+        self.zeitpunkt = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _auffuellen(self, jetzt: float):
+        self.tokens = min(self.burst, self.tokens + (jetzt - self.zeitpunkt) * self.rate)
+        self.zeitpunkt = jetzt
+
+    def warte(self) -> float:
+        """Blockiert, bis ein Token frei ist. Wartende reservieren ihr Token vorab (Tokens dürfen negativ werden)."""
+        with self._lock:
+            self._auffuellen(time.monotonic())
+            self.tokens -= 1
+            wartezeit = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+        if wartezeit > 0:
+            time.sleep(wartezeit)
+        return wartezeit
+
+    def drossle(self):
+        with self._lock:
+            self._auffuellen(time.monotonic())
+            self.rate = max(self.min_rate, self.rate * DROSSEL_FAKTOR)
+            self.tokens = min(self.tokens, 0)
+
+    def erhole(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + ERHOLUNG)
+
+
+class RateLimiter:
+    """Token-Bucket pro Host mit AIMD-Anpassung: bei 429/503 halbieren, bei gesunden Antworten langsam steigern."""
+
+    def __init__(self, host_raten: dict = None, standard_rate: float = STANDARD_RATE, burst: float = BURST):
+        self.host_raten = {**HOST_RATEN, **(host_raten or {})}
+        self.standard_rate = standard_rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlparse(url).netloc or url
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = self._host(url)
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.host_raten.get(host, self.standard_rate), burst=self.burst)
+            return self._buckets[host]
+
+    def warte(self, url: str) -> float:
+        return self.bucket(url).warte()
+
+    def rueckmeldung(self, url: str, status_code: int):
+        bucket = self.bucket(url)
+        if status_code in DROSSEL_STATUS:
+            bucket.drossle()
+            print(f"🐢 Drossle {self._host(url)} auf {bucket.rate:.2f} Anfragen/s")
+        elif status_code < 400:
+            bucket.erhole()
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def standard_limiter() -> RateLimiter:
+    """Liefert den prozessweit geteilten RateLimiter."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
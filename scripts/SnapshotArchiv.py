@@ -0,0 +1,129 @@
+import gzip
+import json
+import os
+import re
+import threading
+from datetime import date
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from scripts.HtmlTabellen import schneide_tabelle
+
+ARCHIV_VERZEICHNIS = "html_archiv"
+INDEX_DATEI = "index.json"
+
+
+def saison_aus_url(url: str):
+    treffer = re.search(r"saison_id/(\d{4})", url or "")
+    return int(treffer.group(1)) if treffer else None
+
+
+def dateiname_fuer(teamname: str) -> str:
+    return teamname.lower().replace(" ", "_").replace(".", "").replace("ä", "ae").replace("ü", "ue").replace("ö", "oe")
+
+
+class SnapshotArchiv:
+    """Komprimierte HTML-Schnappschüsse (zstd oder gzip) mit Index über Team, Saison und Abrufdatum."""
+
+    def __init__(self, verzeichnis: str = ARCHIV_VERZEICHNIS, kompression: str = None, nur_tabelle: bool = False):
+        self.verzeichnis = verzeichnis
+        self.kompression = kompression or ("zst" if zstandard is not None else "gz")
+        self.nur_tabelle = nur_tabelle
+        self._lock = threading.Lock()
+        self._index = None
+
+    @property
+    def index_pfad(self) -> str:
+        return os.path.join(self.verzeichnis, INDEX_DATEI)
+
+    @property
+    def index(self) -> list:
+        if self._index is None:
+            if os.path.exists(self.index_pfad):
+                with open(self.index_pfad, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            else:
+                self._index = []
+        return self._index
+
+    def _schreibe_index(self):
+        os.makedirs(self.verzeichnis, exist_ok=True)
+        tmp = f"{self.index_pfad}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.index_pfad)
+
+    @staticmethod
+    def _komprimiere(daten: bytes, kompression: str) -> bytes:
+        if kompression == "zst":
+            return zstandard.ZstdCompressor(level=19).compress(daten)
+        return gzip.compress(daten, compresslevel=9, mtime=0)
+
+    @staticmethod
+    def _entpacke(daten: bytes, kompression: str) -> bytes:
+        if kompression == "zst":
+            return zstandard.ZstdDecompressor().decompress(daten)
+        return gzip.decompress(daten)
+
+    def speichere(self, teamname: str, html: str, saison: int = None, datum: str = None,
+                  nur_tabelle: bool = None) -> str:
+        datum = datum or date.today().isoformat()
+        nur_tabelle = self.nur_tabelle if nur_tabelle is None else nur_tabelle
+
+        if nur_tabelle:
+            fragment = schneide_tabelle(html, klasse="items")
+            if fragment is not None:
+                html = fragment
+            else:
+                nur_tabelle = False
+
+        relativ = os.path.join(str(saison or "ohne_saison"),
+                               f"{dateiname_fuer(teamname)}_{datum}.html.{self.kompression}")
+        pfad = os.path.join(self.verzeichnis, relativ)
+        os.makedirs(os.path.dirname(pfad), exist_ok=True)
+        with open(pfad, "wb") as f:
+            f.write(self._komprimiere(html.encode("utf-8"), self.kompression))
+
+        eintrag = {
+            "team": teamname,
+            "saison": saison,
+            "datum": datum,
+            "datei": relativ.replace(os.sep, "/"),
+            "kompression": self.kompression,
+            "nur_tabelle": nur_tabelle,
+        }
+        with self._lock:
+            self._index = [e for e in self.index if e["datei"] != eintrag["datei"]] + [eintrag]
+            self._schreibe_index()
+
+        print(f"🗜️ Snapshot gespeichert: {pfad}")
+        return pfad
+
+    def eintraege(self, teamname: str = None, saison: int = None) -> list:
+        return [
+            e for e in self.index
+            if (teamname is None or e["team"] == teamname) and (saison is None or e["saison"] == saison)
+        ]
+
+    def teams(self) -> list:
+        return sorted({e["team"] for e in self.index})
+
+    def lade_eintrag(self, eintrag: dict) -> str:
+        with open(os.path.join(self.verzeichnis, eintrag["datei"]), "rb") as f:
+            return self._entpacke(f.read(), eintrag["kompression"]).decode("utf-8")
+
+    def lade(self, teamname: str, saison: int = None, datum: str = None):
+        """Lädt genau eine Seite – den neuesten passenden Schnappschuss – oder None."""
+        kandidaten = [e for e in self.eintraege(teamname, saison) if datum is None or e["datum"] == datum]
+        if not kandidaten:
+            return None
+        return self.lade_eintrag(max(kandidaten, key=lambda e: (e["saison"] or 0, e["datum"])))
+
+    def seiten(self, saison: int = None):
+        """Iteriert lazy über (Eintrag, HTML) – es liegt immer nur eine Seite im Speicher."""
+        for eintrag in self.eintraege(saison=saison):
+            yield eintrag, self.lade_eintrag(eintrag)
+
@@ -1,15 +1,119 @@
+import glob
+import hashlib
+import os
+
 import pandas as pd
 
+from scripts.Daten import DATEN_VERZEICHNIS
+from scripts.Normalisierung import saison_startjahr_aus_datum
+
+SPIELE_CACHE = os.path.join(DATEN_VERZEICHNIS, "spiele_cache")
+
+# Nur diese Spalten der football-data.co.uk-Dateien werden gelesen (der Rest sind Wettquoten)
+SPALTEN = {
+    "Div": "Liga",
+    "Date": "Datum",
+    "HomeTeam": "Heim",
+    "AwayTeam": "Auswaerts",
+    "FTHG": "Tore_Heim",
+    "FTAG": "Tore_Auswaerts",
+    "FTR": "Ergebnis",
+}
+DTYPES = {
+    "Div": "category",
+    "Date": "string",
+    "HomeTeam": "category",
+    "AwayTeam": "category",
+    "FTHG": "Int8",
+    "FTAG": "Int8",
+    "FTR": "category",
+}
+PFLICHT_SPALTEN = {"Date", "HomeTeam", "AwayTeam"}
+
+
+def ist_spieldatei(pfad: str) -> bool:
+    """Erkennt football-data-Dateien (D1.csv, D2_2324.csv, ...) an ihrer Kopfzeile."""
+    try:
+        with open(pfad, "r", encoding="utf-8-sig") as f:
+            kopf = set(f.readline().strip().split(","))
+    except (OSError, UnicodeDecodeError):
+        return False
+    return PFLICHT_SPALTEN <= kopf
+
+
+def spiel_dateien(verzeichnis: str = DATEN_VERZEICHNIS) -> list:
+    return sorted(p for p in glob.glob(os.path.join(verzeichnis, "*.csv")) if ist_spieldatei(p))
+
+
+def parse_spieldatum(serie: pd.Series) -> pd.Series:
+    """football-data nutzt TT/MM/JJJJ, ältere Saisons TT/MM/JJ."""
+    datum = pd.to_datetime(serie, format="%d/%m/%Y", errors="coerce")
+    return datum.fillna(pd.to_datetime(serie, format="%d/%m/%y", errors="coerce"))
+
+
 class SpielDatenLoader:
-    def __init__(self, pfad: str):
+    """
+    Lädt eine oder viele Spieldateien (Pfad zu einer CSV oder zu einem Verzeichnis) mit Spaltenauswahl,
+    festen Typen und einmal geparstem Datum. Jede Datei wird als Parquet gecacht; der Cache gilt,
+    solange Änderungszeit und Größe der CSV gleich bleiben.
+    """
+
+    def __init__(self, pfad: str = DATEN_VERZEICHNIS, cache_verzeichnis: str = SPIELE_CACHE):
         self.pfad = pfad
+        self.cache_verzeichnis = cache_verzeichnis
+
+    def dateien(self) -> list:
+        return spiel_dateien(self.pfad) if os.path.isdir(self.pfad) else [self.pfad]
+
+    def _cache_pfad(self, datei: str) -> str:
+        stat = os.stat(datei)
+        quelle = hashlib.sha1(os.path.abspath(datei).encode("utf-8")).hexdigest()[:10]
+        name = os.path.splitext(os.path.basename(datei))[0]
+        return os.path.join(self.cache_verzeichnis, f"{name}_{quelle}_{stat.st_mtime_ns}_{stat.st_size}.parquet")
+
+    def _verwerfe_alte_caches(self, cache_pfad: str):
+        praefix = cache_pfad.rsplit("_", 2)[0]
+        for alt in glob.glob(f"{praefix}_*.parquet"):
+            if alt != cache_pfad:
+                os.remove(alt)
+
+    @staticmethod
+    def _parse(datei: str) -> pd.DataFrame:
+        df = pd.read_csv(datei, encoding="utf-8-sig", usecols=lambda spalte: spalte in SPALTEN, dtype=DTYPES)
+        df["Date"] = parse_spieldatum(df["Date"])
+        df = df.dropna(subset=["Date", "HomeTeam", "AwayTeam"]).rename(columns=SPALTEN)
+        df["Saison_start"] = saison_startjahr_aus_datum(df["Datum"])
+        return df.reset_index(drop=True)
+
+    def lade_datei(self, datei: str) -> pd.DataFrame:
+        cache_pfad = self._cache_pfad(datei)
+        if os.path.exists(cache_pfad):
+            return pd.read_parquet(cache_pfad)
+
+        df = self._parse(datei)
+        os.makedirs(self.cache_verzeichnis, exist_ok=True)
+        df.to_parquet(f"{cache_pfad}.tmp", index=False)
+        os.replace(f"{cache_pfad}.tmp", cache_pfad)
+        self._verwerfe_alte_caches(cache_pfad)
+        return df
 
     def lade_spiele(self) -> pd.DataFrame:
-        try:
-            df = pd.read_csv(self.pfad)
-            df = df[["Date", "HomeTeam", "AwayTeam", "FTHG", "FTAG", "FTR"]]
-            df.columns = ["Datum", "Heim", "Auswaerts", "Tore_Heim", "Tore_Auswaerts", "Ergebnis"]
-            return df
-        except Exception as e:
-            print(f"❌ Fehler beim Laden der Spieldaten: {e}")
+        frames = []
+        for datei in self.dateien():
+            try:
+                frames.append(self.lade_datei(datei))
+            except Exception as e:
+                print(f"❌ Fehler beim Laden der Spieldaten ({datei}): {e}")
+
+        if not frames:
             return pd.DataFrame()
+        if len(frames) == 1:
+            return frames[0]
+
+        # Kategorien der Dateien vereinheitlichen, damit concat nicht auf object zurückfällt
+        kategorien = {s: pd.api.types.union_categoricals([f[s] for f in frames if s in f.columns]).categories
+                      for s in ("Liga", "Heim", "Auswaerts", "Ergebnis") if any(s in f.columns for f in frames)}
+        frames = [f.astype({s: pd.CategoricalDtype(k) for s, k in kategorien.items() if s in f.columns})
+                  for f in frames]
+        df = pd.concat(frames, ignore_index=True)
+        return df.sort_values([s for s in ("Datum", "Liga") if s in df.columns], ignore_index=True)
@@ -0,0 +1,215 @@
+import json
+import os
+import re
+import unicodedata
+from collections import namedtuple
+
+import pandas as pd
+
+from scripts.Daten import DATEN_VERZEICHNIS
+from scripts.TeamAlias import standard_alias_index
+from scripts import Teams as teams_modul
+
+REGISTER_PFAD = os.path.join(DATEN_VERZEICHNIS, "spieler_register.json")
+# parse_teams_html.py schreibt nach daten/, ältere Läufe liegen im Projektverzeichnis
+REGISTER_VERSION = 2  # erhöhen, wenn sich Aufbau oder Felder ändern; ältere Dateien werden neu aufgebaut
+KADER_JSONS = [os.path.join(DATEN_VERZEICHNIS, "parsed_players_detailed.json"), "parsed_players_detailed.json"]
+
+# weitere_ids: abweichende IDs derselben Person (z. B. aus der Teams-Konfiguration), verweisen auf `id`
+Spieler = namedtuple("Spieler", ["id", "name", "slug", "understat_name", "aliase", "verein", "position", "weitere_ids"],
+                     defaults=((),))
+
+
+def ascii_name(name: str) -> str:
+    """'Thomas Müller' → 'Thomas Muller' (Schreibweise von Understat/FBref)."""
+    return unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode("ascii")
+
+
+def url_slug(name: str) -> str:
+    """Transfermarkt-Pfadteil: 'Thomas Müller' → 'thomas-mueller'."""
+    text = str(name).strip().lower().replace(" ", "-")
+    text = text.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
+    return ascii_name(text)
+
+
+def namens_schluessel(name: str) -> str:
+    """'Thomas Müller', 'Thomas Mueller' und 'thomas muller' ergeben denselben Schlüssel."""
+    text = re.sub(r"[^a-z0-9]", "", ascii_name(str(name).lower()))
+    return text.replace("ae", "a").replace("oe", "o").replace("ue", "u")
+
+
+class SpielerRegister:
+    """
+    Spieleridentität an einer Stelle: Transfermarkt-ID → Name, URL-Slug, Understat-Name, Schreibweisen,
+    Verein und Position. Slugs und Vergleichsschlüssel werden beim Aufbau einmal berechnet, Abfragen
+    sind danach Dict-Zugriffe.
+    """
+
+    def __init__(self, spieler=()):
+        self._nach_id = {}
+        self._weitere_ids = {}
+        self._nach_schluessel = {}
+        for eintrag in spieler:
+            self._fuege_hinzu(Spieler(*eintrag) if not isinstance(eintrag, Spieler) else eintrag)
+
+    def _fuege_hinzu(self, spieler: Spieler):
+        self._nach_id[spieler.id] = spieler
+        for weitere_id in spieler.weitere_ids:
+            self._weitere_ids[weitere_id] = spieler
+        for alias in {spieler.name, *spieler.aliase}:
+            ids = self._nach_schluessel.setdefault(namens_schluessel(alias), [])
+            if spieler.id not in ids:
+                ids.append(spieler.id)
+
+    def __len__(self) -> int:
+        return len(self._nach_id)
+
+    def __iter__(self):
+        return iter(self._nach_id.values())
+
+    @classmethod
+    def aufbauen(cls, kader: dict = None, teams: dict = None) -> "SpielerRegister":
+        """
+        Aus den Kaderdaten ({vereinsschlüssel: [{name, transfermarkt_id, position}]}) und der Teams-Konfiguration.
+        Ein Teams-Eintrag mit unbekannter ID, dessen Name beim selben Verein schon im Kader steht, wird mit
+        diesem zusammengeführt; seine ID bleibt als weitere ID auflösbar.
+        """
+        alias = standard_alias_index()
+        kader = lade_kader() if kader is None else kader
+        teams = teams_modul.Teams if teams is None else teams
+
+        eintraege = {}
+        for verein_schluessel, spieler_liste in kader.items():
+            verein_id = alias.id(verein_schluessel)
+            verein = alias.name(verein_id) if verein_id else verein_schluessel
+            for spieler in spieler_liste:
+                tm_id, name = spieler.get("transfermarkt_id"), spieler.get("name")
+                if not tm_id or not name:
+                    continue
+                eintraege[str(tm_id)] = {"name": name, "aliase": set(), "verein": verein, "weitere_ids": set(),
+                                         "position": spieler.get("position"), "understat_name": None}
+
+        # (Namensschlüssel, Vereins-ID) → Kader-ID, um Teams-Einträge mit abweichender ID zuzuordnen
+        im_kader = {(namens_schluessel(e["name"]), alias.id(e["verein"])): tm_id for tm_id, e in eintraege.items()}
+
+        # Die Teams-Konfiguration kennt Understat-Namen und eigene Schreibweisen
+        for teamname, spieler_info in teams.items():
+            verein_id = alias.id(teamname)
+            for name, info in spieler_info.items():
+                if not info.get("transfermarkt_id"):
+                    continue
+                tm_id = str(info["transfermarkt_id"])
+                kader_id = im_kader.get((namens_schluessel(name), verein_id))
+                if tm_id not in eintraege and kader_id is not None:
+                    eintraege[kader_id]["weitere_ids"].add(tm_id)
+                    tm_id = kader_id
+                eintrag = eintraege.setdefault(tm_id, {
+                    "name": name, "aliase": set(), "position": None, "understat_name": None, "weitere_ids": set(),
+                    "verein": alias.name(verein_id) if verein_id else teamname,
+                })
+                eintrag["aliase"].add(name)
+                eintrag["understat_name"] = info.get("understat_name") or eintrag["understat_name"]
+
+        spieler = []
+        for tm_id, e in eintraege.items():
+            understat_name = e["understat_name"] or ascii_name(e["name"])
+            aliase = sorted((e["aliase"] | {understat_name}) - {e["name"]})
+            spieler.append(Spieler(tm_id, e["name"], url_slug(e["name"]), understat_name, aliase,
+                                   e["verein"], e["position"], sorted(e["weitere_ids"])))
+        return cls(spieler)
+
+    def speichere(self, pfad: str = REGISTER_PFAD):
+        os.makedirs(os.path.dirname(pfad) or ".", exist_ok=True)
+        with open(f"{pfad}.tmp", "w", encoding="utf-8") as f:
+            json.dump({"version": REGISTER_VERSION, "spieler": [s._asdict() for s in self]}, f,
+                      ensure_ascii=False, indent=2)
+        os.replace(f"{pfad}.tmp", pfad)
+
+    @classmethod
+    def lade(cls, pfad: str = REGISTER_PFAD) -> "SpielerRegister":
+        with open(pfad, "r", encoding="utf-8") as f:
+            daten = json.load(f)
+        if not isinstance(daten, dict) or daten.get("version") != REGISTER_VERSION:
+            raise ValueError(f"{pfad}: Register in veraltetem Format")
+        return cls(Spieler(**eintrag) for eintrag in daten["spieler"])
+
+    # --- Abfragen ---
+
+    def nach_id(self, transfermarkt_id) -> Spieler:
+        if transfermarkt_id is None:
+            return None
+        tm_id = str(transfermarkt_id)
+        return self._nach_id.get(tm_id) or self._weitere_ids.get(tm_id)
+
+    def finde(self, name, verein: str = None) -> Spieler:
+        """Spieler zu einer beliebigen Schreibweise; bei Namensgleichheit entscheidet der Verein."""
+        if name is None or pd.isna(name):
+            return None
+        ids = self._nach_schluessel.get(namens_schluessel(name), [])
+        if len(ids) > 1 and verein is not None:
+            alias = standard_alias_index()
+            verein_id = alias.id(verein)
+            ids = [i for i in ids if alias.id(self._nach_id[i].verein) == verein_id]
+        return self._nach_id[ids[0]] if len(ids) == 1 else None
+
+    def slug(self, name) -> str:
+        spieler = self.finde(name)
+        return spieler.slug if spieler else url_slug(name)
+
+    def understat_name(self, name, verein: str = None) -> str:
+        """Understat-Schreibweise; ist der Name mehrdeutig, zählt ein gemeinsamer Understat-Name, sonst ASCII."""
+        spieler = self.finde(name, verein)
+        if spieler:
+            return spieler.understat_name
+        kandidaten = {self._nach_id[i].understat_name for i in self._nach_schluessel.get(namens_schluessel(name), [])}
+        return kandidaten.pop() if len(kandidaten) == 1 else ascii_name(name)
+
+    def nicht_aufloesbar(self, teams: dict = None) -> list:
+        """(Verein, Name) aller Spieler der Teams-Konfiguration, die nicht eindeutig aufgelöst werden."""
+        teams = teams_modul.Teams if teams is None else teams
+        return [(verein, name) for verein, spieler_info in teams.items() for name in spieler_info
+                if self.finde(name, verein) is None]
+
+    def schluessel(self, name, verein: str = None) -> str:
+        """Join-Schlüssel: 'tm:<id>' für bekannte Spieler, sonst der normalisierte Name."""
+        spieler = self.finde(name, verein)
+        return f"tm:{spieler.id}" if spieler else f"name:{namens_schluessel(name)}"
+
+    def schluessel_serie(self, namen: pd.Series, vereine: pd.Series = None) -> pd.Series:
+        """Vektorisiert: jede (Name, Verein)-Kombination wird nur einmal aufgelöst."""
+        paare = pd.DataFrame({"name": namen.astype(object),
+                              "verein": vereine.astype(object) if vereine is not None else None})
+        codes, eindeutig = pd.factorize(pd.MultiIndex.from_frame(paare))
+        aufgeloest = [None if pd.isna(n) else self.schluessel(n, None if pd.isna(v) else v) for n, v in eindeutig]
+        return pd.Series([aufgeloest[c] if c >= 0 else None for c in codes], index=namen.index, dtype=object)
+
+
+def lade_kader() -> dict:
+    for pfad in KADER_JSONS:
+        if os.path.exists(pfad):
+            with open(pfad, "r", encoding="utf-8") as f:
+                return json.load(f)
+    return {}
+
+
+_register = None
+
+
+def standard_register(pfad: str = REGISTER_PFAD) -> SpielerRegister:
+    """Gespeichertes Register, solange es jünger als Kaderdaten und Teams-Konfiguration ist, sonst Neuaufbau."""
+    global _register
+    if _register is None:
+        quellen = [p for p in KADER_JSONS if os.path.exists(p)] + [teams_modul.__file__]
+        if os.path.exists(pfad) and os.path.getmtime(pfad) >= max(os.path.getmtime(p) for p in quellen):
+            try:
+                _register = SpielerRegister.lade(pfad)
+            except ValueError as e:
+                print(f"⚠️ Spielerregister wird neu aufgebaut: {e}")
+        if _register is None:
+            _register = SpielerRegister.aufbauen()
+            _register.speichere(pfad)
+            offen = _register.nicht_aufloesbar()
+            if offen:
+                print(f"⚠️ {len(offen)} Spieler aus Teams.py nicht eindeutig im Spielerregister: "
+                      + ", ".join(f"{name} ({verein})" for verein, name in offen))
+    return _register
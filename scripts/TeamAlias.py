@@ -0,0 +1,78 @@
+import re
+import unicodedata
+
+import pandas as pd
+
+# Kanonische Vereins-ID → (Anzeigename, Schreibweisen aus D1.csv, Teams.py, Transfermarkt, ...)
+VEREINE = {
+    "bayern": ("FC Bayern München", ["FC Bayern", "Bayern Munich", "Bayern München", "Bayern"]),
+    "dortmund": ("Borussia Dortmund", ["Dortmund", "BVB"]),
+    "leipzig": ("RB Leipzig", ["Leipzig", "RasenBallsport Leipzig"]),
+    "leverkusen": ("Bayer 04 Leverkusen", ["Bayer Leverkusen", "Leverkusen"]),
+    "stuttgart": ("VfB Stuttgart", ["Stuttgart"]),
+    "frankfurt": ("Eintracht Frankfurt", ["Ein Frankfurt", "Frankfurt"]),
+    "freiburg": ("SC Freiburg", ["Freiburg"]),
+    "union-berlin": ("1. FC Union Berlin", ["Union Berlin"]),
+    "hoffenheim": ("TSG 1899 Hoffenheim", ["TSG Hoffenheim", "Hoffenheim"]),
+    "bremen": ("SV Werder Bremen", ["Werder Bremen"]),
+    "wolfsburg": ("VfL Wolfsburg", ["Wolfsburg"]),
+    "mainz": ("1. FSV Mainz 05", ["Mainz", "Mainz 05"]),
+    "gladbach": ("Borussia Mönchengladbach", ["M'gladbach", "Mönchengladbach", "Gladbach"]),
+    "augsburg": ("FC Augsburg", ["Augsburg"]),
+    "heidenheim": ("1. FC Heidenheim", ["Heidenheim", "1. FC Heidenheim 1846"]),
+    "koeln": ("1. FC Köln", ["FC Koln", "Köln", "Cologne"]),
+    "st-pauli": ("FC St. Pauli", ["St Pauli"]),
+    "hamburg": ("Hamburger SV", ["Hamburg", "HSV"]),
+    "bochum": ("VfL Bochum", ["Bochum"]),
+    "kiel": ("Holstein Kiel", ["Kiel"]),
+    "darmstadt": ("SV Darmstadt 98", ["Darmstadt"]),
+}
+
+
+def alias_schluessel(name: str) -> str:
+    """Vergleichsschlüssel: Umlaute ausgeschrieben, ASCII, nur Buchstaben/Ziffern ('fc_bayern_muenchen' == 'FC Bayern München')."""
+    text = str(name).lower().replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]", "", text)
+
+
+class TeamAliasIndex:
+    """Vorberechneter Index aller Schreibweisen eines Vereins auf seine kanonische ID."""
+
+    def __init__(self, vereine: dict = None):
+        vereine = VEREINE if vereine is None else vereine
+        self.namen = {verein_id: name for verein_id, (name, _) in vereine.items()}
+        self._index = {}
+        for verein_id, (name, aliase) in vereine.items():
+            for alias in [verein_id, name, *aliase]:
+                schluessel = alias_schluessel(alias)
+                bisher = self._index.setdefault(schluessel, verein_id)
+                if bisher != verein_id:
+                    raise ValueError(f"Alias '{alias}' ist mehrdeutig ({bisher} / {verein_id})")
+
+    def id(self, name):
+        if name is None or pd.isna(name):
+            return None
+        return self._index.get(alias_schluessel(name))
+
+    def ids(self, namen: pd.Series) -> pd.Series:
+        """Vektorisiert: jede Schreibweise wird nur einmal aufgelöst, danach per Codes verteilt."""
+        codes, eindeutig = pd.factorize(namen.astype(object))
+        aufgeloest = pd.array([self.id(n) for n in eindeutig] + [None], dtype="string")
+        return pd.Series(aufgeloest[codes], index=namen.index, dtype="string")
+
+    def name(self, verein_id: str) -> str:
+        return self.namen.get(verein_id, verein_id)
+
+    def unbekannt(self, namen) -> list:
+        return sorted({str(n) for n in pd.Series(namen).dropna().unique() if self.id(n) is None})
+
+
+_index = None
+
+
+def standard_alias_index() -> TeamAliasIndex:
+    global _index
+    if _index is None:
+        _index = TeamAliasIndex()
+    return _index
@@ -1,6 +1,10 @@
 import pandas as pd
-import unicodedata
 from scripts.MultiSourceCrawler import MultiSourceCrawler
+from scripts.AsyncCrawler import AsyncCrawler, MAX_PRO_HOST
+from scripts.AbrufMemo import AbrufMemo
+from scripts.DatensatzSammler import DatensatzSammler
+from scripts.Deduplizierung import dedupliziere
+from scripts.SpielerRegister import standard_register
 
 class TeamManager:
     def __init__(self, teamname: str, spieler_info: dict):
@@ -8,13 +12,14 @@ class TeamManager:
         self.spieler_info = spieler_info
 
     def normalize_name_for_url(self, name: str) -> str:
-        name = name.lower().replace(" ", "-")
-        name = name.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
-        name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("utf-8")
-        return name
+        return standard_register().slug(name)
 
-    def crawl_team_verletzungen(self) -> pd.DataFrame:
-        gesamt_df = pd.DataFrame()
+    def crawl_team_verletzungen(self, parallel: bool = False, max_pro_host: int = MAX_PRO_HOST) -> pd.DataFrame:
+        if parallel:
+            return AsyncCrawler(max_pro_host=max_pro_host).crawl_teams({self.teamname: self.spieler_info})
+
+        sammler = DatensatzSammler(kategorisch=True)
+        memo = AbrufMemo()
 
         for name, info in self.spieler_info.items():
             print(f"🔍 Crawle {name}...")
@@ -22,7 +27,8 @@ class TeamManager:
             crawler = MultiSourceCrawler(
                 name=name,
                 transfermarkt_id=info.get("transfermarkt_id"),
-                fbref_url=info.get("fbref_url")
+                fbref_url=info.get("fbref_url"),
+                memo=memo
             )
 
             # 🎯 NEU: beide Quellen als Tuple entgegennehmen
@@ -37,6 +43,6 @@ class TeamManager:
 
             df["Spieler"] = name
             df["Team"] = self.teamname
-            gesamt_df = pd.concat([gesamt_df, df], ignore_index=True)
+            sammler.hinzufuegen(dedupliziere(df))  # dieselbe Verletzung von TM und FBref nur einmal
 
-        return gesamt_df
+        return sammler.als_dataframe()
@@ -0,0 +1,314 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from scripts.Daten import DATEN_VERZEICHNIS
+from scripts.Normalisierung import SAISON_STICHTAG, normalisiere, ist_normalisiert, saison_startjahr_aus_datum
+from scripts.TeamAlias import standard_alias_index
+
+VERFUEGBARKEIT_PFAD = os.path.join(DATEN_VERZEICHNIS, "verfuegbarkeit.npz")
+TAGE_PRO_SAISON = 366  # Saisonstart bis Vortag des nächsten Starts; die letzte Spalte bleibt außerhalb von Schaltjahren leer
+OFFEN_SPALTEN = ["team", "spieler", "von"]
+
+
+def saison_beginn(saison_start) -> np.ndarray:
+    """Startjahr(e) → 1. Juli als datetime64[D]."""
+    jahre = (np.asarray(saison_start, dtype="int64") - 1970).astype("datetime64[Y]")
+    return (jahre.astype("datetime64[M]") + np.timedelta64(SAISON_STICHTAG - 1, "M")).astype("datetime64[D]")
+
+
+def team_id(name) -> str:
+    """Kanonische Vereins-ID; unbekannte Namen bleiben, wie sie sind."""
+    if name is None or pd.isna(name):
+        return None
+    return standard_alias_index().id(name) or str(name)
+
+
+class TeamSaison:
+    """
+    Ausfall-Bitmap einer Mannschaft in einer Saison: Zeilen = Spieler, Spalten = Tage ab 1. Juli.
+    `fest` enthält nur abgeschlossene Verletzungen, `ausfall` zusätzlich die offenen bis zum Stichtag.
+    """
+
+    def __init__(self, spieler=None, fest: np.ndarray = None):
+        self.spieler = list(spieler or [])
+        self._zeile = {name: i for i, name in enumerate(self.spieler)}
+        self.fest = fest if fest is not None else np.zeros((0, TAGE_PRO_SAISON), dtype=bool)
+        self.ausfall = self.fest.copy()
+        self._praefix = None
+        self._pro_tag = None
+
+    def zeilen(self, namen) -> np.ndarray:
+        """Zeilenindizes der Spieler; unbekannte Spieler bekommen eine neue (leere) Zeile."""
+        neu = [n for n in dict.fromkeys(namen) if n not in self._zeile]
+        if neu:
+            for name in neu:
+                self._zeile[name] = len(self.spieler)
+                self.spieler.append(name)
+            leer = np.zeros((len(neu), TAGE_PRO_SAISON), dtype=bool)
+            self.fest = np.vstack([self.fest, leer])
+            self.ausfall = np.vstack([self.ausfall, leer])
+        return np.fromiter((self._zeile[n] for n in namen), dtype="int64", count=len(namen))
+
+    def markiere(self, zeilen: np.ndarray, start: np.ndarray, ende: np.ndarray, fest: bool = True):
+        """Setzt die Tage [start, ende] der Zeilen per Differenz-Array und kumulativer Summe (ohne Python-Schleife)."""
+        diff = np.zeros((len(self.spieler), TAGE_PRO_SAISON + 1), dtype="int32")
+        np.add.at(diff, (zeilen, start), 1)
+        np.add.at(diff, (zeilen, ende + 1), -1)
+        maske = np.cumsum(diff, axis=1)[:, :TAGE_PRO_SAISON] > 0
+        if fest:
+            self.fest |= maske
+        self.ausfall |= maske
+        self._praefix = None
+        self._pro_tag = None
+
+    def nur_fest(self):
+        """Offene Verletzungen entfernen, bevor sie bis zu einem neuen Stichtag neu gesetzt werden."""
+        self.ausfall = self.fest.copy()
+        self._praefix = None
+        self._pro_tag = None
+
+    @property
+    def praefix(self) -> np.ndarray:
+        """Präfixsummen je Spieler: Ausfalltage in [a, b] = praefix[:, b + 1] - praefix[:, a]."""
+        if self._praefix is None:
+            self._praefix = np.zeros((len(self.spieler), TAGE_PRO_SAISON + 1), dtype="int32")
+            np.cumsum(self.ausfall, axis=1, out=self._praefix[:, 1:])
+        return self._praefix
+
+    @property
+    def pro_tag(self) -> np.ndarray:
+        if self._pro_tag is None:
+            self._pro_tag = self.ausfall.sum(axis=0)
+        return self._pro_tag
+
+
+class Verfuegbarkeit:
+    """
+    Vorberechnete Spieler × Tag-Ausfallmatrix je (Verein, Saison). Punktabfragen sind ein Array-Zugriff,
+    Zeitraumabfragen zwei Präfixsummen-Zugriffe. Neue Verletzungen werden per aktualisiere() nachgetragen.
+    Offene Verletzungen werden getrennt gehalten und bis zum Stichtag `stand` als Ausfall gesetzt; beim
+    Laden gilt der aktuelle Tag, und eine später abgeschlossene Meldung ersetzt die offene.
+    """
+
+    def __init__(self, stand=None):
+        self.stand = pd.Timestamp(stand or pd.Timestamp.now()).normalize()
+        self.matrizen = {}
+        self.offen = pd.DataFrame(columns=OFFEN_SPALTEN)  # (team, spieler, von) je offener Verletzung
+
+    @classmethod
+    def baue(cls, verletzungen: pd.DataFrame, stand=None) -> "Verfuegbarkeit":
+        verfuegbarkeit = cls(stand=stand)
+        verfuegbarkeit.aktualisiere(verletzungen)
+        return verfuegbarkeit
+
+    @staticmethod
+    def _intervalle(teams, spieler, von: pd.Series, bis: pd.Series) -> pd.DataFrame:
+        """Zeiträume → (team, saison, spieler, start, ende) mit Tagesindizes; saisonübergreifende werden geteilt."""
+        gueltig = (von.notna() & bis.notna() & (von <= bis)).to_numpy()
+        if not gueltig.any():
+            return pd.DataFrame(columns=["team", "saison", "spieler", "start", "ende"])
+        teams, spieler = np.asarray(teams, dtype=object)[gueltig], np.asarray(spieler, dtype=object)[gueltig]
+        von, bis = von[gueltig].reset_index(drop=True), bis[gueltig].reset_index(drop=True)
+
+        s0 = saison_startjahr_aus_datum(von).to_numpy("int64")
+        s1 = saison_startjahr_aus_datum(bis).to_numpy("int64")
+        von, bis = von.to_numpy("datetime64[D]"), bis.to_numpy("datetime64[D]")
+
+        anzahl = s1 - s0 + 1
+        zeile = np.repeat(np.arange(len(von)), anzahl)
+        saison = s0[zeile] + (np.arange(len(zeile)) - np.repeat(np.cumsum(anzahl) - anzahl, anzahl))
+        beginn = saison_beginn(saison)
+        return pd.DataFrame({
+            "team": teams[zeile],
+            "saison": saison,
+            "spieler": spieler[zeile],
+            "start": np.maximum(von[zeile] - beginn, 0).astype("int64"),
+            "ende": np.minimum(bis[zeile] - beginn, TAGE_PRO_SAISON - 1).astype("int64"),
+        })
+
+    def _markiere(self, intervalle: pd.DataFrame, fest: bool):
+        for (team, saison), teil in intervalle.groupby(["team", "saison"], sort=False, dropna=False):
+            matrix = self.matrizen.setdefault((team, int(saison)), TeamSaison())
+            zeilen = matrix.zeilen(teil["spieler"].tolist())
+            matrix.markiere(zeilen, teil["start"].to_numpy(), teil["ende"].to_numpy(), fest=fest)
+
+    def _male_offene(self):
+        """Alle offenen Verletzungen neu bis `stand` eintragen (vorher gesetzte offene Tage fallen weg)."""
+        for matrix in self.matrizen.values():
+            matrix.nur_fest()
+        bis = pd.Series(self.stand, index=self.offen.index)
+        self._markiere(self._intervalle(self.offen["team"], self.offen["spieler"],
+                                        pd.to_datetime(self.offen["von"]), bis), fest=False)
+
+    def setze_stand(self, stand=None):
+        """Neuer Stichtag (Standard: heute); offene Verletzungen reichen dann bis dorthin."""
+        self.stand = pd.Timestamp(stand or pd.Timestamp.now()).normalize()
+        self._male_offene()
+
+    def aktualisiere(self, verletzungen: pd.DataFrame, store=None) -> int:
+        """
+        Trägt neue Verletzungszeilen nach: abgeschlossene per ODER in die festen Bitmaps, offene in die
+        Liste offener Verletzungen. Eine abgeschlossene Meldung ersetzt die offene mit gleichem Beginn.
+        Mit `store` werden stattdessen die betroffenen Vereine aus dem Store neu aufgebaut, damit auch
+        korrigierte (kürzere) Zeiträume wirken.
+        """
+        if verletzungen is None or verletzungen.empty:
+            return 0
+        if store is not None:
+            teams = verletzungen["Team"].dropna().astype(object).unique() if "Team" in verletzungen.columns else []
+            return self.baue_teams_neu(store, teams)
+        df = verletzungen if ist_normalisiert(verletzungen) else normalisiere(verletzungen)
+        df = df[df["Spieler"].notna() & df["von_datum"].notna()]
+        teams = df["Team"].astype(object).map(team_id) if "Team" in df.columns \
+            else pd.Series(None, index=df.index, dtype=object)
+        schluessel = pd.DataFrame({"team": teams, "spieler": df["Spieler"].astype(object),
+                                   "von": df["von_datum"].dt.normalize()}).reset_index(drop=True)
+        offen = df["offen"].to_numpy(bool)
+
+        geschlossen = df[~offen]
+        intervalle = self._intervalle(teams[~offen].to_numpy(), geschlossen["Spieler"].astype(object).to_numpy(),
+                                      geschlossen["von_datum"], geschlossen["bis_datum"])
+        self._markiere(intervalle, fest=True)
+
+        alt = pd.MultiIndex.from_frame(self.offen[OFFEN_SPALTEN].astype(object))
+        erledigt = pd.MultiIndex.from_frame(schluessel[~offen].astype(object))
+        offene = pd.concat([self.offen[~alt.isin(erledigt)], schluessel[offen]], ignore_index=True)
+        self.offen = offene.drop_duplicates(ignore_index=True)
+        self._male_offene()
+        return len(intervalle) + int(offen.sum())
+
+    def baue_teams_neu(self, store, teams) -> int:
+        """
+        Verwirft Bitmaps und offene Verletzungen der Vereine und baut sie aus ihren Store-Partitionen neu auf.
+        Es werden alle Saisons des Vereins gelesen, weil Verletzungen über den Saisonwechsel reichen.
+        """
+        ids = {team_id(t) for t in teams} - {None}
+        if not ids:
+            return 0
+        self.matrizen = {(team, saison): m for (team, saison), m in self.matrizen.items() if team not in ids}
+        self.offen = self.offen[~self.offen["team"].isin(ids)].reset_index(drop=True)
+        namen = [t for t in store.teams() if team_id(t) in ids]  # alle Schreibweisen derselben Vereins-ID
+        if not namen:
+            self._male_offene()
+            return 0
+        return self.aktualisiere(store.lese(teams=namen))
+
+    # --- Abfragen ---
+
+    @staticmethod
+    def _tage(daten) -> tuple:
+        datum = pd.to_datetime(pd.Series(daten)).reset_index(drop=True)
+        saison = saison_startjahr_aus_datum(datum)
+        gueltig = datum.notna().to_numpy()
+        index = np.zeros(len(datum), dtype="int64")
+        if gueltig.any():
+            tage = datum[gueltig].to_numpy("datetime64[D]")
+            index[gueltig] = (tage - saison_beginn(saison[gueltig].to_numpy("int64"))).astype("int64")
+        return saison, index, gueltig
+
+    def _gruppen(self, teams, daten):
+        """Anfragen nach (Verein, Saison) bündeln, damit jede Matrix nur einmal angesprochen wird."""
+        saison, index, gueltig = self._tage(daten)
+        teams = pd.Series(list(teams), dtype=object).map(lambda t: team_id(t) if pd.notna(t) else None)
+        anfragen = pd.DataFrame({"team": teams, "saison": saison})[gueltig & teams.notna().to_numpy()]
+        for (team, s), teil in anfragen.groupby(["team", "saison"], sort=False):
+            matrix = self.matrizen.get((team, int(s)))
+            if matrix is not None:
+                yield matrix, teil.index.to_numpy(), index[teil.index.to_numpy()]
+
+    def anzahl_fehlend(self, teams, daten) -> np.ndarray:
+        """Vektorisiert: Anzahl ausgefallener Spieler je (Verein, Datum)."""
+        ergebnis = np.zeros(len(daten), dtype="int64")
+        for matrix, positionen, tage in self._gruppen(teams, daten):
+            ergebnis[positionen] = matrix.pro_tag[tage]
+        return ergebnis
+
+    def fehlende(self, teams, daten) -> list:
+        """Vektorisiert: Liste der ausgefallenen Spieler je (Verein, Datum)."""
+        ergebnis = [[] for _ in range(len(daten))]
+        for matrix, positionen, tage in self._gruppen(teams, daten):
+            spieler = np.asarray(matrix.spieler, dtype=object)
+            spalten = matrix.ausfall[:, tage]
+            for i, position in enumerate(positionen):
+                ergebnis[position] = sorted(spieler[spalten[:, i]])
+        return ergebnis
+
+    def fehlend_am(self, team: str, datum) -> list:
+        return self.fehlende([team], [datum])[0]
+
+    def ausfalltage(self, team: str, spieler: str, von, bis) -> int:
+        """Ausfalltage eines Spielers im Zeitraum [von, bis] über Präfixsummen (je Saison zwei Zugriffe)."""
+        von, bis = pd.Timestamp(von), pd.Timestamp(bis)
+        summe = 0
+        for saison in range(int(saison_startjahr_aus_datum(pd.Series([von]))[0]),
+                            int(saison_startjahr_aus_datum(pd.Series([bis]))[0]) + 1):
+            matrix = self.matrizen.get((team_id(team), saison))
+            if matrix is None or spieler not in matrix._zeile:
+                continue
+            beginn = pd.Timestamp(saison_beginn([saison])[0])
+            a = max((von - beginn).days, 0)
+            b = min((bis - beginn).days, TAGE_PRO_SAISON - 1)
+            zeile = matrix._zeile[spieler]
+            summe += int(matrix.praefix[zeile, b + 1] - matrix.praefix[zeile, a])
+        return summe
+
+    def verlauf(self, team: str, saison: int) -> pd.Series:
+        """Ausgefallene Spieler pro Tag einer Saison (für Zeitreihen-Diagramme)."""
+        matrix = self.matrizen.get((team_id(team), int(saison)))
+        beginn = pd.Timestamp(saison_beginn([saison])[0])
+        tage = pd.date_range(beginn, beginn + pd.DateOffset(years=1) - pd.Timedelta(days=1), freq="D")
+        werte = matrix.pro_tag[:len(tage)] if matrix is not None else np.zeros(len(tage), dtype="int64")
+        return pd.Series(werte, index=tage, name="Ausfaelle")
+
+    def saisons(self, team: str) -> list:
+        return sorted(s for t, s in self.matrizen if t == team_id(team))
+
+    # --- Persistenz ---
+
+    def speichere(self, pfad: str = VERFUEGBARKEIT_PFAD):
+        """Feste Bitmaps bitweise gepackt als .npz; Spieler, Schlüssel und offene Verletzungen als JSON-Metadaten."""
+        os.makedirs(os.path.dirname(pfad) or ".", exist_ok=True)
+        offen = [[team, spieler, pd.Timestamp(von).date().isoformat()]
+                 for team, spieler, von in self.offen[OFFEN_SPALTEN].itertuples(index=False)]
+        meta = {"offen": offen, "matrizen": []}
+        arrays = {}
+        for i, ((team, saison), matrix) in enumerate(self.matrizen.items()):
+            meta["matrizen"].append({"team": team, "saison": saison, "spieler": matrix.spieler})
+            arrays[f"ausfall_{i}"] = np.packbits(matrix.fest, axis=1)
+        tmp = f"{pfad}.tmp.npz"
+        np.savez_compressed(tmp, meta=np.array(json.dumps(meta, ensure_ascii=False)), **arrays)
+        os.replace(tmp, pfad)
+
+    @classmethod
+    def lade(cls, pfad: str = VERFUEGBARKEIT_PFAD, stand=None) -> "Verfuegbarkeit":
+        """Offene Verletzungen werden beim Laden bis `stand` (Standard: heute) eingetragen."""
+        with np.load(pfad) as daten:
+            meta = json.loads(str(daten["meta"]))
+            if "offen" not in meta:
+                raise ValueError(f"{pfad}: altes Format ohne getrennte offene Verletzungen")
+            verfuegbarkeit = cls(stand=stand)
+            for i, eintrag in enumerate(meta["matrizen"]):
+                fest = np.unpackbits(daten[f"ausfall_{i}"], axis=1, count=TAGE_PRO_SAISON).astype(bool)
+                verfuegbarkeit.matrizen[(eintrag["team"], eintrag["saison"])] = TeamSaison(eintrag["spieler"], fest)
+        offen = pd.DataFrame(meta.get("offen", []), columns=OFFEN_SPALTEN)
+        verfuegbarkeit.offen = offen.assign(von=pd.to_datetime(offen["von"]))
+        verfuegbarkeit._male_offene()
+        return verfuegbarkeit
+
+
+def lade_oder_baue(store, pfad: str = VERFUEGBARKEIT_PFAD) -> Verfuegbarkeit:
+    """Nimmt die gespeicherte Matrix, solange sie jünger als der Verletzungs-Store ist, sonst Neuaufbau."""
+    dateien = store._dateien()
+    stand_store = max((os.path.getmtime(d) for d in dateien), default=0)
+    if os.path.exists(pfad) and os.path.getmtime(pfad) >= stand_store:
+        try:
+            return Verfuegbarkeit.lade(pfad)
+        except (ValueError, KeyError) as e:
+            print(f"⚠️ Verfügbarkeitsmatrix wird neu aufgebaut: {e}")
+
+    verfuegbarkeit = Verfuegbarkeit.baue(store.lese())
+    verfuegbarkeit.speichere(pfad)
+    return verfuegbarkeit
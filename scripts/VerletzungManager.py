@@ -1,5 +1,7 @@
 import pandas as pd
 
+from scripts.Deduplizierung import dedupliziere
+
 class VerletzungManager:
     def __init__(self, crawlers: list):
         self.crawlers = crawlers
@@ -23,7 +25,7 @@ class VerletzungManager:
         # Zusammenführen und Duplikate vermeiden
         kombiniert = pd.concat(frames, ignore_index=True)
 
-        # Optional: Duplikate filtern
-        kombiniert = kombiniert.drop_duplicates(subset=["Spieler", "von", "bis", "Verletzung"])
+        # Dieselbe Verletzung aus mehreren Quellen zu einem Eintrag zusammenführen (Herkunft in 'Quellen')
+        kombiniert = dedupliziere(kombiniert)
 
         return kombiniert
@@ -0,0 +1,364 @@
+import glob
+import json
+import os
+import sqlite3
+
+import pandas as pd
+
+from scripts.Daten import DATEN_VERZEICHNIS
+from scripts.Normalisierung import parse_datum, saison_startjahr_aus_datum, tage_verpasst
+from scripts.SnapshotArchiv import dateiname_fuer
+from scripts.Teams import Teams
+
+DB_PFAD = os.path.join(DATEN_VERZEICHNIS, "verletzungen.db")
+GESAMT_JSON = "verletzungen_gesamt.json"
+VEREINS_JSON = os.path.join(DATEN_VERZEICHNIS, "vereins_verletzungen.json")
+KADER_JSON = "parsed_players_detailed.json"
+TEAMS_URLS_JSON = "bundesliga_teams_urls.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS teams (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS spieler (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    transfermarkt_id TEXT UNIQUE,
+    team_id INTEGER REFERENCES teams(id),
+    position TEXT
+);
+CREATE TABLE IF NOT EXISTS quellen (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS verletzungen (
+    id INTEGER PRIMARY KEY,
+    spieler_id INTEGER NOT NULL REFERENCES spieler(id),
+    team_id INTEGER REFERENCES teams(id),
+    quelle_id INTEGER REFERENCES quellen(id),
+    saison TEXT,
+    verletzung TEXT,
+    von TEXT NOT NULL,  -- ISO-Datum, damit Bereichsvergleiche als Text funktionieren
+    bis TEXT,           -- NULL = noch offen
+    tage_verpasst INTEGER,
+    spiele_verpasst TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_spieler_name ON spieler(name);
+-- ohne bis: eine offen importierte Verletzung wird beim späteren Import mit Ende aktualisiert
+CREATE UNIQUE INDEX IF NOT EXISTS idx_verletzungen_eintrag ON verletzungen(spieler_id, von, IFNULL(verletzung, ''));
+CREATE INDEX IF NOT EXISTS idx_verletzungen_team ON verletzungen(team_id);
+CREATE INDEX IF NOT EXISTS idx_verletzungen_zeitraum ON verletzungen(von, bis);
+"""
+
+# Datenbanken mit dem alten Schlüssel (spieler_id, von, bis): pro neuem Schlüssel die abgeschlossene
+# bzw. jüngste Zeile behalten, danach kann der neue Index angelegt werden
+MIGRATION_SCHLUESSEL = """
+DELETE FROM verletzungen WHERE id NOT IN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (PARTITION BY spieler_id, von, IFNULL(verletzung, '')
+                                      ORDER BY bis IS NULL, id DESC) AS rang
+        FROM verletzungen
+    ) WHERE rang = 1
+);
+DROP INDEX idx_verletzungen_schluessel;
+"""
+
+ABFRAGE = """
+SELECT v.saison AS Saison, v.verletzung AS Verletzung, v.von, v.bis,
+       v.tage_verpasst AS Tage_verpasst, v.spiele_verpasst AS Spiele_verpasst,
+       q.name AS Quelle, s.name AS Spieler, s.transfermarkt_id, t.name AS Team
+FROM verletzungen v
+JOIN spieler s ON s.id = v.spieler_id
+LEFT JOIN teams t ON t.id = v.team_id
+LEFT JOIN quellen q ON q.id = v.quelle_id
+"""
+
+
+def iso_datum(serie: pd.Series) -> pd.Series:
+    """TT.MM.JJJJ (oder bereits ISO) → 'JJJJ-MM-TT'; nicht lesbare Werte werden None."""
+    datum = parse_datum(serie)
+    return datum.dt.strftime("%Y-%m-%d").astype(object).where(datum.notna(), None)
+
+
+def saison_aus_iso(serie: pd.Series) -> pd.Series:
+    """ISO-Datum → Saisonlabel im Format '24/25' (Saisonwechsel am 1. Juli)."""
+    datum = pd.to_datetime(serie, errors="coerce")
+    start = saison_startjahr_aus_datum(datum)
+    label = (start % 100).astype("Int64").astype(str).str.zfill(2) + "/" + ((start + 1) % 100).astype("Int64").astype(str).str.zfill(2)
+    return label.astype(object).where(datum.notna(), None)
+
+
+def _ohne_na(wert):
+    return None if pd.isna(wert) else wert
+
+
+class VerletzungsDatenbank:
+    """
+    Normalisierte SQLite-Ablage (teams, spieler, quellen, verletzungen) für alle Verletzungsquellen.
+    Importe sind idempotent: eine Verletzung ist über Spieler (transfermarkt_id bzw. Name), von und Verletzung
+    eindeutig; ein späterer Import mit Ende schließt die offene Zeile.
+    """
+
+    def __init__(self, pfad: str = DB_PFAD):
+        os.makedirs(os.path.dirname(pfad) or ".", exist_ok=True)
+        self.pfad = pfad
+        self.verbindung = sqlite3.connect(pfad)
+        self.verbindung.execute("PRAGMA foreign_keys = ON")
+        self.verbindung.execute("PRAGMA journal_mode = WAL")
+        alter_index = self.verbindung.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_verletzungen_schluessel'"
+        ).fetchone()
+        if alter_index:
+            self.verbindung.executescript(MIGRATION_SCHLUESSEL)
+        self.verbindung.executescript(SCHEMA)
+        self._teams = {}
+        self._quellen = {}
+        self._spieler = {}
+
+    def schliesse(self):
+        self.verbindung.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.schliesse()
+
+    # --- Stammdaten ---
+
+    def team_id(self, name):
+        if pd.isna(name) or not str(name).strip():
+            return None
+        name = str(name).strip()
+        if name not in self._teams:
+            self._teams[name] = self.verbindung.execute(
+                "INSERT INTO teams (name) VALUES (?) ON CONFLICT(name) DO UPDATE SET name = excluded.name RETURNING id",
+                (name,),
+            ).fetchone()[0]
+        return self._teams[name]
+
+    def quelle_id(self, name):
+        if pd.isna(name) or not str(name).strip():
+            return None
+        name = str(name).strip()
+        if name not in self._quellen:
+            self._quellen[name] = self.verbindung.execute(
+                "INSERT INTO quellen (name) VALUES (?) ON CONFLICT(name) DO UPDATE SET name = excluded.name RETURNING id",
+                (name,),
+            ).fetchone()[0]
+        return self._quellen[name]
+
+    def spieler_id(self, name: str, team_id: int = None, transfermarkt_id=None, position: str = None) -> int:
+        """Sucht bzw. legt den Spieler an – über die transfermarkt_id, sonst über den Namen."""
+        name = str(name).strip()
+        tm_id = None if pd.isna(transfermarkt_id) or transfermarkt_id == "" else str(transfermarkt_id)
+        cache_schluessel = (name, tm_id)
+        if cache_schluessel in self._spieler and position is None:
+            return self._spieler[cache_schluessel]
+
+        c = self.verbindung
+        if tm_id is not None:
+            zeile = c.execute("SELECT id FROM spieler WHERE transfermarkt_id = ?", (tm_id,)).fetchone()
+            if zeile is None:
+                # Bisher nur über den Namen bekannter Spieler bekommt seine transfermarkt_id
+                zeile = c.execute(
+                    "SELECT id FROM spieler WHERE name = ? AND transfermarkt_id IS NULL", (name,)
+                ).fetchone()
+            if zeile is None:
+                spieler_id = c.execute(
+                    "INSERT INTO spieler (name, transfermarkt_id, team_id, position) VALUES (?, ?, ?, ?)",
+                    (name, tm_id, team_id, position),
+                ).lastrowid
+            else:
+                spieler_id = zeile[0]
+                c.execute(
+                    "UPDATE spieler SET name = ?, transfermarkt_id = ?, team_id = COALESCE(?, team_id), "
+                    "position = COALESCE(?, position) WHERE id = ?",
+                    (name, tm_id, team_id, position, spieler_id),
+                )
+        else:
+            zeile = c.execute(
+                "SELECT id FROM spieler WHERE name = ? ORDER BY transfermarkt_id IS NULL LIMIT 1", (name,)
+            ).fetchone()
+            if zeile is None:
+                spieler_id = c.execute(
+                    "INSERT INTO spieler (name, team_id, position) VALUES (?, ?, ?)", (name, team_id, position)
+                ).lastrowid
+            else:
+                spieler_id = zeile[0]
+
+        self._spieler[cache_schluessel] = spieler_id
+        return spieler_id
+
+    # --- Import ---
+
+    def upsert_verletzungen(self, df: pd.DataFrame, quelle: str = None) -> int:
+        """
+        Übernimmt Verletzungen im Format der Crawler (Spieler, Team, Saison, Verletzung, von, bis,
+        Spiele_verpasst, optional Quelle/transfermarkt_id). Zeilen ohne lesbares Startdatum werden übersprungen.
+        """
+        if df is None or df.empty:
+            return 0
+
+        df = df.reindex(columns=["Spieler", "Team", "Saison", "Verletzung", "von", "bis",
+                                 "Spiele_verpasst", "Quelle", "transfermarkt_id"])
+        if quelle is not None:
+            df["Quelle"] = df["Quelle"].fillna(quelle)
+        df["von"] = iso_datum(df["von"])
+        df["bis"] = iso_datum(df["bis"])
+        df["Tage"] = tage_verpasst(df["Spiele_verpasst"])
+        df["Saison"] = df["Saison"].where(df["Saison"].notna(), saison_aus_iso(df["von"]))
+        df = df[df["von"].notna() & df["Spieler"].notna()]
+
+        zeilen = []
+        with self.verbindung:
+            for r in df.itertuples(index=False):
+                team_id = self.team_id(r.Team)
+                zeilen.append((
+                    self.spieler_id(r.Spieler, team_id, r.transfermarkt_id), team_id, self.quelle_id(r.Quelle),
+                    _ohne_na(r.Saison), _ohne_na(r.Verletzung), r.von, _ohne_na(r.bis),
+                    None if pd.isna(r.Tage) else int(r.Tage), _ohne_na(r.Spiele_verpasst),
+                ))
+            self.verbindung.executemany(
+                """
+                INSERT INTO verletzungen (spieler_id, team_id, quelle_id, saison, verletzung, von, bis,
+                                          tage_verpasst, spiele_verpasst)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(spieler_id, von, IFNULL(verletzung, '')) DO UPDATE SET
+                    bis = COALESCE(excluded.bis, bis),
+                    team_id = COALESCE(excluded.team_id, team_id),
+                    quelle_id = COALESCE(excluded.quelle_id, quelle_id),
+                    saison = COALESCE(excluded.saison, saison),
+                    tage_verpasst = COALESCE(excluded.tage_verpasst, tage_verpasst),
+                    spiele_verpasst = COALESCE(excluded.spiele_verpasst, spiele_verpasst)
+                """,
+                zeilen,
+            )
+        return len(zeilen)
+
+    def importiere_teams_konfiguration(self, teams: dict = None) -> int:
+        """Spieler samt transfermarkt_id aus scripts/Teams.py."""
+        teams = Teams if teams is None else teams
+        anzahl = 0
+        with self.verbindung:
+            for teamname, spieler_info in teams.items():
+                team_id = self.team_id(teamname)
+                for name, info in spieler_info.items():
+                    self.spieler_id(name, team_id, info.get("transfermarkt_id"))
+                    anzahl += 1
+        return anzahl
+
+    def importiere_kader_json(self, pfad: str = KADER_JSON, teams_urls_pfad: str = TEAMS_URLS_JSON) -> int:
+        """Kaderdaten aus parsed_players_detailed.json (Schlüssel sind Dateinamen wie 'fc_bayern_muenchen')."""
+        if not os.path.exists(pfad):
+            return 0
+        with open(pfad, "r", encoding="utf-8") as f:
+            kader = json.load(f)
+
+        teamnamen = {}
+        if os.path.exists(teams_urls_pfad):
+            with open(teams_urls_pfad, "r", encoding="utf-8") as f:
+                teamnamen = {dateiname_fuer(name): name for name in json.load(f)}
+
+        anzahl = 0
+        with self.verbindung:
+            for schluessel, spieler_liste in kader.items():
+                team_id = self.team_id(teamnamen.get(schluessel, schluessel))
+                for spieler in spieler_liste:
+                    if not spieler.get("name"):
+                        continue
+                    self.spieler_id(spieler["name"], team_id, spieler.get("transfermarkt_id"), spieler.get("position"))
+                    anzahl += 1
+        return anzahl
+
+    def importiere_csvs(self, verzeichnis: str = DATEN_VERZEICHNIS) -> int:
+        """CSV-Ausgaben von TeamManager/BundesligaVerletzungsCrawler (alle_verletzungen.csv, verletzungen_<team>.csv)."""
+        pfade = [os.path.join(verzeichnis, "alle_verletzungen.csv")]
+        pfade += sorted(glob.glob(os.path.join(verzeichnis, "verletzungen_*.csv")))
+        anzahl = 0
+        for pfad in pfade:
+            if not os.path.exists(pfad):
+                continue
+            try:
+                df = pd.read_csv(pfad, dtype=str)
+            except pd.errors.EmptyDataError:
+                continue
+            if "Spieler" in df.columns:
+                anzahl += self.upsert_verletzungen(df, quelle="Transfermarkt")
+        return anzahl
+
+    def importiere_gesamt_json(self, pfad: str = GESAMT_JSON) -> int:
+        """Aktuelle Ausfälle aus crawler_verletzungen.py ({team: [{spieler, grund, seit, bis_voraussichtlich, ...}]})."""
+        if not os.path.exists(pfad):
+            return 0
+        with open(pfad, "r", encoding="utf-8") as f:
+            daten = json.load(f)
+        df = pd.DataFrame([
+            {"Team": team, "Spieler": e.get("spieler"), "Verletzung": e.get("grund"), "von": e.get("seit"),
+             "bis": e.get("bis_voraussichtlich"), "Spiele_verpasst": e.get("verpasste_spiele")}
+            for team, eintraege in daten.items() for e in eintraege
+        ])
+        if df.empty:
+            return 0
+        # hier zählt die Spalte Spiele, keine Tage
+        df["Spiele_verpasst"] = df["Spiele_verpasst"].where(df["Spiele_verpasst"].isna(), df["Spiele_verpasst"] + " Spiele")
+        return self.upsert_verletzungen(df, quelle="Transfermarkt (aktuell)")
+
+    def importiere_vereins_json(self, pfad: str = VEREINS_JSON) -> int:
+        """Ausfallzeiten aus verletzungen_crawler_kombiniert.py ({team: [{name, from, to, days_missed, ...}]})."""
+        if not os.path.exists(pfad):
+            return 0
+        with open(pfad, "r", encoding="utf-8") as f:
+            daten = json.load(f)
+        df = pd.DataFrame([
+            {"Team": team, "Spieler": e.get("name"), "Verletzung": e.get("injury"), "von": e.get("from"),
+             "bis": e.get("to"), "Spiele_verpasst": e.get("days_missed")}
+            for team, eintraege in daten.items() for e in eintraege
+        ])
+        # Saison aus dem Startdatum ableiten, damit das Label dem Format der übrigen Quellen ('24/25') folgt
+        return self.upsert_verletzungen(df, quelle="Transfermarkt (Ausfallzeiten)")
+
+    def importiere_alles(self) -> dict:
+        """Stammdaten zuerst, damit Verletzungen per Name den Spielern mit transfermarkt_id zugeordnet werden."""
+        ergebnis = {
+            "teams_konfiguration": self.importiere_teams_konfiguration(),
+            "kader": self.importiere_kader_json(),
+            "csv": self.importiere_csvs(),
+            "gesamt_json": self.importiere_gesamt_json(),
+            "vereins_json": self.importiere_vereins_json(),
+        }
+        print("🗄️ Import in die Verletzungsdatenbank: " + ", ".join(f"{k}={v}" for k, v in ergebnis.items()))
+        return ergebnis
+
+    # --- Abfragen ---
+
+    def _abfrage(self, bedingung: str = "", parameter: tuple = ()) -> pd.DataFrame:
+        sql = ABFRAGE + (f" WHERE {bedingung}" if bedingung else "") + " ORDER BY v.von"
+        return pd.read_sql_query(sql, self.verbindung, params=parameter)
+
+    def verletzungen_von_spieler(self, spieler) -> pd.DataFrame:
+        """Alle Verletzungen eines Spielers, per transfermarkt_id (int) oder Name."""
+        if isinstance(spieler, int) or str(spieler).isdigit():
+            return self._abfrage("s.transfermarkt_id = ?", (str(spieler),))
+        return self._abfrage("s.name = ?", (spieler,))
+
+    def verletzt_am(self, datum, team: str = None) -> pd.DataFrame:
+        """Alle Spieler, die am Datum (TT.MM.JJJJ, ISO oder Timestamp) ausfielen, optional nur eines Teams."""
+        tag = pd.Timestamp(pd.to_datetime(datum, dayfirst=isinstance(datum, str) and "." in datum)).strftime("%Y-%m-%d")
+        bedingung = "v.von <= ? AND (v.bis IS NULL OR v.bis >= ?)"
+        parameter = (tag, tag)
+        if team is not None:
+            bedingung += " AND t.name = ?"
+            parameter += (team,)
+        return self._abfrage(bedingung, parameter)
+
+    def verletzungen_team(self, team: str, saison: str = None) -> pd.DataFrame:
+        if saison is None:
+            return self._abfrage("t.name = ?", (team,))
+        return self._abfrage("t.name = ? AND v.saison = ?", (team, saison))
+
+
+if __name__ == "__main__":
+    with VerletzungsDatenbank() as db:
+        db.importiere_alles()
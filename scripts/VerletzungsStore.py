@@ -0,0 +1,203 @@
+import glob
+import os
+from urllib.parse import quote, unquote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from scripts.Aggregate import Aggregate
+from scripts.Daten import DATEN_VERZEICHNIS
+from scripts.Normalisierung import normalisiere, saison_startjahr, NORMALISIERTE_SPALTEN
+from scripts.Kategorien import kategorisiere
+
+STORE_VERZEICHNIS = os.path.join(DATEN_VERZEICHNIS, "verletzungen_store")
+PARTITIONEN = ["Team", "Saison"]
+SPALTEN = ["Saison", "Verletzung", "von", "bis", "Spiele_verpasst", "Quelle", "Spieler", "Team"]
+# Herkunft zusammengeführter Meldungen (scripts/Deduplizierung.py); fehlt in älteren Partitionen
+HERKUNFT_SPALTEN = ["Quellen", "Meldungen"]
+# Upsert-Schlüssel ohne 'bis': eine offene Meldung wird durch die spätere, abgeschlossene ersetzt
+SCHLUESSEL = ["Spieler", "von", "Verletzung"]
+OHNE_WERT = "__HIVE_DEFAULT_PARTITION__"  # Hive-Konvention für fehlende Partitionswerte
+
+# Rohspalten als Text, dazu die beim Schreiben einmalig berechneten typisierten Spalten
+SCHEMA = pa.schema(
+    [(spalte, pa.string()) for spalte in SPALTEN if spalte not in PARTITIONEN]
+    + [("Quellen", pa.string()), ("Meldungen", pa.int32())]
+    + [
+        ("von_datum", pa.timestamp("us")),
+        ("bis_datum", pa.timestamp("us")),
+        ("Tage_verpasst", pa.int32()),
+        ("Saison_start", pa.int16()),
+        ("offen", pa.bool_()),
+    ]
+)
+PARTITIONIERUNG = ds.partitioning(
+    pa.schema([(spalte, pa.string()) for spalte in PARTITIONEN]), flavor="hive"
+)
+
+
+def _verzeichnisname(spalte: str, wert) -> str:
+    return f"{spalte}={OHNE_WERT if pd.isna(wert) else quote(str(wert), safe='')}"
+
+
+def _partitionswert(pfad: str) -> str:
+    wert = unquote(os.path.basename(pfad).split("=", 1)[1])
+    return None if wert == OHNE_WERT else wert
+
+
+class VerletzungsStore:
+    """
+    Spaltenbasierter Verletzungsbestand als Parquet, Hive-partitioniert nach Team und Saison
+    (<verzeichnis>/Team=<team>/Saison=<saison>/daten.parquet). Beim Schreiben werden die typisierten
+    Spalten aus scripts/Normalisierung.py einmalig berechnet und mitgespeichert.
+    Schreiben ersetzt bzw. ergänzt nur die betroffenen Partitionen; Lesen filtert Team und
+    Saison über die Verzeichnisse, ohne fremde Partitionen zu öffnen. Kennzahlen je Team/Saison
+    (scripts/Aggregate.py) werden beim Schreiben für die geänderten Partitionen mitgeführt.
+    """
+
+    def __init__(self, verzeichnis: str = STORE_VERZEICHNIS):
+        self.verzeichnis = verzeichnis
+        self._aggregate = Aggregate(verzeichnis)
+
+    def _partition_pfad(self, team, saison) -> str:
+        return os.path.join(self.verzeichnis, _verzeichnisname("Team", team), _verzeichnisname("Saison", saison))
+
+    def _dateien(self) -> list:
+        return sorted(glob.glob(os.path.join(self.verzeichnis, "Team=*", "Saison=*", "*.parquet")))
+
+    def ist_leer(self) -> bool:
+        return not self._dateien()
+
+    def teams(self) -> list:
+        pfade = glob.glob(os.path.join(self.verzeichnis, "Team=*"))
+        return sorted(t for t in (_partitionswert(p) for p in pfade) if t is not None)
+
+    def saisons(self, teams=None) -> list:
+        pfade = glob.glob(os.path.join(self.verzeichnis, "Team=*", "Saison=*"))
+        if teams is not None:
+            pfade = [p for p in pfade if _partitionswert(os.path.dirname(p)) in set(teams)]
+        return sorted({s for s in (_partitionswert(p) for p in pfade) if s is not None})
+
+    @staticmethod
+    def _bereinige(df: pd.DataFrame) -> pd.DataFrame:
+        df = df.reindex(columns=SPALTEN + HERKUNFT_SPALTEN)
+        for spalte in SPALTEN + ["Quellen"]:
+            df[spalte] = df[spalte].astype("string").str.strip()
+        df["Meldungen"] = pd.to_numeric(df["Meldungen"], errors="coerce").astype("Int64")
+        return df
+
+    @staticmethod
+    def _ohne_duplikate(df: pd.DataFrame) -> pd.DataFrame:
+        ohne_beginn = df["von"].isna() | (df["von"] == "")
+        hilfs = df.assign(_bis=df["bis"].where(ohne_beginn, ""))
+        return df[~hilfs.duplicated(subset=SCHLUESSEL + ["_bis"], keep="last")]
+
+    def _lese_partition(self, pfad: str) -> pd.DataFrame:
+        datei = os.path.join(pfad, "daten.parquet")
+        if not os.path.exists(datei):
+            return pd.DataFrame(columns=SPALTEN + HERKUNFT_SPALTEN)
+        spalten = [s for s in SPALTEN + HERKUNFT_SPALTEN if s not in PARTITIONEN]
+        vorhanden = [s for s in spalten if s in pq.read_schema(datei).names]
+        df = pq.read_table(datei, columns=vorhanden).to_pandas(types_mapper={pa.int32(): pd.Int64Dtype()}.get)
+        return df.reindex(columns=spalten)
+
+    def _schreibe_partition(self, pfad: str, df: pd.DataFrame):
+        os.makedirs(pfad, exist_ok=True)
+        tabelle = pa.Table.from_pandas(df[[f.name for f in SCHEMA]], schema=SCHEMA, preserve_index=False)
+        datei = os.path.join(pfad, "daten.parquet")
+        pq.write_table(tabelle, f"{datei}.tmp")
+        os.replace(f"{datei}.tmp", datei)
+
+    def schreibe(self, df: pd.DataFrame, ersetzen: bool = False) -> int:
+        """
+        Upsert pro (Team, Saison)-Partition: neue Zeilen gewinnen bei gleichem Schlüssel
+        (Spieler, von, Verletzung), so wird aus einer offenen Verletzung die abgeschlossene.
+        Ohne lesbaren Beginn zählt 'bis' mit zum Schlüssel. Mit ersetzen=True werden die
+        betroffenen Partitionen komplett durch df ersetzt. Gibt die Zahl der geschriebenen Partitionen zurück.
+        """
+        if df is None or df.empty:
+            return 0
+
+        df = self._bereinige(df)
+        aggregate_aktuell = self._aggregate.vorhanden() or self.ist_leer()
+        geschrieben = []
+        for (team, saison), teil in df.groupby(PARTITIONEN, dropna=False, sort=False):
+            pfad = self._partition_pfad(team, saison)
+            teil = teil.drop(columns=PARTITIONEN)
+            if not ersetzen:
+                teil = pd.concat([self._lese_partition(pfad), teil], ignore_index=True)
+            teil = normalisiere(self._ohne_duplikate(teil).assign(Saison=saison))
+            self._schreibe_partition(pfad, teil)
+            geschrieben.append(teil.assign(Team=team))
+
+        if aggregate_aktuell:
+            self._aggregate.aktualisiere(pd.concat(geschrieben, ignore_index=True))
+        else:
+            self._aggregate.neu_aufbauen(self.lese())
+        return len(geschrieben)
+
+    def aggregate(self) -> Aggregate:
+        """Materialisierte Kennzahlen; für Stores, die älter als die Aggregate sind, einmalig aufgebaut."""
+        if not self._aggregate.vorhanden() and not self.ist_leer():
+            self._aggregate.neu_aufbauen(self.lese())
+        return self._aggregate
+
+    def lese(self, teams=None, saisons=None, ab_jahr: int = None, spalten=None) -> pd.DataFrame:
+        """
+        Liest den Bestand, optional eingeschränkt auf Teams, Saisons und Saisons ab einem Startjahr.
+        Die Einschränkungen wirken als Partitionsfilter, nur passende Dateien werden gelesen.
+        """
+        if self.ist_leer():
+            return pd.DataFrame(columns=spalten or SPALTEN + HERKUNFT_SPALTEN + NORMALISIERTE_SPALTEN)
+
+        if ab_jahr is not None:
+            kandidaten = self.saisons(teams) if saisons is None else saisons
+            kandidaten = pd.Series(list(kandidaten), dtype=object)
+            saisons = kandidaten[(saison_startjahr(kandidaten) >= ab_jahr).fillna(False)].tolist()
+
+        filter_ausdruck = None
+        for spalte, werte in (("Team", teams), ("Saison", saisons)):
+            if werte is not None:
+                bedingung = ds.field(spalte).isin(list(werte))
+                filter_ausdruck = bedingung if filter_ausdruck is None else filter_ausdruck & bedingung
+
+        datensatz = ds.dataset(self._dateien(), schema=SCHEMA.append(pa.field("Team", pa.string()))
+                               .append(pa.field("Saison", pa.string())), format="parquet",
+                               partitioning=PARTITIONIERUNG, partition_base_dir=self.verzeichnis)
+        tabelle = datensatz.to_table(columns=spalten or SPALTEN + HERKUNFT_SPALTEN + NORMALISIERTE_SPALTEN, filter=filter_ausdruck)
+        df = tabelle.to_pandas(types_mapper=lambda typ: pd.Int64Dtype() if pa.types.is_integer(typ) else None)
+        return kategorisiere(df)
+
+    def importiere_csvs(self, verzeichnis: str = DATEN_VERZEICHNIS) -> int:
+        """Übernimmt die bisherigen CSV-Dateien (alle_verletzungen.csv, verletzungen_<team>.csv) in den Store."""
+        pfade = [os.path.join(verzeichnis, "alle_verletzungen.csv")]
+        pfade += sorted(glob.glob(os.path.join(verzeichnis, "verletzungen_*.csv")))
+
+        frames = []
+        for pfad in pfade:
+            if not os.path.exists(pfad):
+                continue
+            try:
+                df = pd.read_csv(pfad, dtype=str)
+            except pd.errors.EmptyDataError:
+                continue
+            if {"Spieler", "Team"} <= set(df.columns):
+                frames.append(df)
+
+        if not frames:
+            return 0
+        df = pd.concat(frames, ignore_index=True)
+        df = df[df["Saison"].notna()]
+        self.schreibe(df)
+        print(f"📦 {len(df)} Zeilen aus {len(frames)} CSV-Dateien in den Verletzungs-Store übernommen")
+        return len(df)
+
+
+def standard_store(verzeichnis: str = STORE_VERZEICHNIS) -> VerletzungsStore:
+    """Liefert den Store; ist er noch leer, werden die CSV-Dateien daneben einmalig importiert."""
+    store = VerletzungsStore(verzeichnis)
+    if store.ist_leer():
+        store.importiere_csvs(os.path.dirname(os.path.abspath(verzeichnis)))
+    return store
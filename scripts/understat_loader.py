@@ -1,7 +1,23 @@
 # scripts/understat_loader.py
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 import pandas as pd
 
+from scripts.Daten import DATEN_VERZEICHNIS
+from scripts.SpielerRegister import standard_register
+
+UNDERSTAT_CACHE = os.path.join(DATEN_VERZEICHNIS, "understat_cache")
+STANDARD_SAISON = 2023
+MAX_PARALLEL = 4
+CACHE_TTL = 7 * 24 * 3600  # Sekunden, danach wird ein Spieler neu geladen
+CACHE_VERSION = 1  # erhöhen, wenn sich das Format der gecachten Datensätze ändert
+
+
 class UnderstatLoader:
     def __init__(self, player_name: str, season: int = 2023):
         self.player_name = player_name
@@ -21,3 +37,118 @@ class UnderstatLoader:
         except Exception as e:
             print(f"❌ Fehler bei Understat für {self.player_name}: {e}")
             return pd.DataFrame()
+
+
+class UnderstatWebBackend:
+    """Holt die Saisonwerte über den UnderstatLoader (Website)."""
+
+    kennung = "web"
+    cachebar = False  # der UnderstatLoader liefert bisher nur Demo-Werte, die dürfen nicht im Cache landen
+
+    def lade(self, understat_name: str, saison: int) -> pd.DataFrame:
+        return UnderstatLoader(player_name=understat_name.replace(" ", "_"), season=saison).load()
+
+
+class UnderstatLokalBackend:
+    """Dateibasierter Ersatz für die Website, z. B. für Tests: <verzeichnis>/<understat_name>.json mit Datensätzen."""
+
+    kennung = "lokal"
+    cachebar = True
+
+    def __init__(self, verzeichnis: str):
+        self.verzeichnis = verzeichnis
+
+    def lade(self, understat_name: str, saison: int) -> pd.DataFrame:
+        pfad = os.path.join(self.verzeichnis, f"{understat_name.replace(' ', '_')}.json")
+        if not os.path.exists(pfad):
+            return pd.DataFrame()
+        with open(pfad, "r", encoding="utf-8") as f:
+            df = pd.DataFrame(json.load(f))
+        if "Saison" in df.columns:
+            df = df[df["Saison"].astype(str) == str(saison)]
+        return df.reset_index(drop=True)
+
+
+class UnderstatBulkLoader:
+    """
+    Lädt Understat-Werte für viele Spieler parallel und cacht sie pro Spieler und Saison auf der Platte.
+    Der Cache-Dateiname enthält Backend und Formatversion; Einträge älter als cache_ttl werden neu geladen.
+    """
+
+    def __init__(self, backend=None, saison: int = STANDARD_SAISON, cache_verzeichnis: str = UNDERSTAT_CACHE,
+                 max_parallel: int = MAX_PARALLEL, namen: dict = None, cache_ttl: float = CACHE_TTL):
+        self.backend = backend or UnderstatWebBackend()
+        self.saison = saison
+        self.cache_verzeichnis = cache_verzeichnis
+        self.max_parallel = max_parallel
+        self.namen = namen  # optionale feste Zuordnung Spielername → understat_name, sonst Spielerregister
+        self.cache_ttl = cache_ttl
+        self.cachebar = getattr(self.backend, "cachebar", True)
+
+    def _cache_pfad(self, understat_name: str) -> str:
+        kennung = getattr(self.backend, "kennung", type(self.backend).__name__)
+        datei = f"{understat_name.replace(' ', '_')}_{self.saison}_{kennung}_v{CACHE_VERSION}.json"
+        return os.path.join(self.cache_verzeichnis, datei)
+
+    def _aus_cache(self, understat_name: str):
+        if not self.cachebar:
+            return None
+        pfad = self._cache_pfad(understat_name)
+        if not os.path.exists(pfad) or time.time() - os.path.getmtime(pfad) > self.cache_ttl:
+            return None
+        with open(pfad, "r", encoding="utf-8") as f:
+            return pd.DataFrame(json.load(f))
+
+    def _lade_und_cache(self, understat_name: str) -> pd.DataFrame:
+        try:
+            df = self.backend.lade(understat_name, self.saison)
+        except Exception as e:
+            print(f"❌ Fehler bei Understat für {understat_name}: {e}")
+            return pd.DataFrame()  # Fehler nicht cachen, beim nächsten Lauf erneut versuchen
+        if not self.cachebar:
+            return df
+
+        os.makedirs(self.cache_verzeichnis, exist_ok=True)
+        # Auch leere Ergebnisse cachen, damit Spieler ohne Understat-Profil nicht jedes Mal angefragt werden
+        # Atomar über eine temporäre Datei, damit ein abgebrochener Lauf keinen halben Cache-Eintrag hinterlässt
+        pfad = self._cache_pfad(understat_name)
+        tmp = f"{pfad}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(df.to_dict(orient="records"), f, ensure_ascii=False)
+        os.replace(tmp, pfad)
+        return df
+
+    def lade_alle(self, spieler_namen, vereine: dict = None) -> pd.DataFrame:
+        """vereine ordnet Spielernamen ihrem Verein zu, damit gleichnamige Spieler eindeutig aufgelöst werden."""
+        register = standard_register()
+        vereine = vereine or {}
+        aufgeloest = {name: self.namen.get(name, name) if self.namen is not None
+                      else register.understat_name(name, vereine.get(name))
+                      for name in spieler_namen}
+
+        ergebnisse = {}
+        fehlend = []
+        for understat_name in set(aufgeloest.values()):
+            df = self._aus_cache(understat_name)
+            if df is None:
+                fehlend.append(understat_name)
+            else:
+                ergebnisse[understat_name] = df
+
+        if fehlend:
+            print(f"🌐 Understat: {len(fehlend)} Spieler laden, {len(ergebnisse)} aus dem Cache")
+            with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+                for understat_name, df in zip(fehlend, pool.map(self._lade_und_cache, fehlend)):
+                    ergebnisse[understat_name] = df
+
+        frames = []
+        for name, understat_name in aufgeloest.items():
+            df = ergebnisse.get(understat_name)
+            if df is not None and not df.empty:
+                df = df.copy()
+                df["Spieler"] = name
+                frames.append(df)
+
+        if frames:
+            return pd.concat(frames, ignore_index=True)
+        return pd.DataFrame()
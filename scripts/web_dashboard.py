@@ -1,19 +1,25 @@
 # scripts/web_dashboard.py
 
 import os
-import pandas as pd
 import dash
 from dash import dcc, html
 from dash.dependencies import Input, Output
+import pandas as pd
 import plotly.express as px
 
+from scripts.Verfuegbarkeit import lade_oder_baue
+from scripts.VerletzungsStore import standard_store
+
 # 👉 relativer Pfad zum daten-Ordner (eine Ebene über /scripts)
 DATENORDNER = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "daten"))
 
-# Lade alle verfügbaren Teams
-dateien = [f for f in os.listdir(DATENORDNER) if f.startswith("verletzungen_") and f.endswith(".csv")]
-teams = [f.replace("verletzungen_", "").replace(".csv", "").replace("_", " ").title() for f in dateien]
-team_map = dict(zip(teams, dateien))
+# Teams kommen aus den Partitionen des Stores, ohne Daten zu lesen
+store = standard_store(os.path.join(DATENORDNER, "verletzungen_store"))
+teams = store.teams()
+
+# Vorberechnete Spieler × Tag-Ausfallmatrix; wird nur neu gebaut, wenn der Store sich geändert hat
+verfuegbarkeit = lade_oder_baue(store, os.path.join(DATENORDNER, "verfuegbarkeit.npz"))
+saisons = sorted({s for _, s in verfuegbarkeit.matrizen}, reverse=True)
 
 # App setup
 app = dash.Dash(__name__)
@@ -31,7 +37,13 @@ app.layout = html.Div([
                  value=teams[1]),
 
     html.Br(),
-    dcc.Graph(id="verletzungsvergleich-grafik")
+    dcc.Graph(id="verletzungsvergleich-grafik"),
+
+    html.Br(),
+    html.Label("📅 Saison für den Ausfallverlauf:"),
+    dcc.Dropdown(id="saison-dropdown", options=[{"label": f"{s}/{s + 1}", "value": s} for s in saisons],
+                 value=saisons[0] if saisons else None),
+    dcc.Graph(id="ausfallverlauf-grafik")
 ])
 
 
@@ -51,16 +63,9 @@ def update_graph(team1, team2):
     if not team1 or not team2:
         return {}
 
-    df1 = pd.read_csv(os.path.join(DATENORDNER, team_map[team1]))
-    df2 = pd.read_csv(os.path.join(DATENORDNER, team_map[team2]))
-    df1["Team"] = team1
-    df2["Team"] = team2
-
-    df = pd.concat([df1, df2])
-    df = df[df["Saison"].notna()]
-    df["Saison"] = df["Saison"].astype(str).str.strip()
-
-    grouped = df.groupby(["Saison", "Team"]).size().reset_index(name="Verletzungen")
+    # Vorberechnete Team/Saison-Kennzahlen statt Rohzeilen bei jedem Dropdown-Wechsel
+    grouped = store.aggregate().abfrage(teams=[team1, team2])
+    grouped = grouped[grouped["Saison"].notna()].rename(columns={"Anzahl": "Verletzungen"})
 
     fig = px.bar(grouped, x="Saison", y="Verletzungen", color="Team", barmode="group",
                  title=f"Vergleich: Verletzungen pro Saison ({team1} vs. {team2})")
@@ -70,5 +75,26 @@ def update_graph(team1, team2):
     return fig
 
 
+@app.callback(
+    Output("ausfallverlauf-grafik", "figure"),
+    [Input("team1-dropdown", "value"), Input("team2-dropdown", "value"), Input("saison-dropdown", "value")]
+)
+def update_verlauf(team1, team2, saison):
+    if not team1 or not team2 or saison is None:
+        return {}
+
+    # Ein Zeilensummen-Vektor je Team – kein erneutes Lesen der Verletzungen
+    verlauf = pd.DataFrame({team: verfuegbarkeit.verlauf(team, saison) for team in (team1, team2)})
+    verlauf = verlauf.rename_axis("Datum").reset_index().melt(id_vars="Datum", var_name="Team",
+                                                              value_name="Ausfaelle")
+
+    fig = px.line(verlauf, x="Datum", y="Ausfaelle", color="Team", line_shape="hv",
+                  title=f"Ausgefallene Spieler pro Tag, Saison {saison}/{saison + 1}")
+
+    fig.update_layout(xaxis_title="Datum", yaxis_title="Ausgefallene Spieler", template="plotly_white")
+
+    return fig
+
+
 if __name__ == "__main__":
     app.run(debug=True)
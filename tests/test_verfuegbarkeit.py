@@ -0,0 +1,23 @@
+import pandas as pd
+
+from scripts.Verfuegbarkeit import Verfuegbarkeit
+from scripts.VerletzungsStore import VerletzungsStore
+
+
+def _verletzung(bis, tage):
+    return pd.DataFrame([{"Spieler": "A", "Team": "FC Bayern München", "Saison": "24/25", "Verletzung": "Zerrung",
+                          "von": "01.09.2024", "bis": bis, "Tage": f"{tage} Tage", "Spiele_verpasst": "3"}])
+
+
+def test_korrigierter_kuerzerer_zeitraum_verkleinert_die_bitmap(tmp_path):
+    store = VerletzungsStore(str(tmp_path / "store"))
+    store.schreibe(_verletzung("30.10.2024", 60))
+    verfuegbarkeit = Verfuegbarkeit.baue(store.lese())
+    assert verfuegbarkeit.ausfalltage("FC Bayern München", "A", "2024-09-01", "2024-12-31") == 60
+
+    korrektur = _verletzung("20.09.2024", 20)
+    store.schreibe(korrektur)
+    verfuegbarkeit.aktualisiere(korrektur, store=store)
+
+    assert verfuegbarkeit.ausfalltage("FC Bayern München", "A", "2024-09-01", "2024-12-31") == 20
+    assert verfuegbarkeit.fehlend_am("FC Bayern München", "2024-10-01") == []
@@ -0,0 +1,20 @@
+import pandas as pd
+
+from scripts.VerletzungsDatenbank import VerletzungsDatenbank
+
+
+def _verletzung(bis, spiele="?"):
+    return pd.DataFrame([{"Spieler": "A", "Team": "FC Bayern München", "Saison": "24/25", "Verletzung": "Zerrung",
+                          "von": "01.10.2024", "bis": bis, "Spiele_verpasst": spiele}])
+
+
+def test_offene_verletzung_wird_beim_abschluss_aktualisiert(tmp_path):
+    with VerletzungsDatenbank(str(tmp_path / "verletzungen.db")) as db:
+        db.upsert_verletzungen(_verletzung("-"))
+        db.upsert_verletzungen(_verletzung("20.10.2024", "19 Tage"))
+
+        zeilen = db.verletzungen_von_spieler("A")
+        assert len(zeilen) == 1
+        assert zeilen.loc[0, "bis"] == "2024-10-20"
+        assert db.verletzt_am("01.11.2024").empty
+        assert len(db.verletzt_am("10.10.2024")) == 1
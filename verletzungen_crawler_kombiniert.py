@@ -1,10 +1,14 @@
-import requests
-from bs4 import BeautifulSoup
+import argparse
 import json
-import time
+import os
+from functools import partial
+
+from scripts.HttpClient import abrufen
+from scripts.JobScheduler import JobScheduler, MAX_PARALLEL
+from scripts.HtmlTabellen import extrahiere_zeilen
+from scripts.SpielerRegister import standard_register
 
 BASE_URL = "https://www.transfermarkt.de"
-HEADERS = {"User-Agent": "Mozilla/5.0"}
 
 # Liste der Vereine und IDs für die Bundesliga-Saison 2023/2024
 teams = {
@@ -28,74 +32,111 @@ teams = {
     "1. FC Köln": 3
 }
 
-saisons = ["2021", "2022", "2023", "2024"]
+SAISON_VON = 2021
+SAISON_BIS = 2024
+AUSGABE = "daten/vereins_verletzungen.json"
+CHECKPOINT_VERZEICHNIS = "daten/checkpoints/kombiniert"
+
+
+def saison_bereich(von=SAISON_VON, bis=SAISON_BIS):
+    return [str(jahr) for jahr in range(von, bis + 1)]
+
+
+def hole_seite(url):
+    """Seite abrufen; ein Fehlerstatus bricht den Job ab, damit er nicht als leeres Ergebnis im Checkpoint landet."""
+    res = abrufen(url)
+    if res.status_code != 200:
+        raise RuntimeError(f"Status {res.status_code} bei {url}")
+    return res.text
 
 def crawl_ausfallzeiten(team_id, saison):
     url = f"{BASE_URL}/xxx/ausfallzeiten/verein/{team_id}?reldata=L1%26{saison}"
-    res = requests.get(url, headers=HEADERS)
-    soup = BeautifulSoup(res.text, "html.parser")
-    table = soup.find("table", class_="items")
+    rows = extrahiere_zeilen(hole_seite(url), zeilen_klassen=("odd", "even"))
     result = []
 
-    if not table:
+    if not rows:
         return result
 
-    rows = table.find_all("tr", class_=["odd", "even"])
-    for row in rows:
-        cols = row.find_all("td")
+    for cols in rows:
         if len(cols) >= 6:
             result.append({
-                "name": cols[0].text.strip(),
-                "from": cols[2].text.strip(),
-                "to": cols[3].text.strip(),
-                "days_missed": cols[4].text.strip(),
-                "games_missed": cols[5].text.strip(),
-                "saison": f"{saison}/2024" if saison == "2023" else f"{saison}/{int(saison)+1}"
+                "name": cols[0],
+                "from": cols[2],
+                "to": cols[3],
+                "days_missed": cols[4],
+                "games_missed": cols[5],
+                "saison": f"{saison}/{int(saison)+1}"
             })
     return result
 
 def crawl_sperrenundverletzungen(team_id):
     url = f"{BASE_URL}/xxx/sperrenundverletzungen/verein/{team_id}/plus/1"
-    res = requests.get(url, headers=HEADERS)
-    soup = BeautifulSoup(res.text, "html.parser")
-    table = soup.find("table", class_="items")
+    rows = extrahiere_zeilen(hole_seite(url), zeilen_klassen=("odd", "even"))
     result = {}
 
-    if not table:
+    if not rows:
         return result
 
-    rows = table.find_all("tr", class_=["odd", "even"])
-    for row in rows:
-        cols = row.find_all("td")
+    for cols in rows:
         if len(cols) >= 2:
-            name = cols[0].text.strip()
-            reason = cols[1].text.strip()
+            name = cols[0]
+            reason = cols[1]
             result[name] = reason
     return result
 
-def main():
-    all_data = {}
-    for team, team_id in teams.items():
-        print(f"🔄 Verarbeite {team}...")
-        team_data = []
-        art_dict = crawl_sperrenundverletzungen(team_id)
+def job_id(team, saison=None):
+    return f"{team}|{saison}" if saison else f"{team}|sperrenundverletzungen"
+
 
+def erstelle_jobs(saisons):
+    """Ein Job pro Team (aktuelle Ausfallgründe) und pro Team × Saison (Ausfallzeiten)."""
+    jobs = {}
+    for team, team_id in teams.items():
+        jobs[job_id(team)] = partial(crawl_sperrenundverletzungen, team_id)
         for saison in saisons:
-            ausfälle = crawl_ausfallzeiten(team_id, saison)
-            for eintrag in ausfälle:
-                name = eintrag["name"]
-                eintrag["injury"] = art_dict.get(name, None)
-                team_data.append(eintrag)
+            jobs[job_id(team, saison)] = partial(crawl_ausfallzeiten, team_id, saison)
+    return jobs
+
+
+def main(von=SAISON_VON, bis=SAISON_BIS, max_parallel=MAX_PARALLEL, neu_starten=False):
+    saisons = saison_bereich(von, bis)
+    scheduler = JobScheduler(CHECKPOINT_VERZEICHNIS, max_parallel=max_parallel)
+    if neu_starten:
+        scheduler.leere()
 
-            time.sleep(1)
+    jobs = erstelle_jobs(saisons)
+    ergebnisse = scheduler.ausfuehren(jobs)
+    if len(ergebnisse) < len(jobs):
+        print("⚠️ Nicht alle Jobs erledigt – erneut starten, um ab dem Checkpoint fortzusetzen.")
+        return
 
+    # Ausfallzeiten und Ausfallgründe über den Register-Schlüssel verbinden statt über den Namenstext
+    register = standard_register()
+    all_data = {}
+    for team in teams:
+        art_dict = {register.schluessel(name, team): grund for name, grund in ergebnisse[job_id(team)].items()}
+        team_data = []
+        for saison in saisons:
+            for eintrag in ergebnisse[job_id(team, saison)]:
+                schluessel = register.schluessel(eintrag["name"], team)
+                eintrag["injury"] = art_dict.get(schluessel, None)
+                eintrag["transfermarkt_id"] = schluessel[3:] if schluessel.startswith("tm:") else None
+                team_data.append(eintrag)
         all_data[team] = team_data
-        time.sleep(1)
 
-    with open("daten/vereins_verletzungen.json", "w", encoding="utf-8") as f:
+    os.makedirs(os.path.dirname(AUSGABE), exist_ok=True)
+    with open(AUSGABE, "w", encoding="utf-8") as f:
         json.dump(all_data, f, ensure_ascii=False, indent=2)
 
-    print("✅ Fertig! Daten gespeichert in daten/vereins_verletzungen.json")
+    # Lauf vollständig: Checkpoints verwerfen, damit der nächste Lauf frische Daten holt
+    scheduler.leere()
+    print(f"✅ Fertig! Daten gespeichert in {AUSGABE}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Ausfallzeiten aller Vereine pro Saison crawlen")
+    parser.add_argument("--von", type=int, default=SAISON_VON, help="erste Saison (Startjahr)")
+    parser.add_argument("--bis", type=int, default=SAISON_BIS, help="letzte Saison (Startjahr)")
+    parser.add_argument("--parallel", type=int, default=MAX_PARALLEL, help="gleichzeitige Anfragen")
+    parser.add_argument("--neu", action="store_true", help="vorhandene Checkpoints verwerfen")
+    args = parser.parse_args()
+    main(von=args.von, bis=args.bis, max_parallel=args.parallel, neu_starten=args.neu)
@@ -4,20 +4,23 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 
-def lade_daten(pfad="daten/alle_verletzungen.csv"):
-    if not os.path.exists(pfad):
-        print(f"❌ Datei nicht gefunden: {pfad}")
+from scripts.VerletzungsStore import standard_store
+from scripts.Normalisierung import normalisiere, ist_normalisiert
+
+def lade_daten(teams=None, ab_jahr=None):
+    df = standard_store().lese(teams=teams, ab_jahr=ab_jahr)
+    if df.empty:
+        print("❌ Keine Verletzungsdaten im Verletzungs-Store gefunden")
         return None
-    return pd.read_csv(pfad)
+    return df
 
 def vorbereiten(df):
     df = df[df["Saison"].notna()]
-    df["Saison"] = df["Saison"].astype(str).str.strip()
-    return df
+    return df if ist_normalisiert(df) else normalisiere(df)
 
-def plot_verletzungen_pro_team_saison(df):
-    grouped = df.groupby(["Saison", "Team"]).size().unstack(fill_value=0)
-    grouped.plot(kind="bar", figsize=(14, 6), edgecolor="black")
+def plot_verletzungen_pro_team_saison(tabelle):
+    # tabelle: Saison × Team aus den vorberechneten Store-Kennzahlen
+    tabelle.plot(kind="bar", figsize=(14, 6), edgecolor="black")
     plt.title("Verletzungen pro Team und Saison")
     plt.xlabel("Saison")
     plt.ylabel("Anzahl Verletzungen")
@@ -31,9 +34,9 @@ def plot_verletzungen_pro_team_saison(df):
 
 def plot_top_verletzte_spieler(df, top_n=10):
     if "Spieler" in df.columns:
-        grouped = df["Spieler"].value_counts().head(top_n)
+        grouped = df.groupby("Spieler", observed=True).size().nlargest(top_n)
     else:
-        grouped = df["Verletzung"].groupby(df["Team"]).count().nlargest(top_n)
+        grouped = df["Verletzung"].groupby(df["Team"], observed=True).count().nlargest(top_n)
     grouped.plot(kind="bar", figsize=(10, 5), color="red", edgecolor="black")
     plt.title(f"Top {top_n} Verletzte Spieler (nach Einträgen)")
     plt.xlabel("Spieler")
@@ -45,9 +48,8 @@ def plot_top_verletzte_spieler(df, top_n=10):
     plt.show()
 
 def plot_zeitverlauf(df):
-    df["von"] = pd.to_datetime(df["von"], errors="coerce")
-    df = df.dropna(subset=["von"])
-    df["Monat"] = df["von"].dt.to_period("M")
+    df = df.dropna(subset=["von_datum"])
+    df["Monat"] = df["von_datum"].dt.to_period("M")
     verlauf = df.groupby("Monat").size()
     verlauf.plot(kind="line", figsize=(12, 4), marker="o")
     plt.title("Zeitverlauf der Verletzungen")
@@ -64,7 +66,7 @@ def main():
     if df is None:
         return
     df = vorbereiten(df)
-    plot_verletzungen_pro_team_saison(df)
+    plot_verletzungen_pro_team_saison(standard_store().aggregate().tabelle())
     plot_top_verletzte_spieler(df)
     plot_zeitverlauf(df)
 